@@ -73,6 +73,7 @@ LOCAL_APPS = [
     "influencers.core.apps.CoreConfig",
     "influencers.influencers.apps.InfluencersConfig",
     "influencers.clients.apps.ClientsConfig",
+    "influencers.reporting.apps.ReportingConfig",
 ]
 # https://docs.djangoproject.com/en/dev/ref/settings/#installed-apps
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
@@ -85,7 +86,7 @@ MIGRATION_MODULES = {"sites": "influencers.contrib.sites.migrations"}
 # AUTHENTICATION
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#authentication-backends
-AUTHENTICATION_BACKENDS = ["django.contrib.auth.backends.ModelBackend"]
+AUTHENTICATION_BACKENDS = ["influencers.users.backends.CachedPermissionBackend"]
 # https://docs.djangoproject.com/en/dev/ref/settings/#auth-user-model
 AUTH_USER_MODEL = "users.User"
 
@@ -115,6 +116,7 @@ AUTH_PASSWORD_VALIDATORS = [
 # https://docs.djangoproject.com/en/dev/ref/settings/#middleware
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
+    "influencers.core.middleware.QueryBudgetMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -122,6 +124,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "influencers.core.middleware.AuditlogBufferMiddleware",
     "auditlog.middleware.AuditlogMiddleware",
 ]
 
@@ -225,11 +228,15 @@ CELERYD_TASK_SOFT_TIME_LIMIT = 60
 # ------------------------------------------------------------------------------
 
 REST_FRAMEWORK = {
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "DEFAULT_PAGINATION_CLASS": "influencers.core.pagination.SelectablePagination",
     "PAGE_SIZE": 10,
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
+    # The stateless one builds users from their token rather than a query,
+    # see its caveats before turning it on
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "influencers.users.authentication.StatelessJWTAuthentication"
+        if env.bool("DJANGO_JWT_STATELESS", default=False)
+        else "rest_framework_simplejwt.authentication.JWTAuthentication",
     ),
 }
 # ------------------------------------------------------------------------------
@@ -262,6 +269,48 @@ SIMPLE_JWT = {
     "TOKEN_TYPE_CLAIM": "token_type",
 }
 # ------------------------------------------------------------------------------
+# Query budget
+# ------------------------------------------------------------------------------
+# Per request SQL instrumentation, see influencers.core.middleware.QueryBudgetMiddleware
+QUERY_BUDGET = {
+    "ENABLED": env.bool("DJANGO_QUERY_BUDGET_ENABLED", default=False),
+    # Fraction of requests instrumented
+    "SAMPLE_RATE": env.float("DJANGO_QUERY_BUDGET_SAMPLE_RATE", default=1.0),
+    # Query count over which a request is logged, per route name
+    "DEFAULT_BUDGET": env.int("DJANGO_QUERY_BUDGET_DEFAULT", default=30),
+    "ROUTES": {
+        "clients:client-list": 10,
+        "clients:assign-influencers-list": 10,
+        "clients:influencer-history-list": 10,
+    },
+}
+# ------------------------------------------------------------------------------
+# Audit log
+# ------------------------------------------------------------------------------
+# How audit log entries are written, see influencers.core.audit.MODES
+AUDITLOG_MODE = env("DJANGO_AUDITLOG_MODE", default="sync")
+# ------------------------------------------------------------------------------
+# Archive
+# ------------------------------------------------------------------------------
+# Soft deleted rows and audit log entries moved to core.ArchivedRow once old enough,
+# see influencers.core.archive
+ARCHIVE = {
+    "SOFT_DELETED_DAYS": env.int("DJANGO_ARCHIVE_SOFT_DELETED_DAYS", default=90),
+    "LOG_ENTRY_DAYS": env.int("DJANGO_ARCHIVE_LOG_ENTRY_DAYS", default=365),
+    # Rows moved per transaction, and transactions per model and run
+    "BATCH_SIZE": env.int("DJANGO_ARCHIVE_BATCH_SIZE", default=1000),
+    "MAX_BATCHES": env.int("DJANGO_ARCHIVE_MAX_BATCHES", default=100),
+}
+# ------------------------------------------------------------------------------
+# Reporting
+# ------------------------------------------------------------------------------
+# Daily facts kept current from the modified column of the rows they are built
+# from, see influencers.reporting.facts.refresh_facts
+REPORTING = {
+    # Seconds before the last refresh's watermark changes are looked for again
+    "REFRESH_OVERLAP": env.int("DJANGO_REPORTING_REFRESH_OVERLAP", default=300)
+}
+# ------------------------------------------------------------------------------
 # Djoser
 # ------------------------------------------------------------------------------
 DJOSER = {
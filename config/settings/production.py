@@ -21,18 +21,18 @@ DATABASES["default"]["CONN_MAX_AGE"] = env.int("CONN_MAX_AGE", default=60)  # no
 
 # CACHES
 # ------------------------------------------------------------------------------
-# CACHES = {
-# "default": {
-# "BACKEND": "django_redis.cache.RedisCache",
-# "LOCATION": env("REDIS_URL"),
-# "OPTIONS": {
-# "CLIENT_CLASS": "django_redis.client.DefaultClient",
-# # Mimicing memcache behavior.
-# # http://niwinz.github.io/django-redis/latest/#_memcached_exceptions_behavior
-# "IGNORE_EXCEPTIONS": True,
-# },
-# }
-# }
+CACHES = {
+    "default": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": env("REDIS_URL"),
+        "OPTIONS": {
+            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            # Mimicing memcache behavior.
+            # http://niwinz.github.io/django-redis/latest/#_memcached_exceptions_behavior
+            "IGNORE_EXCEPTIONS": True,
+        },
+    }
+}
 
 # SECURITY
 # ------------------------------------------------------------------------------
@@ -175,5 +175,15 @@ sentry_sdk.init(
 # ------------------------------------------------------------------------------
 CORS_ORIGIN_WHITELIST = env.list("CORS_ORIGIN_WHITELIST")
 
+# Query budget
+# ------------------------------------------------------------------------------
+QUERY_BUDGET["SAMPLE_RATE"] = env.float(  # noqa F405
+    "DJANGO_QUERY_BUDGET_SAMPLE_RATE", default=0.05
+)
+
+# Audit log
+# ------------------------------------------------------------------------------
+AUDITLOG_MODE = env("DJANGO_AUDITLOG_MODE", default="celery")
+
 # Django REST framework
 REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"] = ("rest_framework.renderers.JSONRenderer",)
@@ -17,6 +17,7 @@ urlpatterns = [
     path(
         "influencers/", include("influencers.influencers.urls", namespace="influencers")
     ),
+    path("reporting/", include("influencers.reporting.urls", namespace="reporting")),
     path("robots.txt", include("robots.urls")),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
 
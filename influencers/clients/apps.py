@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class ClientsConfig(AppConfig):
     name = "influencers.clients"
+
+    def ready(self):
+        import influencers.clients.signals  # noqa F401
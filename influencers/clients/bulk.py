@@ -0,0 +1,279 @@
+import csv
+import io
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework.exceptions import ParseError, ValidationError
+from rest_framework.parsers import BaseParser
+from rest_framework.relations import PrimaryKeyRelatedField
+from influencers.clients.calendar import get_month, invalidate_month
+from influencers.clients.models import (
+    AssignedInfluencer,
+    AssignedInfluencerSales,
+    InfluencerHistory,
+)
+from influencers.clients.serializers import (
+    BulkAssignedInfluencerSerializer,
+    BulkInfluencerHistorySerializer,
+)
+from influencers.core.audit import log_created, log_updated
+from influencers.core.coupons import create_coupons
+from influencers.influencers.models import Influencer, SocialAccount
+
+
+# The subquery locks the rows and reads what they held before, for the audit log
+UPDATE_SQL = """
+    UPDATE {table} SET no_sales = old.new_no_sales, modified = %s
+    FROM (
+        SELECT row.id, row.no_sales, row.modified, v.no_sales AS new_no_sales
+        FROM {table} AS row
+        JOIN unnest(%s::integer[], %s::double precision[]) AS v (id, no_sales)
+            ON row.id = v.id
+        FOR UPDATE OF row
+    ) AS old
+    WHERE {table}.id = old.id
+    RETURNING {table}.id, {table}.assigned_influencer_id, {table}.data_type,
+        {table}.day_sales, old.no_sales, old.modified, {table}.no_sales
+"""
+
+INSERT_SQL = """
+    INSERT INTO {table} (
+        created, modified, assigned_influencer_id, data_type, day_sales, no_sales
+    )
+    SELECT %s, %s, * FROM unnest(
+        %s::integer[], %s::varchar[], %s::date[], %s::double precision[]
+    )
+    RETURNING id, assigned_influencer_id, data_type, day_sales, no_sales
+"""
+
+
+def read_csv(content, encoding=settings.DEFAULT_CHARSET):
+    """ Rows of a CSV document with a header line, as a list of dicts """
+    # utf-8-sig drops the byte order mark spreadsheets put in front
+    if encoding.lower() in ("utf-8", "utf8"):
+        encoding = "utf-8-sig"
+    try:
+        return list(csv.DictReader(io.StringIO(content.decode(encoding))))
+    except (UnicodeDecodeError, csv.Error) as exc:
+        raise ParseError("CSV parse error - {}".format(exc))
+
+
+class CSVParser(BaseParser):
+    media_type = "text/csv"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        return read_csv(stream.read(), encoding)
+
+
+def validate_history_rows(rows):
+    """
+    Validate every row and look the assignments up in one query.
+    Returns the records keyed on (assigned_influencer, data_type, day_sales),
+    the last row wins for a key given twice.
+    Raises ValidationError with the errors of every invalid row by row index.
+    """
+    if not isinstance(rows, list):
+        raise ValidationError({"non_field_errors": ["Expected a list of rows."]})
+
+    serializer = BulkInfluencerHistorySerializer()
+    records, errors = {}, {}
+    for index, row in enumerate(rows):
+        try:
+            data = serializer.run_validation(row)
+        except ValidationError as exc:
+            errors[index] = exc.detail
+            continue
+        key = (data["assigned_influencer"], data["data_type"], data["day_sales"])
+        records[key] = (index, data["no_sales"])
+
+    assigned_ids = {key[0] for key in records}
+    existing_ids = set(
+        AssignedInfluencer.objects.filter(pk__in=assigned_ids)
+        .order_by()
+        .values_list("pk", flat=True)
+    )
+    does_not_exist = PrimaryKeyRelatedField.default_error_messages["does_not_exist"]
+    for key, (index, _) in records.items():
+        if key[0] not in existing_ids:
+            message = does_not_exist.format(pk_value=key[0])
+            errors[index] = {"assigned_influencer": [message]}
+
+    if errors:
+        raise ValidationError({"rows": dict(sorted(errors.items()))})
+    return records
+
+
+def ingest_history(rows):
+    """
+    Create or update InfluencerHistory records from uploaded rows in one
+    transaction, nothing is written if any row is invalid.
+    A row matching a record of the same assignment, type and day updates its
+    number of sales, so uploading a file again does not count it twice.
+    """
+    records = validate_history_rows(rows)
+    assigned_ids = {key[0] for key in records}
+
+    with transaction.atomic():
+        # Concurrent uploads of the same assignments wait for each other, the
+        # later one then sees the records the earlier one created
+        list(
+            AssignedInfluencer.all_objects.select_for_update()
+            .filter(pk__in=assigned_ids)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        current = {}
+        # Descending so the oldest record of a duplicated key is the one kept
+        for pk, *key in (
+            InfluencerHistory.objects.filter(assigned_influencer__in=assigned_ids)
+            .order_by("-pk")
+            .values_list("pk", "assigned_influencer", "data_type", "day_sales")
+        ):
+            current[tuple(key)] = pk
+
+        updates, creates = [], []
+        for key, (_, no_sales) in records.items():
+            if key in current:
+                updates.append((current[key], no_sales))
+            else:
+                creates.append(key + (no_sales,))
+
+        # Rows are sent as arrays, one statement each whatever their number,
+        # building model instances for them would cost more than the writes
+        now = timezone.now()
+        table = InfluencerHistory._meta.db_table
+        with connection.cursor() as cursor:
+            updated = []
+            if updates:
+                cursor.execute(
+                    UPDATE_SQL.format(table=table), [now, *map(list, zip(*updates))]
+                )
+                updated = cursor.fetchall()
+            created = []
+            if creates:
+                cursor.execute(
+                    INSERT_SQL.format(table=table),
+                    [now, now, *map(list, zip(*creates))],
+                )
+                created = cursor.fetchall()
+
+        # Neither write sends the signals auditlog logs on
+        log_created(
+            InfluencerHistory(
+                pk=pk,
+                created=now,
+                modified=now,
+                assigned_influencer_id=assigned_id,
+                data_type=data_type,
+                day_sales=day_sales,
+                no_sales=no_sales,
+            )
+            for pk, assigned_id, data_type, day_sales, no_sales in created
+        )
+        log_updated(
+            InfluencerHistory,
+            (
+                (
+                    {
+                        "pk": pk,
+                        "modified": now,
+                        "assigned_influencer_id": assigned_id,
+                        "data_type": data_type,
+                        "day_sales": day,
+                        "no_sales": sales,
+                    },
+                    {"no_sales": (old_sales, sales), "modified": (old_modified, now)},
+                )
+                for pk, assigned_id, data_type, day, old_sales, old_modified, sales in updated
+            ),
+        )
+
+        # Nor post_save, refresh the rollup once for all rows
+        AssignedInfluencerSales.objects.refresh(assigned_ids)
+
+    return {"created": len(creates), "updated": len(updates)}
+
+
+def validate_assignment_rows(rows):
+    """
+    Validate every row and look the influencers and social accounts up in
+    one query each, a social account must belong to the row's influencer.
+    Raises ValidationError with the errors of every invalid row by row index.
+    """
+    if not isinstance(rows, list):
+        raise ValidationError({"non_field_errors": ["Expected a list of rows."]})
+
+    serializer = BulkAssignedInfluencerSerializer()
+    records, errors = {}, {}
+    for index, row in enumerate(rows):
+        try:
+            records[index] = serializer.run_validation(row)
+        except ValidationError as exc:
+            errors[index] = exc.detail
+
+    influencer_ids = set(
+        Influencer.objects.filter(
+            pk__in={data["influencer"] for data in records.values()}
+        )
+        .order_by()
+        .values_list("pk", flat=True)
+    )
+    account_influencers = dict(
+        SocialAccount.objects.filter(
+            pk__in={data["social_account"] for data in records.values()}
+        )
+        .order_by()
+        .values_list("pk", "influencer")
+    )
+    does_not_exist = PrimaryKeyRelatedField.default_error_messages["does_not_exist"]
+    for index, data in records.items():
+        if data["influencer"] not in influencer_ids:
+            message = does_not_exist.format(pk_value=data["influencer"])
+            errors[index] = {"influencer": [message]}
+        elif data["social_account"] not in account_influencers:
+            message = does_not_exist.format(pk_value=data["social_account"])
+            errors[index] = {"social_account": [message]}
+        elif account_influencers[data["social_account"]] != data["influencer"]:
+            message = "Social account does not belong to the influencer."
+            errors[index] = {"social_account": [message]}
+
+    if errors:
+        raise ValidationError({"rows": dict(sorted(errors.items()))})
+    return [records[index] for index in sorted(records)]
+
+
+def assign_influencers(campaign, rows):
+    """
+    Assign the influencers of the rows to campaign in one transaction, each
+    with a coupon of its discount, nothing is written if any row is invalid.
+    Returns the ids of the assignments created, in the order of the rows.
+    """
+    records = validate_assignment_rows(rows)
+
+    with transaction.atomic():
+        coupons = create_coupons([data["discount"] for data in records])
+        assignments = AssignedInfluencer.objects.bulk_create(
+            AssignedInfluencer(
+                campaign=campaign,
+                influencer_id=data["influencer"],
+                social_account_id=data["social_account"],
+                coupon=coupon,
+                cost=data["cost"],
+                discount=data["discount"],
+                billing=data["billing"],
+                day=data["day"],
+            )
+            for data, coupon in zip(records, coupons)
+        )
+        log_created(assignments)
+
+        # bulk_create sends no post_save, invalidate each month once
+        for month in {get_month(data["day"]) for data in records}:
+            invalidate_month(month)
+
+    return {
+        "created": len(assignments),
+        "ids": [assignment.pk for assignment in assignments],
+    }
@@ -0,0 +1,75 @@
+from datetime import date
+from django.utils.dateparse import parse_date
+from influencers.clients.models import AssignedInfluencer
+from influencers.clients.serializers import CalendarSerializer
+from influencers.core.cache import bump_version, get_cached_data, get_version
+
+
+# Bumped by changes to anything a month renders besides its assignments
+# and payments, such as influencer or offer names
+CALENDAR_NAMESPACE = "calendar"
+CALENDAR_TIMEOUT = 60 * 60 * 24
+
+
+def get_month(day):
+    if isinstance(day, str):
+        day = parse_date(day)
+    return day.replace(day=1)
+
+
+def get_month_namespace(month):
+    return "{}:{:%Y-%m}".format(CALENDAR_NAMESPACE, month)
+
+
+def get_next_month(month):
+    if month.month == 12:
+        return date(month.year + 1, 1, 1)
+    return date(month.year, month.month + 1, 1)
+
+
+def get_months(start, end):
+    month = get_month(start)
+    while month <= end:
+        yield month
+        month = get_next_month(month)
+
+
+def invalidate_month(day):
+    # Dropped now for the rest of the transaction, then again on commit as
+    # other requests may cache the month from before it meanwhile
+    if day is not None:
+        bump_version(get_month_namespace(get_month(day)))
+
+
+def invalidate_calendar():
+    bump_version(CALENDAR_NAMESPACE)
+
+
+def get_month_feed(month):
+    """ Serialized assignments of the month, in one query, cached until it changes """
+
+    def build():
+        assignments = (
+            AssignedInfluencer.objects.filter(
+                day__gte=month, day__lt=get_next_month(month)
+            )
+            .select_related("influencer", "campaign__offer", "influencer_payment")
+            .order_by("day", "id")
+        )
+        return list(CalendarSerializer(assignments, many=True).data)
+
+    return get_cached_data(
+        get_month_namespace(month),
+        get_version(CALENDAR_NAMESPACE),
+        build,
+        timeout=CALENDAR_TIMEOUT,
+    )
+
+
+def get_feed(start, end):
+    """ Serialized assignments from start to end, both included """
+    first, last = start.isoformat(), end.isoformat()
+    feed = []
+    for month in get_months(start, end):
+        feed += [row for row in get_month_feed(month) if first <= row["day"] <= last]
+    return feed
@@ -0,0 +1,229 @@
+import io
+import random
+from datetime import date, timedelta
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+from factory.random import reseed_random
+from influencers.clients.calendar import invalidate_calendar
+from influencers.clients.models import (
+    Client,
+    Offer,
+    Campaign,
+    AssignedInfluencer,
+    AssignedInfluencerSales,
+    InfluencerHistory,
+    InfluencerPayment,
+)
+from influencers.clients.tests.factories import (
+    ClientFactory,
+    OfferFactory,
+    CampaignFactory,
+    AssignedInfluencerFactory,
+    InfluencerPaymentFactory,
+)
+from influencers.core.cache import bump_version, get_namespace
+from influencers.core.models import Category, SocialPlatform, Bank, Coupon
+from influencers.core.tests.factories import (
+    CategoryFactory,
+    SocialPlatformFactory,
+    BankFactory,
+    CouponFactory,
+)
+from influencers.influencers.models import Influencer, SocialAccount
+from influencers.influencers.tests.factories import (
+    InfluencerFactory,
+    SocialAccountFactory,
+)
+from influencers.users.models import User
+
+
+COPY_HISTORY_SQL = """
+    COPY {table} (
+        created, modified, assigned_influencer_id, data_type, no_sales, day_sales
+    ) FROM STDIN
+"""
+
+# Tables the planner needs statistics of once filled
+TABLES = (
+    User,
+    Category,
+    SocialPlatform,
+    Bank,
+    Influencer,
+    SocialAccount,
+    Client,
+    Offer,
+    Campaign,
+    Coupon,
+    AssignedInfluencer,
+    InfluencerPayment,
+    InfluencerHistory,
+    AssignedInfluencerSales,
+)
+
+
+class DatasetGenerator:
+    """
+    Fills the database with a consistent dataset of the given scale: clients
+    with 3 offers of 2 monthly campaigns each, influencers with an account
+    each, assignments with their own coupon, a payment every second one and
+    history rows spread over the assignments. Built with the factories and
+    saved with bulk_create, history with COPY, which send no signals, so the
+    cached reference data and calendar are invalidated once done. The same
+    seed gives the same data, dates being relative to today.
+    """
+
+    OFFERS_PER_CLIENT = 3
+    CAMPAIGNS_PER_OFFER = 2
+
+    def __init__(
+        self,
+        clients=20,
+        influencers=500,
+        assignments=5000,
+        history=100000,
+        seed=0,
+        batch_size=1000,
+    ):
+        self.clients = clients
+        self.influencers = influencers
+        self.assignments = assignments
+        self.history = history
+        self.seed = seed
+        self.batch_size = batch_size
+
+    def create(self, factory, count, **kwargs):
+        """ Builds count instances of factory, kwargs called with the index """
+        model = factory._meta.model
+        # Sequences carry on from the existing rows so unique fields stay unique
+        last = model._base_manager.aggregate(last=Max("pk"))["last"] or 0
+        factory.reset_sequence(last + 1)
+        return model._base_manager.bulk_create(
+            (
+                factory.build(**{name: value(i) for name, value in kwargs.items()})
+                for i in range(count)
+            ),
+            batch_size=self.batch_size,
+        )
+
+    def generate(self, user=None):
+        """ Creates the dataset, account managed by user, returns the rows per table """
+        self.random = random.Random(self.seed)
+        reseed_random(self.seed)
+        choice = self.random.choice
+        today = date.today()
+        now = timezone.now()
+
+        with transaction.atomic():
+            if user is None:
+                user = User.objects.create(
+                    email="dataset{}@mail.com".format(
+                        (User.objects.aggregate(last=Max("pk"))["last"] or 0) + 1
+                    ),
+                    name="Dataset",
+                    is_active=True,
+                    is_staff=True,
+                )
+            categories = self.create(CategoryFactory, 10)
+            platforms = self.create(SocialPlatformFactory, 4)
+            banks = self.create(BankFactory, 10)
+            influencers = self.create(
+                InfluencerFactory,
+                self.influencers,
+                category=lambda i: choice(categories),
+                bank=lambda i: choice(banks),
+            )
+            accounts = self.create(
+                SocialAccountFactory,
+                len(influencers),
+                platform=lambda i: choice(platforms),
+                influencer=lambda i: influencers[i],
+            )
+            clients = self.create(
+                ClientFactory, self.clients, account_manager=lambda i: user
+            )
+            offers = self.create(
+                OfferFactory,
+                len(clients) * self.OFFERS_PER_CLIENT,
+                client=lambda i: clients[i // self.OFFERS_PER_CLIENT],
+                category=lambda i: choice(categories),
+            )
+            campaigns = self.create(
+                CampaignFactory,
+                len(offers) * self.CAMPAIGNS_PER_OFFER,
+                offer=lambda i: offers[i // self.CAMPAIGNS_PER_OFFER],
+                account_manager=lambda i: user,
+                start=lambda i: now
+                - timedelta(days=30 * (i % self.CAMPAIGNS_PER_OFFER)),
+            )
+            coupons = self.create(
+                CouponFactory, self.assignments if accounts and campaigns else 0
+            )
+            assigned = [choice(accounts) for _ in coupons]
+            assignments = self.create(
+                AssignedInfluencerFactory,
+                len(coupons),
+                social_account=lambda i: assigned[i],
+                influencer=lambda i: assigned[i].influencer,
+                campaign=lambda i: choice(campaigns),
+                coupon=lambda i: coupons[i],
+                day=lambda i: today + timedelta(days=self.random.randint(-180, 30)),
+            )
+            payments = self.create(
+                InfluencerPaymentFactory,
+                len(assignments[::2]),
+                assigned_influencer=lambda i: assignments[i * 2],
+                day=lambda i: assignments[i * 2].day,
+            )
+            history = self.copy_history(assignments, now) if assignments else 0
+            AssignedInfluencerSales.objects.refresh(
+                assignment.id for assignment in assignments
+            )
+            for model in (Category, SocialPlatform, Bank):
+                bump_version(get_namespace(model))
+            # Month keys include its version, every month is dropped
+            invalidate_calendar()
+
+        with connection.cursor() as cursor:
+            for model in TABLES:
+                cursor.execute(
+                    "ANALYZE {}".format(connection.ops.quote_name(model._meta.db_table))
+                )
+
+        return {
+            "clients": len(clients),
+            "offers": len(offers),
+            "campaigns": len(campaigns),
+            "influencers": len(influencers),
+            "assignments": len(assignments),
+            "payments": len(payments),
+            "history": history,
+        }
+
+    def copy_history(self, assignments, now):
+        """
+        COPYs the history rows, round robin over the assignments, a batch at a
+        time as a million rows would not fit in one buffer comfortably
+        """
+        table = connection.ops.quote_name(InfluencerHistory._meta.db_table)
+        data_types = [value for value, _ in InfluencerHistory.DATA_TYPES]
+        created = now.isoformat()
+        batch_size = self.batch_size * 100
+        with connection.cursor() as cursor:
+            for start in range(0, self.history, batch_size):
+                rows = io.StringIO()
+                for n in range(start, min(start + batch_size, self.history)):
+                    assignment = assignments[n % len(assignments)]
+                    rows.write(
+                        "{0}\t{0}\t{1}\t{2}\t{3}\t{4}\n".format(
+                            created,
+                            assignment.id,
+                            self.random.choice(data_types),
+                            self.random.randint(0, 50),
+                            assignment.day + timedelta(days=self.random.randint(0, 29)),
+                        )
+                    )
+                rows.seek(0)
+                cursor.copy_expert(COPY_HISTORY_SQL.format(table=table), rows)
+        return self.history
@@ -0,0 +1,287 @@
+import json
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test.utils import override_settings
+from django.utils import timezone
+from rest_framework.schemas.generators import EndpointEnumerator
+from rest_framework.test import APIClient
+from influencers.clients.dataset import DatasetGenerator
+from influencers.clients.models import (
+    Client,
+    Offer,
+    Campaign,
+    AssignedInfluencer,
+    InfluencerHistory,
+    InfluencerPayment,
+)
+from influencers.core.middleware import QueryCollector
+from influencers.influencers.models import Influencer
+from influencers.users.models import User
+from influencers.users.serializers import TokenObtainSerializer
+
+
+# Nested routes take the id of another model than their view's
+PATH_MODELS = {
+    "/clients/{id}/offers/": Client,
+    "/clients/campaigns/{id}/influencers/": Campaign,
+    "/clients/campaigns/influencers/assign/{id}/history/": AssignedInfluencer,
+    "/influencers/{id}/accounts/": Influencer,
+}
+
+# Rows per table reported, as DatasetGenerator.generate returns them
+DATASET = {
+    "clients": Client,
+    "offers": Offer,
+    "campaigns": Campaign,
+    "influencers": Influencer,
+    "assignments": AssignedInfluencer,
+    "payments": InfluencerPayment,
+    "history": InfluencerHistory,
+}
+
+
+def get_percentile(values, percentile):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percentile / 100))]
+
+
+def get_commit():
+    try:
+        return (
+            subprocess.check_output(
+                ["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL
+            )
+            .decode()
+            .strip()
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    """
+    Run command 'python manage.py benchmark_api --output benchmark.json'
+    to seed a dataset, request every GET route of the API and store the
+    latency percentiles, query count and requests per second of each as
+    JSON. Latency is measured one request at a time, throughput with
+    --concurrency clients requesting at once.
+    Pass --compare with a previous result to list the regressions.
+    The dataset is committed so that concurrent clients see it, run it
+    against a dedicated benchmark database, DATABASE_URL pointing to it.
+    Pass --no-seed to measure the data already there, of a previous run or
+    of generate_data.
+    """
+
+    help = "Measure the latency, queries and throughput of every API route"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--clients", type=int, default=20)
+        parser.add_argument("--influencers", type=int, default=500)
+        parser.add_argument("--assignments", type=int, default=5000)
+        parser.add_argument("--history", type=int, default=1000000)
+        parser.add_argument(
+            "--no-seed",
+            action="store_false",
+            dest="seed",
+            help="Measure the existing data rather than seed more",
+        )
+        parser.add_argument("--requests", type=int, default=20)
+        parser.add_argument("--concurrency", type=int, default=4)
+        parser.add_argument("--routes", default="", help="Only paths containing this")
+        parser.add_argument("--output", help="JSON file to store the results in")
+        parser.add_argument("--compare", help="JSON results to compare against")
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=20.0,
+            help="Percentage over which a slower median is a regression",
+        )
+
+    def handle(self, *args, **options):
+        if options["requests"] < 1:
+            raise CommandError("--requests must be at least 1")
+        if options["concurrency"] < 1:
+            raise CommandError("--concurrency must be at least 1")
+        previous = None
+        if options["compare"]:
+            with open(options["compare"]) as results:
+                previous = json.load(results)
+
+        user, _ = User.objects.get_or_create(
+            email="benchmark_api@mail.com",
+            defaults={
+                "name": "Benchmark",
+                "is_active": True,
+                "is_staff": True,
+                "is_superuser": True,
+            },
+        )
+        if options["seed"]:
+            start = time.perf_counter()
+            dataset = DatasetGenerator(
+                clients=options["clients"],
+                influencers=options["influencers"],
+                assignments=options["assignments"],
+                history=options["history"],
+            ).generate(user)
+            self.stdout.write(
+                "Seeded {} in {:.1f}s".format(
+                    ", ".join("{} {}".format(v, k) for k, v in dataset.items()),
+                    time.perf_counter() - start,
+                )
+            )
+        else:
+            dataset = {name: model.objects.count() for name, model in DATASET.items()}
+
+        # The test client requests testserver
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+            routes = self.measure(user, options)
+
+        results = {
+            "commit": get_commit(),
+            "created": timezone.now().isoformat(),
+            "dataset": dataset,
+            "requests": options["requests"],
+            "concurrency": options["concurrency"],
+            "routes": routes,
+        }
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                json.dump(results, output, indent=2, sort_keys=True)
+        if previous is not None:
+            self.compare(previous, results, options["threshold"])
+
+    def get_routes(self, routes):
+        """ (path, url, query parameters) of every GET route to measure """
+        today = date.today()
+        month = {"start": (today - timedelta(days=30)).isoformat(), "end": today}
+        params = {
+            "/clients/calendar/history/feed/": month,
+            "/clients/exports/assigned-influencers/": month,
+            "/clients/exports/history/": month,
+        }
+        for path, method, callback in EndpointEnumerator().get_api_endpoints():
+            if method != "GET" or routes not in path:
+                continue
+            url = path
+            if "{" in path:
+                model = PATH_MODELS.get(path) or callback.cls.queryset.model
+                pk = (
+                    model._default_manager.order_by("pk")
+                    .values_list("pk", flat=True)
+                    .first()
+                )
+                if pk is None:
+                    self.stderr.write("Skipping {}, no row to request".format(path))
+                    continue
+                url = path.replace("{id}", str(pk)).replace("{pk}", str(pk))
+            yield path, url, params.get(path, {})
+
+    def request(self, client, url, params):
+        response = client.get(url, params)
+        if response.streaming:
+            size = sum(len(chunk) for chunk in response.streaming_content)
+        else:
+            size = len(response.content)
+        return response.status_code, size
+
+    def get_client(self, token):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION="JWT {}".format(token))
+        return client
+
+    def get_throughput(self, token, url, params, options):
+        """ Requests per second served to --concurrency clients at once """
+        requests, concurrency = options["requests"], options["concurrency"]
+
+        def send(count):
+            client = self.get_client(token)
+            try:
+                for _ in range(count):
+                    self.request(client, url, params)
+            finally:
+                # Each thread has its own connections
+                connections.close_all()
+
+        counts = [
+            requests // concurrency + (i < requests % concurrency)
+            for i in range(concurrency)
+        ]
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(send, counts))
+        return requests / (time.perf_counter() - start)
+
+    def measure(self, user, options):
+        token = TokenObtainSerializer.get_token(user).access_token
+        client = self.get_client(token)
+
+        self.stdout.write("route\tstatus\tqueries\tp50 ms\tp90 ms\tp99 ms\treq/s")
+        results = {}
+        for path, url, params in self.get_routes(options["routes"]):
+            # The first request warms the caches up, the second counts the
+            # queries as counting slows down the timed ones
+            self.request(client, url, params)
+            queries = QueryCollector()
+            with connection.execute_wrapper(queries):
+                status, size = self.request(client, url, params)
+
+            durations = []
+            for _ in range(options["requests"]):
+                start = time.perf_counter()
+                self.request(client, url, params)
+                durations.append((time.perf_counter() - start) * 1000)
+
+            result = {
+                "status": status,
+                "bytes": size,
+                "queries": queries.count,
+                "p50": get_percentile(durations, 50),
+                "p90": get_percentile(durations, 90),
+                "p99": get_percentile(durations, 99),
+                "mean": sum(durations) / len(durations),
+                "throughput": self.get_throughput(token, url, params, options),
+            }
+            results[path] = result
+            self.stdout.write(
+                "{}\t{status}\t{queries}\t{p50:.1f}\t{p90:.1f}\t{p99:.1f}"
+                "\t{throughput:.1f}".format(path, **result)
+            )
+        return results
+
+    def compare(self, previous, results, threshold):
+        self.stdout.write(
+            "Compared to {}".format(previous.get("commit") or previous["created"])
+        )
+        regressions = 0
+        for path, result in sorted(results["routes"].items()):
+            before = previous["routes"].get(path)
+            if before is None:
+                continue
+            # A median rounded down to nothing before has no ratio to compare
+            change = (
+                (result["p50"] - before["p50"]) * 100 / before["p50"]
+                if before["p50"]
+                else 0.0
+            )
+            slower = change > threshold
+            more_queries = result["queries"] > before["queries"]
+            regressions += slower or more_queries
+            self.stdout.write(
+                "{}\t{:.1f} -> {:.1f} ms ({:+.0f}%)\t{} -> {} queries{}".format(
+                    path,
+                    before["p50"],
+                    result["p50"],
+                    change,
+                    before["queries"],
+                    result["queries"],
+                    "\tREGRESSION" if slower or more_queries else "",
+                )
+            )
+        if regressions:
+            raise CommandError("{} routes regressed".format(regressions))
@@ -0,0 +1,62 @@
+import resource
+import sys
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.test import APIRequestFactory, force_authenticate
+from influencers.clients.dataset import DatasetGenerator
+from influencers.clients.views import InfluencerHistoryExport
+from influencers.users.models import User
+
+
+class Command(BaseCommand):
+    """
+    Run command 'python manage.py benchmark_export --rows 1000000'
+    to stream the history export over that many rows and print the peak
+    resident memory of the process as it goes, which flat streaming keeps
+    near where it started. Rows are created in a transaction rolled back after.
+    """
+
+    help = "Measure the memory used by the influencer history export"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1000000)
+        parser.add_argument("--output", choices=("csv", "ndjson"), default="csv")
+
+    def handle(self, *args, **options):
+        rows = options["rows"]
+        with transaction.atomic():
+            user = self.create_history(rows)
+            request = APIRequestFactory().get("/", {"output": options["output"]})
+            force_authenticate(request, user=user)
+
+            self.stdout.write("rows\tseconds\tpeak RSS KiB")
+            self.write_line(0, time.perf_counter())
+            start = time.perf_counter()
+            response = InfluencerHistoryExport.as_view()(request)
+            lines, size, step = 0, 0, max(rows // 10, 1)
+            for chunk in response.streaming_content:
+                previous, lines = lines, lines + chunk.count(b"\n")
+                size += len(chunk)
+                if lines // step > previous // step:
+                    self.write_line(lines, start)
+            self.write_line(lines, start)
+            self.stdout.write("{} MiB exported".format(size // 2 ** 20))
+
+            transaction.set_rollback(True)
+
+    def write_line(self, lines, start):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KiB, macOS bytes
+        if sys.platform == "darwin":
+            peak //= 1024
+        self.stdout.write(
+            "{}\t{:.1f}\t{}".format(lines, time.perf_counter() - start, peak)
+        )
+
+    def create_history(self, rows):
+        user = User.objects.create(email="benchmark_export@mail.com", is_staff=True)
+        DatasetGenerator(
+            clients=1, influencers=1, assignments=1, history=rows
+        ).generate(user)
+        return user
@@ -0,0 +1,70 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+from influencers.clients.models import AssignedInfluencer
+from influencers.clients.payouts import get_payouts, get_payout_totals
+from influencers.clients.views import PayoutExport
+from influencers.core.exports import render_csv
+
+
+def get_date(value):
+    try:
+        day = parse_date(value)
+    except ValueError:
+        day = None
+    if day is None:
+        raise CommandError("{} is not a date, use YYYY-MM-DD".format(value))
+    return day
+
+
+class Command(BaseCommand):
+    """
+    Run command 'python manage.py compute_payouts --start 2019-01-01 --end 2019-01-31'
+    to sum what the assignments owe their influencers for that period by
+    billing type, fixed costs due then and validated sales made then.
+    Pass --output to write every assignment's payout to a CSV file, with
+    the columns of the payouts export.
+    """
+
+    help = "Compute what the assignments of a period owe their influencers"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--start", type=get_date, required=True)
+        parser.add_argument("--end", type=get_date, required=True)
+        parser.add_argument("--campaign", type=int, action="append")
+        parser.add_argument("--output", help="CSV file to write the payouts to")
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        if options["start"] > options["end"]:
+            raise CommandError("--end must not be before --start")
+        queryset = AssignedInfluencer.objects.all()
+        if options["campaign"]:
+            queryset = queryset.filter(campaign__in=options["campaign"])
+        payouts = get_payouts(options["start"], options["end"], queryset)
+
+        if options["output"]:
+            columns = PayoutExport.columns
+            rows = (
+                payouts.order_by("pk")
+                .values_list(*[lookup for _, lookup in columns])
+                .iterator()
+            )
+            with open(options["output"], "w", newline="") as output:
+                output.writelines(render_csv([header for header, _ in columns], rows))
+
+        totals = get_payout_totals(payouts)
+        for billing, _ in AssignedInfluencer.BILLING_TYPE:
+            row = totals.get(billing, {"assignments": 0, "owed": 0.0})
+            self.stdout.write(
+                "{}\t{} assignments\t{:.2f}".format(
+                    billing, row["assignments"], row["owed"] or 0.0
+                )
+            )
+        self.stdout.write(
+            "{:.2f} owed by {} assignments, computed in {:.1f}s".format(
+                sum(row["owed"] or 0.0 for row in totals.values()),
+                sum(row["assignments"] for row in totals.values()),
+                time.perf_counter() - start,
+            )
+        )
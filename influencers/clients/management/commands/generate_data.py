@@ -0,0 +1,38 @@
+import time
+from django.core.management.base import BaseCommand
+from influencers.clients.dataset import DatasetGenerator
+
+
+class Command(BaseCommand):
+    """
+    Run command 'python manage.py generate_data --influencers 10000 --history 1000000'
+    to fill the database with a consistent dataset of that scale, to profile
+    queries against locally. The same --seed gives the same data.
+    """
+
+    help = "Fill the database with a generated dataset"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--clients", type=int, default=20)
+        parser.add_argument("--influencers", type=int, default=500)
+        parser.add_argument("--assignments", type=int, default=5000)
+        parser.add_argument("--history", type=int, default=100000)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        dataset = DatasetGenerator(
+            clients=options["clients"],
+            influencers=options["influencers"],
+            assignments=options["assignments"],
+            history=options["history"],
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+        ).generate()
+        self.stdout.write(
+            "Generated {} in {:.1f}s".format(
+                ", ".join("{} {}".format(v, k) for k, v in dataset.items()),
+                time.perf_counter() - start,
+            )
+        )
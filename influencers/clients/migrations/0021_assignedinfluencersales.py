@@ -0,0 +1,57 @@
+# Generated by Django 2.1.4 on 2026-10-18 11:21
+
+from django.db import migrations, models
+from django.db.models import Sum, Max, Q
+import django.db.models.deletion
+import django.utils.timezone
+import model_utils.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0020_auto_20190130_1305'),
+    ]
+
+    def migrate_data(apps, schema_editor):
+        InfluencerHistory = apps.get_model("clients", "InfluencerHistory")
+        AssignedInfluencerSales = apps.get_model("clients", "AssignedInfluencerSales")
+        totals = (
+            InfluencerHistory.objects.filter(deleted__isnull=True)
+            .order_by()
+            .values("assigned_influencer")
+            .annotate(
+                total_raw_data=Sum("no_sales", filter=Q(data_type="RAW_DATA")),
+                total_validated_data=Sum(
+                    "no_sales", filter=Q(data_type="VALIDATED_DATA")
+                ),
+                last_day_sales=Max("day_sales"),
+            )
+        )
+        AssignedInfluencerSales.objects.bulk_create(
+            AssignedInfluencerSales(
+                assigned_influencer_id=row["assigned_influencer"],
+                total_raw_data=row["total_raw_data"] or 0.0,
+                total_validated_data=row["total_validated_data"] or 0.0,
+                last_day_sales=row["last_day_sales"],
+            )
+            for row in totals.iterator()
+        )
+
+    operations = [
+        migrations.CreateModel(
+            name='AssignedInfluencerSales',
+            fields=[
+                ('created', model_utils.fields.AutoCreatedField(default=django.utils.timezone.now, editable=False, verbose_name='created')),
+                ('modified', model_utils.fields.AutoLastModifiedField(default=django.utils.timezone.now, editable=False, verbose_name='modified')),
+                ('assigned_influencer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='sales', serialize=False, to='clients.AssignedInfluencer')),
+                ('total_raw_data', models.FloatField(default=0.0)),
+                ('total_validated_data', models.FloatField(default=0.0)),
+                ('last_day_sales', models.DateField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Assigned influencer sales',
+            },
+        ),
+        migrations.RunPython(migrate_data, reverse_code=migrations.RunPython.noop),
+    ]
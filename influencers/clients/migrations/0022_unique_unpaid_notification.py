@@ -0,0 +1,42 @@
+# Generated by Django 2.1.4 on 2026-10-18 11:35
+
+from django.db import migrations
+from django.db.models import Count, Min
+from django.utils import timezone
+import partial_index
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0021_assignedinfluencersales'),
+    ]
+
+    def migrate_data(apps, schema_editor):
+        # Soft delete duplicated notifications before making them unique,
+        # keeping the oldest one
+        InfluencerUnPaidNotification = apps.get_model(
+            "clients", "InfluencerUnPaidNotification"
+        )
+        notifications = InfluencerUnPaidNotification.objects.filter(
+            deleted__isnull=True
+        ).order_by()
+        duplicates = (
+            notifications.values("influencer", "cost", "day")
+            .annotate(keep=Min("id"), count=Count("id"))
+            .filter(count__gt=1)
+        )
+        for duplicate in duplicates:
+            notifications.filter(
+                influencer=duplicate["influencer"],
+                cost=duplicate["cost"],
+                day=duplicate["day"],
+            ).exclude(id=duplicate["keep"]).update(deleted=timezone.now())
+
+    operations = [
+        migrations.RunPython(migrate_data, reverse_code=migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='influencerunpaidnotification',
+            index=partial_index.PartialIndex(fields=['influencer', 'cost', 'day'], name='clients_inf_influen_23538a_partial', unique=True, where=partial_index.PQ(deleted__isnull=True)),
+        ),
+    ]
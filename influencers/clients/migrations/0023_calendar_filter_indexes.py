@@ -0,0 +1,26 @@
+# Generated by Django 2.1.4 on 2026-10-18 11:44
+
+from django.db import migrations
+import partial_index
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0022_unique_unpaid_notification'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='assignedinfluencer',
+            index=partial_index.PartialIndex(fields=['day', 'deleted'], name='clients_ass_day_023562_partial', unique=False, where=partial_index.PQ(deleted__isnull=True)),
+        ),
+        migrations.AddIndex(
+            model_name='influencerpayment',
+            index=partial_index.PartialIndex(fields=['billing_status', 'deleted'], name='clients_inf_billing_d7c890_partial', unique=False, where=partial_index.PQ(deleted__isnull=True)),
+        ),
+        migrations.AddIndex(
+            model_name='influencerunpaidnotification',
+            index=partial_index.PartialIndex(fields=['day', 'deleted'], name='clients_inf_day_e4f943_partial', unique=False, where=partial_index.PQ(deleted__isnull=True)),
+        ),
+    ]
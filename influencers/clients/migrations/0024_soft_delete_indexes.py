@@ -0,0 +1,66 @@
+# Generated by Django 2.1.4 on 2026-10-18 11:47
+
+from django.db import migrations
+import partial_index
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0023_calendar_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='assignedinfluencer',
+            index=partial_index.PartialIndex(fields=['influencer', 'deleted'], name='clients_ass_influen_cc6bbd_partial', unique=False, where=partial_index.PQ(deleted__isnull=True)),
+        ),
+        migrations.AddIndex(
+            model_name='assignedinfluencer',
+            index=partial_index.PartialIndex(fields=['campaign', 'deleted'], name='clients_ass_campaig_1e9381_partial', unique=False, where=partial_index.PQ(deleted__isnull=True)),
+        ),
+        migrations.AddIndex(
+            model_name='assignedinfluencer',
+            index=partial_index.PartialIndex(fields=['social_account', 'deleted'], name='clients_ass_social__471a1a_partial', unique=False, where=partial_index.PQ(deleted__isnull=True)),
+        ),
+        migrations.AddIndex(
+            model_name='assignedinfluencer',
+            index=partial_index.PartialIndex(fields=['coupon', 'deleted'], name='clients_ass_coupon__a5b6dd_partial', unique=False, where=partial_index.PQ(deleted__isnull=True)),
+        ),
+        migrations.AddIndex(
+            model_name='campaign',
+            index=partial_index.PartialIndex(fields=['start', 'deleted'], name='clients_cam_start_176135_partial', unique=False, where=partial_index.PQ(deleted__isnull=True)),
+        ),
+        migrations.AddIndex(
+            model_name='campaign',
+            index=partial_index.PartialIndex(fields=['offer', 'deleted'], name='clients_cam_offer_i_7ebf93_partial', unique=False, where=partial_index.PQ(deleted__isnull=True)),
+        ),
+        migrations.AddIndex(
+            model_name='campaign',
+            index=partial_index.PartialIndex(fields=['account_manager', 'deleted'], name='clients_cam_account_499b55_partial', unique=False, where=partial_index.PQ(deleted__isnull=True)),
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=partial_index.PartialIndex(fields=['name', 'deleted'], name='clients_cli_name_c8a841_partial', unique=False, where=partial_index.PQ(deleted__isnull=True)),
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=partial_index.PartialIndex(fields=['account_manager', 'deleted'], name='clients_cli_account_d3ff30_partial', unique=False, where=partial_index.PQ(deleted__isnull=True)),
+        ),
+        migrations.AddIndex(
+            model_name='influencerhistory',
+            index=partial_index.PartialIndex(fields=['assigned_influencer', 'deleted'], name='clients_inf_assigne_9ca80e_partial', unique=False, where=partial_index.PQ(deleted__isnull=True)),
+        ),
+        migrations.AddIndex(
+            model_name='offer',
+            index=partial_index.PartialIndex(fields=['name', 'deleted'], name='clients_off_name_27bfa3_partial', unique=False, where=partial_index.PQ(deleted__isnull=True)),
+        ),
+        migrations.AddIndex(
+            model_name='offer',
+            index=partial_index.PartialIndex(fields=['client', 'deleted'], name='clients_off_client__a768e8_partial', unique=False, where=partial_index.PQ(deleted__isnull=True)),
+        ),
+        migrations.AddIndex(
+            model_name='offer',
+            index=partial_index.PartialIndex(fields=['category', 'deleted'], name='clients_off_categor_aa4cc5_partial', unique=False, where=partial_index.PQ(deleted__isnull=True)),
+        ),
+    ]
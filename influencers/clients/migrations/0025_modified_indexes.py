@@ -0,0 +1,21 @@
+# Generated by Django 2.1.4 on 2026-10-18 12:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0024_soft_delete_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='assignedinfluencer',
+            index=models.Index(fields=['modified'], name='clients_ass_modifie_dde9ed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='influencerhistory',
+            index=models.Index(fields=['modified'], name='clients_inf_modifie_e5ac64_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 2.1.4 on 2026-10-18 13:12
+
+from django.db import migrations
+import partial_index
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0025_modified_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='assignedinfluencer',
+            index=partial_index.PartialIndex(fields=['deleted'], name='clients_ass_deleted_65052c_partial', unique=False, where=partial_index.PQ(deleted__isnull=False)),
+        ),
+        migrations.AddIndex(
+            model_name='campaign',
+            index=partial_index.PartialIndex(fields=['deleted'], name='clients_cam_deleted_6cece0_partial', unique=False, where=partial_index.PQ(deleted__isnull=False)),
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=partial_index.PartialIndex(fields=['deleted'], name='clients_cli_deleted_89ca30_partial', unique=False, where=partial_index.PQ(deleted__isnull=False)),
+        ),
+        migrations.AddIndex(
+            model_name='influencerhistory',
+            index=partial_index.PartialIndex(fields=['deleted'], name='clients_inf_deleted_1a6e9b_partial', unique=False, where=partial_index.PQ(deleted__isnull=False)),
+        ),
+        migrations.AddIndex(
+            model_name='influencerpayment',
+            index=partial_index.PartialIndex(fields=['deleted'], name='clients_inf_deleted_1c7816_partial', unique=False, where=partial_index.PQ(deleted__isnull=False)),
+        ),
+        migrations.AddIndex(
+            model_name='influencerunpaidnotification',
+            index=partial_index.PartialIndex(fields=['deleted'], name='clients_inf_deleted_9c14af_partial', unique=False, where=partial_index.PQ(deleted__isnull=False)),
+        ),
+        migrations.AddIndex(
+            model_name='offer',
+            index=partial_index.PartialIndex(fields=['deleted'], name='clients_off_deleted_154250_partial', unique=False, where=partial_index.PQ(deleted__isnull=False)),
+        ),
+    ]
@@ -1,11 +1,14 @@
-from django.db import models
-from django.db.models import Sum
+from django.db import models, transaction
+from django.db.models import Sum, Max, Q
 from model_utils.models import TimeStampedModel
 from model_utils.fields import StatusField
-from model_utils import Choices
+from model_utils import Choices, FieldTracker
 from phonenumber_field.modelfields import PhoneNumberField
 from auditlog.registry import auditlog
 from safedelete.models import SafeDeleteModel, SOFT_DELETE_CASCADE
+from safedelete.managers import SafeDeleteManager
+from safedelete.queryset import SafeDeleteQueryset
+from partial_index import PartialIndex, PQ
 from influencers.users.models import User
 from influencers.core.models import Category, Coupon
 from influencers.influencers.models import Influencer, SocialAccount
@@ -20,6 +23,19 @@ class Client(TimeStampedModel, SafeDeleteModel):
 
     class Meta:
         ordering = ["name"]
+        indexes = [
+            PartialIndex(
+                fields=["name", "deleted"], unique=False, where=PQ(deleted__isnull=True)
+            ),
+            PartialIndex(
+                fields=["account_manager", "deleted"],
+                unique=False,
+                where=PQ(deleted__isnull=True),
+            ),
+            PartialIndex(
+                fields=["deleted"], unique=False, where=PQ(deleted__isnull=False)
+            ),
+        ]
 
     name = models.CharField(max_length=50, blank=False)
     email = models.EmailField(blank=True)
@@ -41,6 +57,24 @@ class Offer(TimeStampedModel, SafeDeleteModel):
 
     class Meta:
         ordering = ["name"]
+        indexes = [
+            PartialIndex(
+                fields=["name", "deleted"], unique=False, where=PQ(deleted__isnull=True)
+            ),
+            PartialIndex(
+                fields=["client", "deleted"],
+                unique=False,
+                where=PQ(deleted__isnull=True),
+            ),
+            PartialIndex(
+                fields=["category", "deleted"],
+                unique=False,
+                where=PQ(deleted__isnull=True),
+            ),
+            PartialIndex(
+                fields=["deleted"], unique=False, where=PQ(deleted__isnull=False)
+            ),
+        ]
 
     name = models.CharField(max_length=50, blank=False)
     client = models.ForeignKey(Client, on_delete=models.CASCADE, related_name="offers")
@@ -67,6 +101,26 @@ class Campaign(TimeStampedModel, SafeDeleteModel):
 
     class Meta:
         ordering = ["-start"]
+        indexes = [
+            PartialIndex(
+                fields=["start", "deleted"],
+                unique=False,
+                where=PQ(deleted__isnull=True),
+            ),
+            PartialIndex(
+                fields=["offer", "deleted"],
+                unique=False,
+                where=PQ(deleted__isnull=True),
+            ),
+            PartialIndex(
+                fields=["account_manager", "deleted"],
+                unique=False,
+                where=PQ(deleted__isnull=True),
+            ),
+            PartialIndex(
+                fields=["deleted"], unique=False, where=PQ(deleted__isnull=False)
+            ),
+        ]
 
     offer = models.ForeignKey(Offer, on_delete=models.CASCADE, related_name="campaigns")
     account_manager = models.ForeignKey(
@@ -82,15 +136,57 @@ class Campaign(TimeStampedModel, SafeDeleteModel):
         return "Campaign for {} from {} to {}".format(self.offer, self.start, self.end)
 
 
+class AssignedInfluencerQuerySet(SafeDeleteQueryset):
+    def with_related(self):
+        """
+        Join everything AssignedInfluencerSerializer renders, sales totals
+        included, so a page of assignments is fetched in a single query
+        """
+        return self.select_related(
+            "social_account", "influencer", "campaign", "coupon", "sales"
+        )
+
+
 class AssignedInfluencer(TimeStampedModel, SafeDeleteModel):
     """
     This represents assigned influencers to a campaign
     """
 
     _safedelete_policy = SOFT_DELETE_CASCADE
+    objects = SafeDeleteManager.from_queryset(AssignedInfluencerQuerySet)()
 
     class Meta:
         ordering = ["influencer"]
+        indexes = [
+            PartialIndex(
+                fields=["day", "deleted"], unique=False, where=PQ(deleted__isnull=True)
+            ),
+            PartialIndex(
+                fields=["influencer", "deleted"],
+                unique=False,
+                where=PQ(deleted__isnull=True),
+            ),
+            PartialIndex(
+                fields=["campaign", "deleted"],
+                unique=False,
+                where=PQ(deleted__isnull=True),
+            ),
+            PartialIndex(
+                fields=["social_account", "deleted"],
+                unique=False,
+                where=PQ(deleted__isnull=True),
+            ),
+            PartialIndex(
+                fields=["coupon", "deleted"],
+                unique=False,
+                where=PQ(deleted__isnull=True),
+            ),
+            # Changes picked up by the reporting refresh, soft deleted included
+            models.Index(fields=["modified"]),
+            PartialIndex(
+                fields=["deleted"], unique=False, where=PQ(deleted__isnull=False)
+            ),
+        ]
 
     social_account = models.ForeignKey(
         SocialAccount, on_delete=models.CASCADE, related_name="assigned_influencer"
@@ -120,17 +216,13 @@ class AssignedInfluencer(TimeStampedModel, SafeDeleteModel):
 
     @property
     def total_raw_data(self):
-        query = self.history.filter(data_type="RAW_DATA")
-        aggregation = query.aggregate(total_raw_data=Sum("no_sales"))
-        result = aggregation.get("total_raw_data")
-        return result or 0.0
+        sales = getattr(self, "sales", None)
+        return sales.total_raw_data if sales else 0.0
 
     @property
     def total_validated_data(self):
-        query = self.history.filter(data_type="VALIDATED_DATA")
-        aggregation = query.aggregate(total_validated_data=Sum("no_sales"))
-        result = aggregation.get("total_validated_data")
-        return result or 0.0
+        sales = getattr(self, "sales", None)
+        return sales.total_validated_data if sales else 0.0
 
     def __str__(self):
         return "{} should be received {} before {}".format(
@@ -154,15 +246,98 @@ class InfluencerHistory(TimeStampedModel, SafeDeleteModel):
     )
     no_sales = models.FloatField(default=0.0)
     day_sales = models.DateField(blank=False, null=False)
+    tracker = FieldTracker(fields=["assigned_influencer"])
 
     class Meta:
         verbose_name_plural = "Influencer histories"
         ordering = ["assigned_influencer"]
+        indexes = [
+            PartialIndex(
+                fields=["assigned_influencer", "deleted"],
+                unique=False,
+                where=PQ(deleted__isnull=True),
+            ),
+            # Changes picked up by the reporting refresh, soft deleted included
+            models.Index(fields=["modified"]),
+            PartialIndex(
+                fields=["deleted"], unique=False, where=PQ(deleted__isnull=False)
+            ),
+        ]
 
     def __str__(self):
         return "No sales {} on {}".format(self.no_sales, self.day_sales)
 
 
+class AssignedInfluencerSalesManager(models.Manager):
+    def refresh(self, assigned_influencer_ids):
+        """
+        Recompute the sales rollup of the given assignments from their history,
+        touching only those assignments' rows
+        """
+        ids = sorted(set(assigned_influencer_ids))
+        if not ids:
+            return
+        with transaction.atomic():
+            # Serialize concurrent history writes of the same assignment,
+            # the aggregate below then sees every committed row
+            list(
+                AssignedInfluencer.all_objects.select_for_update()
+                .filter(pk__in=ids)
+                .order_by("pk")
+                .values_list("pk", flat=True)
+            )
+            totals = (
+                InfluencerHistory.objects.filter(assigned_influencer__in=ids)
+                .order_by()
+                .values("assigned_influencer")
+                .annotate(
+                    total_raw_data=Sum(
+                        "no_sales",
+                        filter=Q(data_type=InfluencerHistory.DATA_TYPES.RAW_DATA),
+                    ),
+                    total_validated_data=Sum(
+                        "no_sales",
+                        filter=Q(data_type=InfluencerHistory.DATA_TYPES.VALIDATED_DATA),
+                    ),
+                    last_day_sales=Max("day_sales"),
+                )
+            )
+            self.filter(assigned_influencer__in=ids).delete()
+            self.bulk_create(
+                self.model(
+                    assigned_influencer_id=row["assigned_influencer"],
+                    total_raw_data=row["total_raw_data"] or 0.0,
+                    total_validated_data=row["total_validated_data"] or 0.0,
+                    last_day_sales=row["last_day_sales"],
+                )
+                for row in totals
+            )
+
+
+class AssignedInfluencerSales(TimeStampedModel):
+    """
+    Sales totals of an assigned influencer, maintained from InfluencerHistory
+    so listings read them with a join instead of aggregating per row
+    """
+
+    assigned_influencer = models.OneToOneField(
+        AssignedInfluencer,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="sales",
+    )
+    total_raw_data = models.FloatField(default=0.0)
+    total_validated_data = models.FloatField(default=0.0)
+    last_day_sales = models.DateField(null=True, blank=True)
+    objects = AssignedInfluencerSalesManager()
+
+    class Meta:
+        verbose_name_plural = "Assigned influencer sales"
+
+    def __str__(self):
+        return "Sales of {}".format(self.assigned_influencer)
+
+
 class InfluencerPayment(TimeStampedModel, SafeDeleteModel):
     """ An InfluencerPayment is payment record to campaign assigned to influencer by an accountant """
 
@@ -178,6 +353,18 @@ class InfluencerPayment(TimeStampedModel, SafeDeleteModel):
     BILLING_STATUS = Choices("UNPAID", "PAID")
     billing_status = StatusField(choices_name="BILLING_STATUS", blank=False, null=False)
 
+    class Meta:
+        indexes = [
+            PartialIndex(
+                fields=["billing_status", "deleted"],
+                unique=False,
+                where=PQ(deleted__isnull=True),
+            ),
+            PartialIndex(
+                fields=["deleted"], unique=False, where=PQ(deleted__isnull=False)
+            ),
+        ]
+
     def __str__(self):
         return "Payment to {} on {}".format(self.assigned_influencer, self.day)
 
@@ -195,6 +382,19 @@ class InfluencerUnPaidNotification(TimeStampedModel, SafeDeleteModel):
     class Meta:
         verbose_name_plural = "Influencer upaid notifications"
         ordering = ["influencer"]
+        indexes = [
+            PartialIndex(
+                fields=["influencer", "cost", "day"],
+                unique=True,
+                where=PQ(deleted__isnull=True),
+            ),
+            PartialIndex(
+                fields=["day", "deleted"], unique=False, where=PQ(deleted__isnull=True)
+            ),
+            PartialIndex(
+                fields=["deleted"], unique=False, where=PQ(deleted__isnull=False)
+            ),
+        ]
 
     def __str__(self):
         return "Influencer {} costs {} on {}".format(
@@ -0,0 +1,90 @@
+from django.db import connection
+from django.db.models import Case, F, FilteredRelation, FloatField, Q, Sum, Value, When
+from django.db.models.functions import Coalesce
+from influencers.clients.models import AssignedInfluencer, InfluencerHistory
+
+
+BILLING = AssignedInfluencer.BILLING_TYPE
+
+TOTALS_SQL = """
+    SELECT billing, count(*), sum(owed) FROM ({payouts}) AS payouts
+    GROUP BY billing
+"""
+
+
+def get_period_history(start, end):
+    """ Validated sales from start to end, both included """
+    # Used unevaluated, as a subquery, safedelete does not filter it then
+    return InfluencerHistory.objects.filter(
+        data_type=InfluencerHistory.DATA_TYPES.VALIDATED_DATA,
+        day_sales__gte=start,
+        day_sales__lte=end,
+        deleted__isnull=True,
+    )
+
+
+def get_owed(start, end):
+    """
+    What an assignment owes for the period per billing type, sales being
+    its validated ones of the period: FIXED_COST its own cost, once, in the
+    period of its day, REVENUE_SHARE_FIXED the campaign's cost_fixed per
+    item sold, REVENUE_SHARE_PERCENTAGE cost_percentage of the revenue,
+    items being sold at cost_fixed less the campaign's discount_percent
+    """
+    return Case(
+        When(billing=BILLING.FIXED_COST, day__gte=start, day__lte=end, then=F("cost")),
+        When(
+            billing=BILLING.REVENUE_SHARE_FIXED,
+            then=F("validated_sales") * F("campaign__cost_fixed"),
+        ),
+        When(
+            billing=BILLING.REVENUE_SHARE_PERCENTAGE,
+            then=F("validated_sales")
+            * F("campaign__cost_fixed")
+            * (100 - F("campaign__discount_percent"))
+            / 100
+            * F("campaign__cost_percentage")
+            / 100,
+        ),
+        default=Value(0.0),
+        output_field=FloatField(),
+    )
+
+
+def get_payouts(start, end, queryset=None):
+    """
+    The assignments due from start to end or with validated sales then,
+    annotated with validated_sales, those of the period, and owed, the
+    amount due to their influencers for it. Computed by the database for
+    all of them at once from the history and their campaigns, so sales
+    recorded later are paid with the period they were made in.
+    """
+    if queryset is None:
+        queryset = AssignedInfluencer.objects.all()
+    sold = get_period_history(start, end).values("assigned_influencer")
+    in_period = Q(
+        history__data_type=InfluencerHistory.DATA_TYPES.VALIDATED_DATA,
+        history__day_sales__gte=start,
+        history__day_sales__lte=end,
+        history__deleted__isnull=True,
+    )
+    # Summed once per assignment over a join of its history of the period,
+    # owed repeats the same aggregate, which PostgreSQL computes once
+    return (
+        queryset.filter(Q(day__gte=start, day__lte=end) | Q(pk__in=sold))
+        .annotate(period_history=FilteredRelation("history", condition=in_period))
+        .annotate(validated_sales=Coalesce(Sum("period_history__no_sales"), Value(0.0)))
+        .annotate(owed=get_owed(start, end))
+    )
+
+
+def get_payout_totals(queryset):
+    """ Assignments and amount owed of each billing type of the payouts """
+    # owed is an aggregate already, summed over the payouts as a subquery
+    sql, params = queryset.order_by().values("billing", "owed").query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(TOTALS_SQL.format(payouts=sql), params)
+        return {
+            billing: {"billing": billing, "assignments": assignments, "owed": owed}
+            for billing, assignments, owed in cursor.fetchall()
+        }
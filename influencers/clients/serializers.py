@@ -1,9 +1,16 @@
 from rest_framework.serializers import (
+    Serializer,
     ModelSerializer,
     SerializerMethodField,
+    ChoiceField,
+    DateField,
     FloatField,
+    IntegerField,
     PrimaryKeyRelatedField,
+    ValidationError,
 )
+from influencers.core.cache import CachedReferenceField
+from influencers.core.models import Category
 from influencers.clients.models import (
     Client,
     Offer,
@@ -30,7 +37,11 @@ class ClientSerializer(ModelSerializer):
         fields = ("id", "name", "email", "account_manager", "phone", "offer_count")
 
     def get_offer_count(self, obj):
-        return obj.offers.count()
+        # ClientViewSet annotates the count on its queryset
+        offer_count = getattr(obj, "offer_count", None)
+        if offer_count is None:
+            return obj.offers.count()
+        return offer_count
 
 
 class CreateOfferSerializer(ModelSerializer):
@@ -40,6 +51,8 @@ class CreateOfferSerializer(ModelSerializer):
 
 
 class OfferSerializer(ModelSerializer):
+    category = CachedReferenceField(Category, source="category_id")
+
     class Meta:
         model = Offer
         depth = 1
@@ -92,6 +105,17 @@ class CreateAssignedInfluencerSerializer(ModelSerializer):
         )
 
 
+class BulkAssignedInfluencerSerializer(Serializer):
+    """ One influencer of a bulk assignment, references are checked for all at once """
+
+    influencer = IntegerField(min_value=1)
+    social_account = IntegerField(min_value=1)
+    cost = FloatField(default=0.0)
+    discount = IntegerField(default=0)
+    billing = ChoiceField(choices=AssignedInfluencer.BILLING_TYPE)
+    day = DateField()
+
+
 class AssignedInfluencerSerializer(ModelSerializer):
     total_raw_data = FloatField(read_only=True)
     total_validated_data = FloatField(read_only=True)
@@ -120,6 +144,15 @@ class CreateInfluencerHistorySerializer(ModelSerializer):
         fields = ("id", "assigned_influencer", "data_type", "no_sales", "day_sales")
 
 
+class BulkInfluencerHistorySerializer(Serializer):
+    """ One row of a bulk upload, assignments are checked for all rows at once """
+
+    assigned_influencer = IntegerField(min_value=1)
+    data_type = ChoiceField(choices=InfluencerHistory.DATA_TYPES)
+    no_sales = FloatField(default=0.0)
+    day_sales = DateField()
+
+
 class UpdateInfluencerHistorySerializer(ModelSerializer):
     class Meta:
         model = InfluencerHistory
@@ -166,6 +199,57 @@ class CalendarSerializer(ModelSerializer):
             return None
 
 
+class CalendarFeedSerializer(Serializer):
+    """ Date window of the calendar feed """
+
+    max_months = 12
+    start = DateField()
+    end = DateField()
+
+    def validate(self, data):
+        start, end = data["start"], data["end"]
+        if start > end:
+            raise ValidationError({"end": ["End must not be before start."]})
+        months = (end.year - start.year) * 12 + end.month - start.month + 1
+        if months > self.max_months:
+            raise ValidationError(
+                {"end": ["Ask for {} months at most.".format(self.max_months)]}
+            )
+        return data
+
+
+class PayoutFilterSerializer(Serializer):
+    """ Period the payouts are computed for, both days included """
+
+    start = DateField()
+    end = DateField()
+
+    def validate(self, data):
+        if data["start"] > data["end"]:
+            raise ValidationError({"end": ["End must not be before start."]})
+        return data
+
+
+class CalendarFilterSerializer(Serializer):
+    """ Query parameters filtering the calendar, all optional """
+
+    start = DateField(required=False)
+    end = DateField(required=False)
+    campaign = IntegerField(required=False)
+    influencer = IntegerField(required=False)
+    billing_status = ChoiceField(
+        choices=InfluencerPayment.BILLING_STATUS, required=False
+    )
+
+
+class UnPaidNotificationFilterSerializer(Serializer):
+    """ Query parameters filtering the notifications, all optional """
+
+    start = DateField(required=False)
+    end = DateField(required=False)
+    influencer = IntegerField(required=False)
+
+
 class CreateInfluencerUnPaidNotificationSerializer(ModelSerializer):
     class Meta:
         model = InfluencerUnPaidNotification
@@ -0,0 +1,83 @@
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from influencers.clients.calendar import invalidate_calendar, invalidate_month
+from influencers.clients.models import (
+    Offer,
+    Campaign,
+    AssignedInfluencer,
+    AssignedInfluencerSales,
+    InfluencerHistory,
+    InfluencerPayment,
+)
+from influencers.influencers.models import Influencer
+
+
+@receiver(post_save, sender=InfluencerHistory)
+def refresh_sales_on_save(sender, instance, **kwargs):
+    """ Soft delete and undelete are saves too, so they are covered here """
+    assigned_ids = [instance.assigned_influencer_id]
+    previous_id = instance.tracker.previous("assigned_influencer")
+    if previous_id:
+        assigned_ids.append(previous_id)
+    AssignedInfluencerSales.objects.refresh(assigned_ids)
+
+
+@receiver(post_delete, sender=InfluencerHistory)
+def refresh_sales_on_delete(sender, instance, **kwargs):
+    # A hard delete may be cascading from the assignment itself,
+    # so wait until it is done before writing its rollup again
+    assigned_id = instance.assigned_influencer_id
+    transaction.on_commit(
+        lambda: AssignedInfluencerSales.objects.refresh([assigned_id])
+    )
+
+
+@receiver(pre_save, sender=AssignedInfluencer)
+def invalidate_calendar_previous_month(sender, instance, **kwargs):
+    # The assignment may be moving to another month
+    if instance.pk:
+        invalidate_month(
+            AssignedInfluencer.all_objects.filter(pk=instance.pk)
+            .values_list("day", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=AssignedInfluencer)
+@receiver(post_delete, sender=AssignedInfluencer)
+def invalidate_calendar_month(sender, instance, **kwargs):
+    invalidate_month(instance.day)
+
+
+@receiver(pre_save, sender=InfluencerPayment)
+def invalidate_calendar_previous_payment_month(sender, instance, **kwargs):
+    # The payment may be moving to another assignment
+    if instance.pk:
+        invalidate_month(
+            InfluencerPayment.all_objects.filter(pk=instance.pk)
+            .values_list("assigned_influencer__day", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=InfluencerPayment)
+@receiver(post_delete, sender=InfluencerPayment)
+def invalidate_calendar_payment_month(sender, instance, **kwargs):
+    # Gone when the delete cascades from the assignment, which handles it
+    invalidate_month(
+        AssignedInfluencer.all_objects.filter(pk=instance.assigned_influencer_id)
+        .values_list("day", flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=Influencer)
+@receiver(post_save, sender=Offer)
+@receiver(post_save, sender=Campaign)
+@receiver(post_delete, sender=Influencer)
+@receiver(post_delete, sender=Offer)
+@receiver(post_delete, sender=Campaign)
+def invalidate_calendar_names(sender, **kwargs):
+    """ Calendar months nest influencers and campaigns, and offer names """
+    invalidate_calendar()
@@ -1,4 +1,15 @@
-from factory import DjangoModelFactory
+from datetime import date, timedelta
+from django.utils import timezone
+from factory import (
+    DjangoModelFactory,
+    Faker,
+    LazyAttribute,
+    LazyFunction,
+    Sequence,
+    SelfAttribute,
+    SubFactory,
+)
+from factory.fuzzy import FuzzyChoice, FuzzyFloat, FuzzyInteger
 from influencers.clients.models import (
     Client,
     Offer,
@@ -7,33 +18,75 @@ from influencers.clients.models import (
     InfluencerHistory,
     InfluencerPayment,
 )
+from influencers.core.tests.factories import CategoryFactory, CouponFactory
+from influencers.influencers.tests.factories import SocialAccountFactory
+from influencers.users.tests.factories import UserFactory
+
+
+def get_values(choices):
+    return [value for value, _ in choices]
 
 
 class ClientFactory(DjangoModelFactory):
+    name = Faker("company")
+    email = Faker("company_email")
+    account_manager = SubFactory(UserFactory)
+    phone = Sequence(lambda n: "+2011{:08d}".format(n))
+
     class Meta:
         model = Client
 
 
 class OfferFactory(DjangoModelFactory):
+    name = Sequence(lambda n: "Offer {}".format(n))
+    client = SubFactory(ClientFactory)
+    category = SubFactory(CategoryFactory)
+    billing = FuzzyChoice(get_values(Offer.BILLING_TYPE))
+
     class Meta:
         model = Offer
 
 
 class CampaignFactory(DjangoModelFactory):
+    offer = SubFactory(OfferFactory)
+    account_manager = SelfAttribute("offer.client.account_manager")
+    cost_fixed = FuzzyFloat(0, 1000)
+    cost_percentage = FuzzyFloat(0, 50)
+    discount_percent = FuzzyFloat(0, 30)
+    start = LazyFunction(timezone.now)
+    end = LazyAttribute(lambda campaign: campaign.start + timedelta(days=29))
+
     class Meta:
         model = Campaign
 
 
 class AssignedInfluencerFactory(DjangoModelFactory):
+    social_account = SubFactory(SocialAccountFactory)
+    influencer = SelfAttribute("social_account.influencer")
+    campaign = SubFactory(CampaignFactory)
+    coupon = SubFactory(CouponFactory)
+    billing = FuzzyChoice(get_values(AssignedInfluencer.BILLING_TYPE))
+    cost = FuzzyFloat(100, 5000)
+    day = LazyFunction(date.today)
+
     class Meta:
         model = AssignedInfluencer
 
 
 class InfluencerHistoryFactory(DjangoModelFactory):
+    assigned_influencer = SubFactory(AssignedInfluencerFactory)
+    data_type = FuzzyChoice(get_values(InfluencerHistory.DATA_TYPES))
+    no_sales = FuzzyInteger(0, 50)
+    day_sales = SelfAttribute("assigned_influencer.day")
+
     class Meta:
         model = InfluencerHistory
 
 
 class InfluencerPaymentFactory(DjangoModelFactory):
+    assigned_influencer = SubFactory(AssignedInfluencerFactory)
+    day = SelfAttribute("assigned_influencer.day")
+    billing_status = FuzzyChoice(get_values(InfluencerPayment.BILLING_STATUS))
+
     class Meta:
         model = InfluencerPayment
@@ -0,0 +1,54 @@
+from datetime import date
+from django.db import transaction
+from django.test import TransactionTestCase
+from influencers.clients.bulk import assign_influencers
+from influencers.clients.calendar import (
+    CALENDAR_NAMESPACE,
+    get_month_feed,
+    get_month_namespace,
+)
+from influencers.clients.tests.factories import AssignedInfluencerFactory
+from influencers.core.cache import get_cached_data, get_version
+
+
+class CalendarCommitTestCase(TransactionTestCase):
+    """
+    Test a month cached by another request while a change to it is not
+    committed yet, so from the rows before it, is not served once it is
+    """
+
+    def setUp(self):
+        self.month = date(2019, 1, 1)
+        self.assignment = AssignedInfluencerFactory(day=date(2019, 1, 10))
+
+    def cache_month(self, feed):
+        """ Caches feed as the month, the way a concurrent request would """
+        get_cached_data(
+            get_month_namespace(self.month),
+            get_version(CALENDAR_NAMESPACE),
+            lambda: feed,
+        )
+
+    def test_saved(self):
+        before = get_month_feed(self.month)
+        with transaction.atomic():
+            self.assignment.day = date(2019, 2, 10)
+            self.assignment.save()
+            self.cache_month(before)
+            self.assertEqual(get_month_feed(self.month), before)
+        self.assertEqual(get_month_feed(self.month), [])
+
+    def test_bulk_assigned(self):
+        before = get_month_feed(self.month)
+        row = {
+            "influencer": self.assignment.influencer_id,
+            "social_account": self.assignment.social_account_id,
+            "cost": 100.0,
+            "discount": 10,
+            "billing": "FIXED_COST",
+            "day": "2019-01-11",
+        }
+        with transaction.atomic():
+            assign_influencers(self.assignment.campaign, [row])
+            self.cache_month(before)
+        self.assertEqual(len(get_month_feed(self.month)), 2)
@@ -0,0 +1,80 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TransactionTestCase
+from influencers.clients.management.commands.benchmark_api import Command
+from influencers.clients.models import Client
+
+
+class BenchmarkAPITestCase(TransactionTestCase):
+    """
+    Test the API benchmark runs and compares against its own results, its
+    concurrent clients only see committed rows
+    """
+
+    def setUp(self):
+        handle, self.output = tempfile.mkstemp(suffix=".json")
+        os.close(handle)
+        self.addCleanup(os.remove, self.output)
+
+    def benchmark(self, *args):
+        out = StringIO()
+        call_command(
+            "benchmark_api",
+            "--clients",
+            "1",
+            "--influencers",
+            "5",
+            "--assignments",
+            "10",
+            "--history",
+            "10",
+            "--requests",
+            "3",
+            "--concurrency",
+            "2",
+            "--routes",
+            "/clients/",
+            *args,
+            stdout=out,
+            stderr=StringIO()
+        )
+        return out.getvalue()
+
+    def test_benchmark(self):
+        self.benchmark("--output", self.output)
+        with open(self.output) as results:
+            results = json.load(results)
+        self.assertEqual(results["dataset"]["assignments"], 10)
+        self.assertIn("/clients/", results["routes"])
+        route = results["routes"]["/clients/"]
+        self.assertEqual(route["status"], 200)
+        self.assertGreater(route["queries"], 0)
+        self.assertLessEqual(route["p50"], route["p99"])
+        self.assertGreater(route["throughput"], 0)
+        # The seeded rows are kept for the next runs
+        self.assertEqual(Client.objects.count(), 1)
+
+        # Timings vary between runs, queries do not
+        out = self.benchmark(
+            "--no-seed", "--compare", self.output, "--threshold", "100000"
+        )
+        self.assertIn("Compared to", out)
+        self.assertNotIn("REGRESSION", out)
+        self.assertEqual(Client.objects.count(), 1)
+
+    def test_no_requests(self):
+        with self.assertRaises(CommandError):
+            self.benchmark("--requests", "0")
+        with self.assertRaises(CommandError):
+            self.benchmark("--concurrency", "0")
+
+    def test_compare_to_nothing(self):
+        previous = {"created": "", "routes": {"/": {"p50": 0.0, "queries": 3}}}
+        results = {"routes": {"/": {"p50": 1.0, "queries": 3}}}
+        command = Command(stdout=StringIO())
+        command.compare(previous, results, 20.0)
+        self.assertIn("0.0 -> 1.0 ms", command.stdout.getvalue())
@@ -0,0 +1,66 @@
+from django.db.models import F, Sum
+from django.test import TestCase
+from influencers.clients.dataset import DatasetGenerator
+from influencers.clients.models import (
+    Campaign,
+    AssignedInfluencer,
+    AssignedInfluencerSales,
+    InfluencerHistory,
+    InfluencerPayment,
+)
+from influencers.core.models import Coupon
+from influencers.influencers.models import Influencer
+
+
+class DatasetGeneratorTestCase(TestCase):
+    """ Test the generated dataset is consistent and repeatable """
+
+    def generate(self, seed=0):
+        return DatasetGenerator(
+            clients=2, influencers=10, assignments=30, history=200, seed=seed
+        ).generate()
+
+    def test_counts(self):
+        dataset = self.generate()
+        self.assertEqual(
+            dataset,
+            {
+                "clients": 2,
+                "offers": 6,
+                "campaigns": 12,
+                "influencers": 10,
+                "assignments": 30,
+                "payments": 15,
+                "history": 200,
+            },
+        )
+        self.assertEqual(Campaign.objects.count(), 12)
+        self.assertEqual(Coupon.objects.values("code").distinct().count(), 30)
+        self.assertEqual(InfluencerPayment.objects.count(), 15)
+        self.assertEqual(InfluencerHistory.objects.count(), 200)
+
+    def test_references_agree(self):
+        self.generate()
+        self.assertFalse(
+            AssignedInfluencer.objects.exclude(
+                influencer=F("social_account__influencer")
+            ).exists()
+        )
+        self.assertFalse(
+            InfluencerPayment.objects.exclude(
+                day=F("assigned_influencer__day")
+            ).exists()
+        )
+        self.assertEqual(
+            AssignedInfluencerSales.objects.aggregate(
+                total=Sum(F("total_raw_data") + F("total_validated_data"))
+            )["total"],
+            InfluencerHistory.objects.aggregate(total=Sum("no_sales"))["total"],
+        )
+
+    def test_seed(self):
+        self.generate(seed=1)
+        first = list(Influencer.objects.order_by("pk").values_list("name", "gender"))
+        self.generate(seed=1)
+        second = list(Influencer.objects.order_by("pk").values_list("name", "gender"))
+        self.assertEqual(second[len(first) :], first)
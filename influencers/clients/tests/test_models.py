@@ -1,10 +1,15 @@
+from unittest import skipUnless
+from django.db import connection
 from django.test import TestCase
 from influencers.clients.models import (
     Client,
     Offer,
     Campaign,
     AssignedInfluencer,
+    AssignedInfluencerSales,
     InfluencerHistory,
+    InfluencerPayment,
+    InfluencerUnPaidNotification,
 )
 from influencers.influencers.models import Influencer, SocialAccount
 from influencers.core.models import Coupon, Category
@@ -304,3 +309,73 @@ class InfluencerHistoryModelTestCase(TestCase):
         self.assertEqual(
             self.influencer_history.assigned_influencer, self.assigned_influencer
         )
+
+    def test_model_influencer_history_updates_sales_rollup(self):
+        InfluencerHistoryFactory(
+            data_type="VALIDATED_DATA",
+            assigned_influencer=self.assigned_influencer,
+            no_sales=120.0,
+            day_sales="2018-11-13",
+        )
+        sales = AssignedInfluencerSales.objects.get(
+            assigned_influencer=self.assigned_influencer
+        )
+        self.assertEqual(sales.total_raw_data, 300.0)
+        self.assertEqual(sales.total_validated_data, 120.0)
+        self.assertEqual(str(sales.last_day_sales), "2018-11-13")
+
+        self.influencer_history.no_sales = 100.0
+        self.influencer_history.save()
+        sales.refresh_from_db()
+        self.assertEqual(sales.total_raw_data, 100.0)
+
+    def test_model_influencer_history_soft_delete_updates_sales_rollup(self):
+        self.influencer_history.delete()
+        assigned_influencer = AssignedInfluencer.objects.get(
+            pk=self.assigned_influencer.pk
+        )
+        self.assertEqual(assigned_influencer.total_raw_data, 0.0)
+        self.assertEqual(assigned_influencer.total_validated_data, 0.0)
+
+        self.influencer_history.undelete()
+        assigned_influencer = AssignedInfluencer.objects.get(
+            pk=self.assigned_influencer.pk
+        )
+        self.assertEqual(assigned_influencer.total_raw_data, 300.0)
+
+
+@skipUnless(connection.vendor == "postgresql", "Partial indexes plans are PostgreSQL's")
+class IndexUsageTestCase(TestCase):
+    """ Test the calendar and notification filters can use their partial indexes """
+
+    def setUp(self):
+        with connection.cursor() as cursor:
+            # Tables are tiny here, make the planner use any index it can
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+    def assertUsesIndex(self, queryset, model):
+        index_names = [index.name for index in model._meta.indexes]
+        # Safedelete only adds its deleted filter when the queryset is evaluated
+        plan = queryset.filter(deleted__isnull=True).explain()
+        self.assertTrue(
+            any(name in plan for name in index_names), "No index used in\n" + plan
+        )
+
+    def test_assigned_influencer_day(self):
+        self.assertUsesIndex(
+            AssignedInfluencer.objects.filter(day__range=["2018-11-01", "2018-11-30"]),
+            AssignedInfluencer,
+        )
+
+    def test_unpaid_notification_day(self):
+        self.assertUsesIndex(
+            InfluencerUnPaidNotification.objects.filter(
+                day__range=["2018-11-01", "2018-11-30"]
+            ),
+            InfluencerUnPaidNotification,
+        )
+
+    def test_payment_billing_status(self):
+        self.assertUsesIndex(
+            InfluencerPayment.objects.filter(billing_status="UNPAID"), InfluencerPayment
+        )
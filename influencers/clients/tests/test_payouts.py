@@ -0,0 +1,117 @@
+from datetime import date
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from influencers.clients.models import AssignedInfluencer
+from influencers.clients.payouts import get_payouts, get_payout_totals
+from influencers.clients.tests.factories import (
+    CampaignFactory,
+    AssignedInfluencerFactory,
+    InfluencerHistoryFactory,
+)
+
+
+class PayoutTestCase(TestCase):
+    """ Test what assignments owe per billing type """
+
+    def setUp(self):
+        self.campaign = CampaignFactory(
+            cost_fixed=10.0, cost_percentage=30.0, discount_percent=20.0
+        )
+        self.assignments = {
+            billing: AssignedInfluencerFactory(
+                campaign=self.campaign,
+                billing=billing,
+                cost=500.0,
+                day=date(2019, 1, 15),
+            )
+            for billing, _ in AssignedInfluencer.BILLING_TYPE
+        }
+        for assignment in self.assignments.values():
+            InfluencerHistoryFactory(
+                assigned_influencer=assignment, data_type="VALIDATED_DATA", no_sales=40
+            )
+            # Raw sales are not paid for
+            InfluencerHistoryFactory(
+                assigned_influencer=assignment, data_type="RAW_DATA", no_sales=100
+            )
+
+    def get_payouts(self, start=date(2019, 1, 1), end=date(2019, 1, 31)):
+        return get_payouts(start, end)
+
+    def test_owed(self):
+        owed = dict(self.get_payouts().values_list("billing", "owed"))
+        self.assertEqual(owed["FIXED_COST"], 500.0)
+        self.assertEqual(owed["REVENUE_SHARE_FIXED"], 400.0)
+        # 30% of 40 items sold at 10 less 20%
+        self.assertAlmostEqual(owed["REVENUE_SHARE_PERCENTAGE"], 96.0)
+
+    def test_no_sales(self):
+        assignment = AssignedInfluencerFactory(
+            billing="REVENUE_SHARE_FIXED", day=date(2019, 1, 20)
+        )
+        payout = self.get_payouts().get(pk=assignment.pk)
+        self.assertEqual(payout.validated_sales, 0.0)
+        self.assertEqual(payout.owed, 0.0)
+
+    def test_totals(self):
+        totals = get_payout_totals(self.get_payouts())
+        self.assertEqual(totals["FIXED_COST"]["assignments"], 1)
+        self.assertAlmostEqual(
+            sum(row["owed"] for row in totals.values()), 500.0 + 400.0 + 96.0
+        )
+
+    def test_deleted_sales(self):
+        assignment = self.assignments["REVENUE_SHARE_FIXED"]
+        InfluencerHistoryFactory(
+            assigned_influencer=assignment, data_type="VALIDATED_DATA", no_sales=60
+        ).delete()
+        payout = self.get_payouts().get(pk=assignment.pk)
+        self.assertEqual((payout.validated_sales, payout.owed), (40.0, 400.0))
+
+        # Nor do they make an assignment part of a period
+        InfluencerHistoryFactory(
+            assigned_influencer=assignment,
+            data_type="VALIDATED_DATA",
+            day_sales=date(2019, 3, 3),
+        ).delete()
+        self.assertFalse(self.get_payouts(date(2019, 3, 1), date(2019, 3, 31)))
+
+    def test_sales_of_the_period(self):
+        for assignment in self.assignments.values():
+            InfluencerHistoryFactory(
+                assigned_influencer=assignment,
+                data_type="VALIDATED_DATA",
+                no_sales=10,
+                day_sales=date(2019, 2, 3),
+            )
+        # Sales recorded after the period do not change its payouts
+        owed = dict(self.get_payouts().values_list("billing", "owed"))
+        self.assertEqual(owed["REVENUE_SHARE_FIXED"], 400.0)
+
+        # They are paid with the next one, the fixed cost is not paid again
+        payouts = self.get_payouts(date(2019, 2, 1), date(2019, 2, 28))
+        owed = dict(payouts.values_list("billing", "owed"))
+        self.assertEqual(owed["FIXED_COST"], 0.0)
+        self.assertEqual(owed["REVENUE_SHARE_FIXED"], 100.0)
+        self.assertAlmostEqual(owed["REVENUE_SHARE_PERCENTAGE"], 24.0)
+
+        # Nothing due nor sold in March
+        self.assertFalse(self.get_payouts(date(2019, 3, 1), date(2019, 3, 31)))
+
+    def test_command(self):
+        AssignedInfluencerFactory(billing="FIXED_COST", cost=50.0, day=date(2019, 2, 1))
+        out = StringIO()
+        call_command(
+            "compute_payouts",
+            "--start",
+            "2019-01-01",
+            "--end",
+            "2019-01-31",
+            stdout=out,
+        )
+        self.assertIn("996.00 owed by 3 assignments", out.getvalue())
+
+        with self.assertRaises(CommandError):
+            call_command("compute_payouts", "--start", "nope", "--end", "2019-01-31")
@@ -1,6 +1,10 @@
 import json
+from auditlog.models import LogEntry
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
 from django.urls import reverse
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from rest_framework.test import APIClient
 from influencers.users.tests.factories import UserFactory
@@ -12,7 +16,10 @@ from influencers.clients.models import (
     Offer,
     Campaign,
     AssignedInfluencer,
+    AssignedInfluencerSales,
     InfluencerHistory,
+    InfluencerPayment,
+    InfluencerUnPaidNotification,
 )
 
 
@@ -51,6 +58,33 @@ class ClientCreateAPITestCase(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertTrue(json.loads(response.content)["count"] == Client.objects.count())
 
+    def test_list_client_offer_count(self):
+        category = Category.objects.create(name="Test category")
+        for index in range(5):
+            client_obj = Client.objects.create(
+                name="Client{}".format(index),
+                email="client{}@mail.com".format(index),
+                account_manager=self.account_manager,
+                phone="+201002896812",
+            )
+            for name in ("offer1", "offer2"):
+                Offer.objects.create(
+                    name=name,
+                    client=client_obj,
+                    category=category,
+                    billing="FIXED_PRICE",
+                )
+        Offer.objects.filter(client=client_obj).first().delete()
+
+        # One of them computes the ETag
+        with self.assertNumQueries(7):
+            response = self.client.get(self.url, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        offer_counts = [
+            c["offer_count"] for c in json.loads(response.content)["results"]
+        ]
+        self.assertEqual(offer_counts, [2, 2, 2, 2, 1])
+
 
 class ClientDetailAPITestCase(TestCase):
     """
@@ -406,6 +440,232 @@ class AssignedInfluencerCreateAPITestCase(TestCase):
             json.loads(response.content)["count"], AssignedInfluencer.objects.count()
         )
 
+    def create_assigned_influencer_with_sales(self):
+        assigned_influencer = AssignedInfluencer.objects.create(
+            social_account=self.social_account,
+            influencer=self.influencer,
+            campaign=self.campaign,
+            coupon=Coupon.objects.create(percentage=15),
+            billing="FIXED_COST",
+            cost=20.0,
+            discount=15,
+            day="2018-11-11",
+        )
+        InfluencerHistory.objects.create(
+            data_type="RAW_DATA",
+            assigned_influencer=assigned_influencer,
+            no_sales=300.0,
+            day_sales="2018-11-11",
+        )
+        InfluencerHistory.objects.create(
+            data_type="VALIDATED_DATA",
+            assigned_influencer=assigned_influencer,
+            no_sales=200.0,
+            day_sales="2018-11-12",
+        )
+        return assigned_influencer
+
+    def test_list_assignedinfluencer_query_count(self):
+        self.create_assigned_influencer_with_sales()
+        with CaptureQueriesContext(connection) as single_row:
+            response = self.client.get(self.url, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        for _ in range(9):
+            self.create_assigned_influencer_with_sales()
+        with CaptureQueriesContext(connection) as full_page:
+            response = self.client.get(self.url, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        results = json.loads(response.content)["results"]
+        self.assertEqual(len(results), 10)
+        self.assertEqual(results[0]["total_raw_data"], 300.0)
+        self.assertEqual(results[0]["total_validated_data"], 200.0)
+        self.assertEqual(len(full_page), len(single_row))
+
+    def test_calendar_filters(self):
+        november = self.create_assigned_influencer_with_sales()
+        december = self.create_assigned_influencer_with_sales()
+        december.day = "2018-12-05"
+        december.save()
+        InfluencerPayment.objects.create(
+            assigned_influencer=december, day="2018-12-06", billing_status="PAID"
+        )
+
+        def get_ids(**params):
+            response = self.client.get(
+                reverse("clients:assignedinfluencer-list"), params, format="json"
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            return {row["id"] for row in json.loads(response.content)["results"]}
+
+        self.assertEqual(get_ids(), {november.id, december.id})
+        self.assertEqual(get_ids(start="2018-12-01"), {december.id})
+        self.assertEqual(get_ids(end="2018-11-30"), {november.id})
+        self.assertEqual(get_ids(campaign=self.campaign.id + 1), set())
+        self.assertEqual(
+            get_ids(influencer=self.influencer.id), {november.id, december.id}
+        )
+        self.assertEqual(get_ids(billing_status="PAID"), {december.id})
+        self.assertEqual(get_ids(billing_status="UNPAID"), {november.id})
+
+        response = self.client.get(
+            reverse("clients:assignedinfluencer-list"), {"start": "nope"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_unpaid_notification_filters(self):
+        for day in ["2018-11-10", "2018-11-20"]:
+            InfluencerUnPaidNotification.objects.create(
+                influencer=self.influencer, cost=20.0, day=day
+            )
+        url = reverse("clients:influencerunpaidnotification-list")
+
+        # Around today by default
+        response = self.client.get(url, format="json")
+        self.assertEqual(json.loads(response.content)["count"], 0)
+
+        response = self.client.get(
+            url, {"start": "2018-11-01", "end": "2018-11-15"}, format="json"
+        )
+        results = json.loads(response.content)["results"]
+        self.assertEqual([row["day"] for row in results], ["2018-11-10"])
+
+    def get_calendar_feed(self, start, end):
+        response = self.client.get(
+            reverse("clients:assignedinfluencer-feed"),
+            {"start": start, "end": end},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return json.loads(response.content)
+
+    def test_calendar_feed(self):
+        november = self.create_assigned_influencer_with_sales()
+        december = self.create_assigned_influencer_with_sales()
+        december.day = "2018-12-05"
+        december.save()
+        InfluencerPayment.objects.create(
+            assigned_influencer=december, day="2018-12-06", billing_status="PAID"
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            feed = self.get_calendar_feed("2018-11-01", "2018-12-31")
+        self.assertEqual([row["id"] for row in feed], [november.id, december.id])
+        self.assertEqual(feed[0]["offer_name"], "Test offer")
+        self.assertIsNone(feed[0]["influencer_payment"])
+        self.assertEqual(feed[1]["influencer_payment"]["billing_status"], "PAID")
+        month_queries = [q for q in queries if "clients_assignedinfluencer" in q["sql"]]
+        self.assertEqual(len(month_queries), 2)
+
+        # Months are cached
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.get_calendar_feed("2018-11-01", "2018-12-31"), feed)
+        self.assertFalse([q for q in queries if q["sql"].startswith("SELECT")])
+
+        # Only days of the window are returned
+        feed = self.get_calendar_feed("2018-11-12", "2018-12-31")
+        self.assertEqual([row["id"] for row in feed], [december.id])
+
+    def test_calendar_feed_invalidation(self):
+        assigned_influencer = self.create_assigned_influencer_with_sales()
+        self.assertEqual(len(self.get_calendar_feed("2018-11-01", "2018-11-30")), 1)
+
+        assigned_influencer.day = "2019-01-10"
+        assigned_influencer.save()
+        self.assertEqual(self.get_calendar_feed("2018-11-01", "2018-11-30"), [])
+        self.assertEqual(len(self.get_calendar_feed("2019-01-01", "2019-01-31")), 1)
+
+        InfluencerPayment.objects.create(
+            assigned_influencer=assigned_influencer,
+            day="2019-01-11",
+            billing_status="UNPAID",
+        )
+        feed = self.get_calendar_feed("2019-01-01", "2019-01-31")
+        self.assertEqual(feed[0]["influencer_payment"]["billing_status"], "UNPAID")
+
+        self.offer.name = "Renamed offer"
+        self.offer.save()
+        feed = self.get_calendar_feed("2019-01-01", "2019-01-31")
+        self.assertEqual(feed[0]["offer_name"], "Renamed offer")
+
+        response = self.client.get(
+            reverse("clients:assignedinfluencer-feed"),
+            {"start": "2019-01-01", "end": "2020-12-31"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_assign_influencers(self):
+        # Cached before, the month must show the new assignments
+        self.assertEqual(self.get_calendar_feed("2018-11-01", "2018-11-30"), [])
+        rows = [
+            {
+                "influencer": self.influencer.id,
+                "social_account": self.social_account.id,
+                "cost": 100.0,
+                "discount": 10,
+                "billing": "FIXED_COST",
+                "day": "2018-11-11",
+            }
+            for _ in range(3)
+        ]
+        url = reverse(
+            "clients:assign-influencers-bulk", kwargs={"id": self.campaign.id}
+        )
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(url, rows, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        content = json.loads(response.content)
+        self.assertEqual(content["created"], 3)
+        self.assertEqual(
+            sorted(content["ids"]),
+            sorted(AssignedInfluencer.objects.values_list("id", flat=True)),
+        )
+        inserts = [q for q in queries if q["sql"].startswith("INSERT")]
+        self.assertLessEqual(len(inserts), 4)
+
+        assignments = AssignedInfluencer.objects.select_related("coupon")
+        self.assertEqual({a.campaign_id for a in assignments}, {self.campaign.id})
+        self.assertEqual({a.coupon.percentage for a in assignments}, {10})
+        self.assertEqual(len({a.coupon.code for a in assignments}), 3)
+        self.assertEqual(len(self.get_calendar_feed("2018-11-01", "2018-11-30")), 3)
+
+    def test_bulk_assign_influencers_errors(self):
+        other = SocialAccount.objects.create(
+            username="social account2",
+            platform=self.platform,
+            influencer=Influencer.objects.create(
+                name="influencer2", IBAN="SA44 2000 0002", account_holder_name="2"
+            ),
+        )
+        row = {
+            "influencer": self.influencer.id,
+            "social_account": self.social_account.id,
+            "billing": "FIXED_COST",
+            "day": "2018-11-11",
+        }
+        rows = [
+            row,
+            dict(row, billing="UNKNOWN"),
+            dict(row, influencer=self.influencer.id + 100),
+            dict(row, social_account=other.id),
+        ]
+        url = reverse(
+            "clients:assign-influencers-bulk", kwargs={"id": self.campaign.id}
+        )
+        response = self.client.post(url, rows, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = json.loads(response.content)["rows"]
+        self.assertEqual(sorted(errors), ["1", "2", "3"])
+        self.assertIn("billing", errors["1"])
+        self.assertIn("influencer", errors["2"])
+        self.assertIn("social_account", errors["3"])
+        self.assertFalse(AssignedInfluencer.objects.exists())
+
+        url = reverse("clients:assign-influencers-bulk", kwargs={"id": 0})
+        response = self.client.post(url, [row], format="json")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
 
 class AssignedInfluencerDetailAPITestCase(TestCase):
     """
@@ -594,6 +854,246 @@ class InfluencerHistoryCreateAPITestCase(TestCase):
             json.loads(response.content)["count"], InfluencerHistory.objects.count()
         )
 
+    def test_bulk_influencer_history(self):
+        InfluencerHistory.objects.create(
+            data_type="RAW_DATA",
+            assigned_influencer=self.assigned_influencer,
+            no_sales=100.0,
+            day_sales="2018-11-11",
+        )
+        rows = [
+            {
+                "assigned_influencer": self.assigned_influencer.id,
+                "data_type": "RAW_DATA",
+                "no_sales": 300.0,
+                "day_sales": "2018-11-11",
+            },
+            {
+                "assigned_influencer": self.assigned_influencer.id,
+                "data_type": "VALIDATED_DATA",
+                "no_sales": 200.0,
+                "day_sales": "2018-11-12",
+            },
+        ]
+        url = reverse("clients:influencer-history-bulk")
+        response = self.client.post(url, rows, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(json.loads(response.content), {"created": 1, "updated": 1})
+        self.assertEqual(InfluencerHistory.objects.count(), 2)
+
+        # Sending the same rows again only updates them
+        response = self.client.post(url, rows, format="json")
+        self.assertEqual(json.loads(response.content), {"created": 0, "updated": 2})
+        self.assertEqual(InfluencerHistory.objects.count(), 2)
+        sales = AssignedInfluencerSales.objects.get(
+            assigned_influencer=self.assigned_influencer
+        )
+        self.assertEqual(sales.total_raw_data, 300.0)
+        self.assertEqual(sales.total_validated_data, 200.0)
+
+    def test_bulk_influencer_history_audit_log(self):
+        history = InfluencerHistory.objects.create(
+            data_type="RAW_DATA",
+            assigned_influencer=self.assigned_influencer,
+            no_sales=100.0,
+            day_sales="2018-11-11",
+        )
+        rows = [
+            {
+                "assigned_influencer": self.assigned_influencer.id,
+                "data_type": "RAW_DATA",
+                "no_sales": 300.0,
+                "day_sales": "2018-11-11",
+            },
+            {
+                "assigned_influencer": self.assigned_influencer.id,
+                "data_type": "VALIDATED_DATA",
+                "no_sales": 200.0,
+                "day_sales": "2018-11-12",
+            },
+        ]
+        url = reverse("clients:influencer-history-bulk")
+        self.client.post(url, rows, format="json")
+        entries = LogEntry.objects.get_for_model(InfluencerHistory)
+        created = InfluencerHistory.objects.get(data_type="VALIDATED_DATA")
+        self.assertEqual(
+            json.loads(entries.get(object_id=created.id).changes)["no_sales"],
+            ["None", "200.0"],
+        )
+        update = entries.get(object_id=history.id, action=LogEntry.Action.UPDATE)
+        self.assertEqual(json.loads(update.changes)["no_sales"], ["100.0", "300.0"])
+
+    def test_bulk_influencer_history_csv(self):
+        content = (
+            "assigned_influencer,data_type,no_sales,day_sales\n"
+            "{id},RAW_DATA,300,2018-11-11\n"
+            "{id},RAW_DATA,150,2018-11-12\n"
+        ).format(id=self.assigned_influencer.id)
+        url = reverse("clients:influencer-history-bulk")
+        response = self.client.post(url, content, content_type="text/csv")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(InfluencerHistory.objects.count(), 2)
+
+        upload = SimpleUploadedFile("sales.csv", content.encode("utf-8-sig"))
+        response = self.client.post(url, {"file": upload}, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(json.loads(response.content), {"created": 0, "updated": 2})
+        sales = AssignedInfluencerSales.objects.get(
+            assigned_influencer=self.assigned_influencer
+        )
+        self.assertEqual(sales.total_raw_data, 450.0)
+
+    def test_bulk_influencer_history_errors(self):
+        rows = [
+            {
+                "assigned_influencer": self.assigned_influencer.id,
+                "data_type": "RAW_DATA",
+                "no_sales": 300.0,
+                "day_sales": "2018-11-11",
+            },
+            {
+                "assigned_influencer": self.assigned_influencer.id,
+                "data_type": "UNKNOWN",
+                "day_sales": "2018-11-11",
+            },
+            {
+                "assigned_influencer": self.assigned_influencer.id + 100,
+                "data_type": "RAW_DATA",
+                "day_sales": "2018-11-11",
+            },
+        ]
+        url = reverse("clients:influencer-history-bulk")
+        response = self.client.post(url, rows, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = json.loads(response.content)["rows"]
+        self.assertEqual(sorted(errors), ["1", "2"])
+        self.assertIn("data_type", errors["1"])
+        self.assertIn("assigned_influencer", errors["2"])
+        self.assertEqual(InfluencerHistory.objects.count(), 0)
+
+    def test_export_influencer_history(self):
+        for day in ["2018-11-10", "2018-11-11", "2018-11-12"]:
+            InfluencerHistory.objects.create(
+                data_type="RAW_DATA",
+                assigned_influencer=self.assigned_influencer,
+                no_sales=10.0,
+                day_sales=day,
+            )
+
+        url = reverse("clients:influencer-history-export")
+        response = self.client.get(url, {"start": "2018-11-11"})
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        # Only the account manager of the campaign gets it
+        self.assertEqual(len(lines), 1)
+
+        self.client.force_authenticate(user=self.account_manager)
+        response = self.client.get(url, {"start": "2018-11-11"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(
+            lines[0],
+            "id,assigned_influencer,campaign,influencer,data_type,no_sales,day_sales",
+        )
+        self.assertEqual(
+            [line.split(",")[-1] for line in lines[1:]], ["2018-11-11", "2018-11-12"]
+        )
+
+        response = self.client.get(url, {"end": "nope"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_assigned_influencers(self):
+        InfluencerHistory.objects.create(
+            data_type="VALIDATED_DATA",
+            assigned_influencer=self.assigned_influencer,
+            no_sales=250.0,
+            day_sales="2018-11-11",
+        )
+
+        url = reverse("clients:assign-influencers-export")
+        response = self.client.get(url, {"output": "ndjson"})
+        self.assertEqual(b"".join(response.streaming_content), b"")
+
+        self.client.force_authenticate(user=self.account_manager)
+        response = self.client.get(url, {"output": "ndjson"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rows = [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).splitlines()
+        ]
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["id"], self.assigned_influencer.id)
+        self.assertEqual(rows[0]["total_raw_data"], 0.0)
+        self.assertEqual(rows[0]["total_validated_data"], 250.0)
+
+        response = self.client.get(url, {"output": "xml"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_payouts(self):
+        InfluencerHistory.objects.create(
+            data_type="VALIDATED_DATA",
+            assigned_influencer=self.assigned_influencer,
+            no_sales=250.0,
+            day_sales="2018-11-11",
+        )
+
+        url = reverse("clients:payout-export")
+        self.client.force_authenticate(user=self.account_manager)
+        response = self.client.get(
+            url, {"start": "2018-11-01", "end": "2018-11-30", "output": "ndjson"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rows = [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).splitlines()
+        ]
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["validated_sales"], 250.0)
+        # Fixed cost, whatever the sales
+        self.assertEqual(rows[0]["owed"], 20.0)
+
+        response = self.client.get(url, {"start": "2018-12-01", "end": "2018-12-31"})
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 1)
+
+        response = self.client.get(url, {"start": "2018-12-01"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_campaigns(self):
+        url = reverse("clients:campaign-export")
+        response = self.client.get(url)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        # Only the account manager of the campaign gets it
+        self.assertEqual(len(lines), 1)
+
+        self.client.force_authenticate(user=self.account_manager)
+        response = self.client.get(url)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[1].startswith("{},Test offer,".format(self.campaign.id)))
+
+    def test_list_influencer_history_with_cursor(self):
+        for day in range(1, 16):
+            InfluencerHistory.objects.create(
+                data_type="RAW_DATA",
+                assigned_influencer=self.assigned_influencer,
+                no_sales=day,
+                day_sales="2018-11-{:02d}".format(day),
+            )
+
+        ids = []
+        url = self.url + "?pagination=cursor"
+        while url:
+            response = self.client.get(url, format="json")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            content = json.loads(response.content)
+            ids += [history["id"] for history in content["results"]]
+            url = content["next"]
+        self.assertEqual(
+            ids,
+            list(InfluencerHistory.objects.order_by("id").values_list("id", flat=True)),
+        )
+
 
 class InfluencerHistoryDetailAPITestCase(TestCase):
     """
@@ -7,11 +7,17 @@ from influencers.clients.views import (
     CalendarViewSet,
     ClientOffersView,
     AssignedInfluencerList,
+    AssignedInfluencerBulk,
     AssignedInfluencerDetail,
     InfluencerHistoryList,
+    InfluencerHistoryBulk,
     InfluencerHistoryDetail,
     InfluencerPaymentViewSet,
     InfluencerUnPaidNotificationViewSet,
+    CampaignExport,
+    AssignedInfluencerExport,
+    InfluencerHistoryExport,
+    PayoutExport,
 )
 
 
@@ -29,12 +35,29 @@ urlpatterns = router.urls
 
 # Append other urls of generic views
 urlpatterns += [
+    path(r"exports/campaigns/", CampaignExport.as_view(), name="campaign-export"),
+    path(
+        r"exports/assigned-influencers/",
+        AssignedInfluencerExport.as_view(),
+        name="assign-influencers-export",
+    ),
+    path(
+        r"exports/history/",
+        InfluencerHistoryExport.as_view(),
+        name="influencer-history-export",
+    ),
+    path(r"exports/payouts/", PayoutExport.as_view(), name="payout-export"),
     path(r"<int:id>/offers/", ClientOffersView.as_view(), name="client-offers"),
     path(
         r"campaigns/<int:id>/influencers/",
         AssignedInfluencerList.as_view(),
         name="assign-influencers-list",
     ),
+    path(
+        r"campaigns/<int:id>/influencers/bulk/",
+        AssignedInfluencerBulk.as_view(),
+        name="assign-influencers-bulk",
+    ),
     path(
         r"campaigns/influencers/assign/<int:id>/",
         AssignedInfluencerDetail.as_view(),
@@ -45,6 +68,11 @@ urlpatterns += [
         InfluencerHistoryList.as_view(),
         name="influencer-history-list",
     ),
+    path(
+        r"campaigns/influencers/history/bulk/",
+        InfluencerHistoryBulk.as_view(),
+        name="influencer-history-bulk",
+    ),
     path(
         r"campaigns/influencers/history/<int:id>/",
         InfluencerHistoryDetail.as_view(),
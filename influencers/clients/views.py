@@ -1,9 +1,14 @@
 from datetime import date, timedelta
+from django.db.models import Count, Q, Value
+from django.db.models.functions import Coalesce
+from rest_framework.decorators import action
 from rest_framework.viewsets import ModelViewSet
-from rest_framework.parsers import MultiPartParser
+from rest_framework.parsers import JSONParser, MultiPartParser
+from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.generics import (
+    get_object_or_404,
     ListAPIView,
     ListCreateAPIView,
     RetrieveUpdateDestroyAPIView,
@@ -18,6 +23,10 @@ from .serializers import (
     AssignedInfluencerSerializer,
     CreateAssignedInfluencerSerializer,
     CalendarSerializer,
+    CalendarFeedSerializer,
+    CalendarFilterSerializer,
+    PayoutFilterSerializer,
+    UnPaidNotificationFilterSerializer,
     InfluencerHistorySerializer,
     CreateInfluencerHistorySerializer,
     UpdateInfluencerHistorySerializer,
@@ -34,15 +43,30 @@ from .models import (
     InfluencerPayment,
     InfluencerUnPaidNotification,
 )
+from .calendar import get_feed
+from .payouts import get_payouts
+from .bulk import CSVParser, read_csv, ingest_history, assign_influencers
+from influencers.core.exports import ExportView
 from influencers.core.models import Coupon
+from influencers.core.views import ConditionalGetMixin
 from influencers.taskapp.helpers import get_days_range_from_today
 
 
-class ClientViewSet(ModelViewSet):
-    queryset = Client.objects.all()
+class ClientViewSet(ConditionalGetMixin, ModelViewSet):
+    conditional_relations = ("offers",)
+    queryset = Client.objects.select_related("account_manager").prefetch_related(
+        "account_manager__groups", "account_manager__user_permissions"
+    )
 
     def get_queryset(self):
-        queryset = super().get_queryset()
+        # Soft deleted offers are still joined, so they are filtered out of the count
+        queryset = (
+            super()
+            .get_queryset()
+            .annotate(
+                offer_count=Count("offers", filter=Q(offers__deleted__isnull=True))
+            )
+        )
         if self.request:
             user = self.request.user
             if user.is_superuser or user.is_staff:
@@ -56,7 +80,8 @@ class ClientViewSet(ModelViewSet):
         return ClientSerializer
 
 
-class OfferViewSet(ModelViewSet):
+class OfferViewSet(ConditionalGetMixin, ModelViewSet):
+    conditional_relations = ("client", "category")
     queryset = Offer.objects.all()
 
     def get_queryset(self):
@@ -95,8 +120,8 @@ class ClientOffersView(ListAPIView):
         return queryset.none()
 
 
-class CampaignViewSet(ModelViewSet):
-
+class CampaignViewSet(ConditionalGetMixin, ModelViewSet):
+    conditional_relations = ("offer",)
     queryset = Campaign.objects.all()
 
     def get_queryset(self):
@@ -120,7 +145,7 @@ class AssignedInfluencerList(ListCreateAPIView):
     create record in AssignedInfluencer table to assign influencer to a campaign
     """
 
-    queryset = AssignedInfluencer.objects.all()
+    queryset = AssignedInfluencer.objects.with_related()
 
     def get_queryset(self, *args, **kwargs):
         queryset = self.queryset
@@ -135,19 +160,36 @@ class AssignedInfluencerList(ListCreateAPIView):
         return AssignedInfluencerSerializer
 
     def perform_create(self, serializer):
-        coupon = Coupon.objects.create()
-        coupon.percentage = serializer.validated_data["discount"]
-        coupon.save()
+        coupon = Coupon.objects.create(percentage=serializer.validated_data["discount"])
         serializer.save(coupon=coupon)
 
 
+class AssignedInfluencerBulk(APIView):
+    """
+    Assign many influencers to a campaign at once from a JSON list,
+    a text/csv body or a CSV file uploaded as "file"
+    """
+
+    parser_classes = (JSONParser, CSVParser, MultiPartParser)
+
+    def post(self, request, *args, **kwargs):
+        campaign = get_object_or_404(Campaign.objects.all(), pk=self.kwargs["id"])
+        rows = request.data
+        upload = request.FILES.get("file")
+        if upload is not None:
+            rows = read_csv(upload.read())
+        return Response(
+            assign_influencers(campaign, rows), status=status.HTTP_201_CREATED
+        )
+
+
 class AssignedInfluencerDetail(RetrieveUpdateDestroyAPIView):
     """
     Edit assigned influencer to a campaign or
     Delete influencer assigned from a campaign
     """
 
-    queryset = AssignedInfluencer.objects.all()
+    queryset = AssignedInfluencer.objects.with_related()
     lookup_field = "id"
 
     def get_serializer_class(self, *args, **kwargs):
@@ -184,6 +226,22 @@ class InfluencerHistoryList(ListCreateAPIView):
         return InfluencerHistorySerializer
 
 
+class InfluencerHistoryBulk(APIView):
+    """
+    Create or update many sales records at once from a JSON list,
+    a text/csv body or a CSV file uploaded as "file"
+    """
+
+    parser_classes = (JSONParser, CSVParser, MultiPartParser)
+
+    def post(self, request, *args, **kwargs):
+        rows = request.data
+        upload = request.FILES.get("file")
+        if upload is not None:
+            rows = read_csv(upload.read())
+        return Response(ingest_history(rows), status=status.HTTP_201_CREATED)
+
+
 class InfluencerHistoryDetail(RetrieveUpdateDestroyAPIView):
     """
     Edit assigned influencer history or
@@ -195,10 +253,174 @@ class InfluencerHistoryDetail(RetrieveUpdateDestroyAPIView):
     lookup_field = "id"
 
 
-class CalendarViewSet(ModelViewSet):
+class CampaignExport(ExportView):
+    """ Export campaigns, limited to their own for account managers """
+
+    filename = "campaigns"
+    date_field = "start__date"
+    columns = (
+        ("id", "id"),
+        ("offer", "offer__name"),
+        ("client", "offer__client__name"),
+        ("account_manager", "account_manager__email"),
+        ("cost_fixed", "cost_fixed"),
+        ("cost_percentage", "cost_percentage"),
+        ("discount_percent", "discount_percent"),
+        ("start", "start"),
+        ("end", "end"),
+    )
+
+    queryset = Campaign.objects.all()
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        user = self.request.user
+        if user.is_superuser or user.is_staff:
+            return queryset
+        return queryset.filter(account_manager=user)
+
+
+class AssignedInfluencerExport(ExportView):
+    """
+    Export assigned influencers with their sales totals, limited to their
+    own campaigns for account managers
+    """
+
+    filename = "assigned_influencers"
+    date_field = "day"
+    columns = (
+        ("id", "id"),
+        ("campaign", "campaign_id"),
+        ("influencer", "influencer__name"),
+        ("social_account", "social_account__username"),
+        ("coupon", "coupon__code"),
+        ("billing", "billing"),
+        ("cost", "cost"),
+        ("discount", "discount"),
+        ("day", "day"),
+        ("total_raw_data", "sales_raw_data"),
+        ("total_validated_data", "sales_validated_data"),
+    )
+
+    queryset = AssignedInfluencer.objects.annotate(
+        sales_raw_data=Coalesce("sales__total_raw_data", Value(0.0)),
+        sales_validated_data=Coalesce("sales__total_validated_data", Value(0.0)),
+    )
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        user = self.request.user
+        if user.is_superuser or user.is_staff:
+            return queryset
+        return queryset.filter(campaign__account_manager=user)
+
+
+class PayoutExport(ExportView):
+    """
+    Export what every assignment owes its influencer for the period from
+    ?start= to ?end=, limited to their own campaigns for account managers
+    """
+
+    filename = "payouts"
+    columns = (
+        ("id", "id"),
+        ("campaign", "campaign_id"),
+        ("influencer", "influencer__name"),
+        ("IBAN", "influencer__IBAN"),
+        ("billing", "billing"),
+        ("cost", "cost"),
+        ("cost_fixed", "campaign__cost_fixed"),
+        ("cost_percentage", "campaign__cost_percentage"),
+        ("discount_percent", "campaign__discount_percent"),
+        ("validated_sales", "validated_sales"),
+        ("owed", "owed"),
+        ("day", "day"),
+    )
+
     queryset = AssignedInfluencer.objects.all()
+
+    def get_queryset(self):
+        params = PayoutFilterSerializer(data=self.request.query_params)
+        params.is_valid(raise_exception=True)
+        queryset = super().get_queryset()
+        user = self.request.user
+        if not (user.is_superuser or user.is_staff):
+            queryset = queryset.filter(campaign__account_manager=user)
+        return get_payouts(queryset=queryset, **params.validated_data)
+
+    def filter_dates(self, queryset):
+        # The period is the payouts', not a filter on a column
+        return queryset
+
+
+class InfluencerHistoryExport(ExportView):
+    """ Export sales history, limited to their own campaigns for account managers """
+
+    filename = "influencer_history"
+    date_field = "day_sales"
+    columns = (
+        ("id", "id"),
+        ("assigned_influencer", "assigned_influencer_id"),
+        ("campaign", "assigned_influencer__campaign_id"),
+        ("influencer", "assigned_influencer__influencer__name"),
+        ("data_type", "data_type"),
+        ("no_sales", "no_sales"),
+        ("day_sales", "day_sales"),
+    )
+
+    queryset = InfluencerHistory.objects.all()
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        user = self.request.user
+        if user.is_superuser or user.is_staff:
+            return queryset
+        return queryset.filter(assigned_influencer__campaign__account_manager=user)
+
+
+class CalendarViewSet(ModelViewSet):
+    queryset = AssignedInfluencer.objects.select_related(
+        "influencer", "campaign__offer", "influencer_payment"
+    )
     serializer_class = CalendarSerializer
 
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action != "list":
+            return queryset
+        params = CalendarFilterSerializer(data=self.request.query_params)
+        params.is_valid(raise_exception=True)
+        filters = params.validated_data
+        if "start" in filters:
+            queryset = queryset.filter(day__gte=filters["start"])
+        if "end" in filters:
+            queryset = queryset.filter(day__lte=filters["end"])
+        if "campaign" in filters:
+            queryset = queryset.filter(campaign=filters["campaign"])
+        if "influencer" in filters:
+            queryset = queryset.filter(influencer=filters["influencer"])
+        if filters.get("billing_status") == InfluencerPayment.BILLING_STATUS.UNPAID:
+            # No payment yet is unpaid too, as for the unpaid notifications
+            queryset = queryset.filter(
+                Q(influencer_payment__billing_status=filters["billing_status"])
+                | Q(influencer_payment__isnull=True)
+            )
+        elif "billing_status" in filters:
+            queryset = queryset.filter(
+                influencer_payment__billing_status=filters["billing_status"]
+            )
+        return queryset
+
+    @action(detail=False)
+    def feed(self, request, *args, **kwargs):
+        """
+        Assignments from ?start= to ?end= (YYYY-MM-DD, both included)
+        with their offer names and payments, cached by month
+        """
+        serializer = CalendarFeedSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return Response(get_feed(**serializer.validated_data))
+
 
 class InfluencerPaymentViewSet(ModelViewSet):
     queryset = InfluencerPayment.objects.all()
@@ -221,14 +443,20 @@ class InfluencerUnPaidNotificationViewSet(ModelViewSet):
     queryset = InfluencerUnPaidNotification.objects.all()
 
     def get_queryset(self, *args, **kwargs):
-        days_before, days_after = get_days_range_from_today()
-        unpaid_lst_notify = InfluencerUnPaidNotification.objects.filter(
-            day__range=[days_before, days_after]
-        ).all()
-        if unpaid_lst_notify:
-            return unpaid_lst_notify
-        else:
-            return self.queryset.none()
+        queryset = super().get_queryset()
+        if self.request:
+            params = UnPaidNotificationFilterSerializer(data=self.request.query_params)
+            params.is_valid(raise_exception=True)
+            filters = params.validated_data
+            # Around today unless asked otherwise
+            days_before, days_after = get_days_range_from_today()
+            queryset = queryset.filter(
+                day__gte=filters.get("start", days_before),
+                day__lte=filters.get("end", days_after),
+            )
+            if "influencer" in filters:
+                queryset = queryset.filter(influencer=filters["influencer"])
+        return queryset
 
     def get_serializer_class(self, *args, **kwargs):
         if self.request and self.request.method == "POST":
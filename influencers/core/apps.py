@@ -3,3 +3,9 @@ from django.apps import AppConfig
 
 class CoreConfig(AppConfig):
     name = "influencers.core"
+
+    def ready(self):
+        import influencers.core.signals  # noqa F401
+        from influencers.core.audit import connect_receivers
+
+        connect_receivers()
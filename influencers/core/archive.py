@@ -0,0 +1,174 @@
+from datetime import timedelta
+from auditlog.models import LogEntry
+from django.apps import apps
+from django.conf import settings
+from django.db import connection, models, transaction
+from django.utils import timezone
+from safedelete.models import SafeDeleteModel
+from influencers.core.cache import bump_version, get_namespace
+from influencers.core.models import ArchivedRow
+
+
+# Locks a batch of rows to archive, skipping the ones other transactions hold.
+# Soft deleted rows are found through a partial index on deleted of each model
+SELECT_BATCH_SQL = """
+    SELECT {pk} FROM {table} AS row
+    WHERE {condition}{unreferenced}
+    ORDER BY {pk}
+    LIMIT %s
+    FOR UPDATE SKIP LOCKED
+"""
+
+UNREFERENCED_SQL = """
+        AND NOT EXISTS (SELECT 1 FROM {table} WHERE {table}.{column} = row.{target})"""
+
+# Moves the rows to the archive in one statement, measuring the space they took
+MOVE_SQL = """
+    WITH moved AS (
+        DELETE FROM {table} WHERE {column} = ANY(%s) RETURNING *
+    ), archived AS (
+        INSERT INTO {archive} (created, modified, "table", object_pk, data)
+        SELECT %s, %s, %s, moved.{pk}::text, row_to_json(moved) FROM moved
+    )
+    SELECT count(*), coalesce(sum(pg_column_size(moved.*)), 0) FROM moved
+"""
+
+
+def get_references(model):
+    """ (model, field) of every foreign key to model, many to many tables included """
+    return [
+        (related_model, field)
+        for related_model in apps.get_models(include_auto_created=True)
+        for field in related_model._meta.concrete_fields
+        if field.many_to_one or field.one_to_one
+        if field.remote_field.model is model
+    ]
+
+
+def is_archived_along(related_model, field):
+    # Rows soft delete does not know about, such as sales totals or many to
+    # many links, go with the row they cascade from, unless anything needs them
+    return (
+        not issubclass(related_model, SafeDeleteModel)
+        and field.remote_field.on_delete is models.CASCADE
+        and not get_references(related_model)
+    )
+
+
+def get_soft_delete_models():
+    """ Soft deletable models, the ones referencing others first """
+    remaining = [
+        model for model in apps.get_models() if issubclass(model, SafeDeleteModel)
+    ]
+    ordered = []
+    while remaining:
+        children = [
+            model
+            for model in remaining
+            if not any(
+                related_model in remaining and related_model is not model
+                for related_model, _ in get_references(model)
+            )
+        ] or remaining
+        ordered += children
+        remaining = [model for model in remaining if model not in children]
+    return ordered
+
+
+def move_rows(cursor, model, column, values, now):
+    quote = connection.ops.quote_name
+    cursor.execute(
+        MOVE_SQL.format(
+            table=quote(model._meta.db_table),
+            column=quote(column),
+            archive=quote(ArchivedRow._meta.db_table),
+            pk=quote(model._meta.pk.column),
+        ),
+        [values, now, now, model._meta.db_table],
+    )
+    return cursor.fetchone()
+
+
+def archive_batch(model, condition, params, batch_size, now):
+    """
+    Archives up to batch_size rows of model matching condition, along with
+    what cascades from them, in a transaction of its own so locks are short.
+    Rows other rows still reference are left where they are.
+    Returns {table: (rows, bytes)} and the number of model rows archived.
+    """
+    quote = connection.ops.quote_name
+    unreferenced = ""
+    archived_along = []
+    for related_model, field in get_references(model):
+        if is_archived_along(related_model, field):
+            archived_along.append((related_model, field))
+            continue
+        unreferenced += UNREFERENCED_SQL.format(
+            table=quote(related_model._meta.db_table),
+            column=quote(field.column),
+            target=quote(field.target_field.column),
+        )
+
+    moved = {}
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            SELECT_BATCH_SQL.format(
+                table=quote(model._meta.db_table),
+                pk=quote(model._meta.pk.column),
+                condition=condition,
+                unreferenced=unreferenced,
+            ),
+            [*params, batch_size],
+        )
+        pks = [pk for pk, in cursor.fetchall()]
+        if not pks:
+            return moved, 0
+        for related_model, field in archived_along:
+            moved[related_model._meta.db_table] = move_rows(
+                cursor, related_model, field.column, pks, now
+            )
+        moved[model._meta.db_table] = move_rows(
+            cursor, model, model._meta.pk.column, pks, now
+        )
+    return moved, len(pks)
+
+
+def archive(now=None):
+    """
+    Moves rows soft deleted more than ARCHIVE["SOFT_DELETED_DAYS"] ago and
+    audit log entries older than ARCHIVE["LOG_ENTRY_DAYS"] to ArchivedRow,
+    ARCHIVE["BATCH_SIZE"] rows at a time, for at most ARCHIVE["MAX_BATCHES"]
+    batches of each model, so a backlog of one does not hold the others
+    back. Returns the rows and bytes of row data reclaimed per table.
+    """
+    options = settings.ARCHIVE
+    now = now or timezone.now()
+    soft_deleted = now - timedelta(days=options["SOFT_DELETED_DAYS"])
+    logged = now - timedelta(days=options["LOG_ENTRY_DAYS"])
+    sources = [
+        (model, "row.deleted < %s", [soft_deleted])
+        for model in get_soft_delete_models()
+    ]
+    sources.append((LogEntry, "row.timestamp < %s", [logged]))
+
+    report = {}
+    for model, condition, params in sources:
+        batches = options["MAX_BATCHES"]
+        while batches > 0:
+            moved, count = archive_batch(
+                model, condition, params, options["BATCH_SIZE"], now
+            )
+            if count:
+                batches -= 1
+            for table, (rows, size) in moved.items():
+                if not rows:
+                    continue
+                total = report.setdefault(table, {"rows": 0, "bytes": 0})
+                total["rows"] += rows
+                total["bytes"] += size
+            if count and issubclass(model, SafeDeleteModel):
+                # Reference data caches hold soft deleted rows too
+                bump_version(get_namespace(model))
+            if count < options["BATCH_SIZE"]:
+                break
+    return report
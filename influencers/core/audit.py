@@ -0,0 +1,242 @@
+import json
+import logging
+import threading
+from auditlog import receivers
+from auditlog.diff import model_instance_diff
+from auditlog.models import LogEntry
+from auditlog.registry import auditlog
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core import serializers
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.db.models import DateTimeField, prefetch_related_objects
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.utils import timezone
+from django.utils.encoding import smart_text
+
+
+logger = logging.getLogger(__name__)
+
+# sync: auditlog's own receivers, a LogEntry saved along with every change
+# commit: entries of a request bulk inserted once its transaction commits
+# celery: entries of a request sent to a Celery task once it commits
+MODES = ("sync", "commit", "celery")
+
+SAVE_BATCH_SIZE = 500
+
+buffer = threading.local()
+
+
+def is_buffered():
+    if settings.AUDITLOG_MODE not in MODES:
+        raise ImproperlyConfigured(
+            "AUDITLOG_MODE must be one of {}".format(", ".join(MODES))
+        )
+    return settings.AUDITLOG_MODE != "sync"
+
+
+def build_entry(instance, action, changes):
+    """ The LogEntry LogEntry.objects.log_create would save, not saved yet """
+    pk = LogEntry.objects._get_pk_value(instance)
+    entry = LogEntry(
+        content_type=ContentType.objects.get_for_model(instance),
+        object_pk=pk,
+        object_repr=smart_text(instance),
+        action=action,
+        changes=json.dumps(changes),
+        timestamp=timezone.now(),
+    )
+    if isinstance(pk, int):
+        entry.object_id = pk
+    get_additional_data = getattr(instance, "get_additional_data", None)
+    if callable(get_additional_data):
+        entry.additional_data = get_additional_data()
+    # AuditlogMiddleware sets the actor and remote address on pre_save
+    pre_save.send(
+        sender=LogEntry, instance=entry, raw=False, using=None, update_fields=None
+    )
+    # It only knows users authenticated by Django, not by REST framework
+    request = getattr(buffer, "request", None)
+    if entry.actor_id is None and request is not None:
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            entry.actor = user
+    return entry
+
+
+def add_entry(entry):
+    # Entries of a transaction rolled back are dropped along with its
+    # on_commit callbacks, savepoints included
+    entries = getattr(buffer, "entries", None)
+    if entries is None:
+        # Outside of a request, nothing else to wait for
+        transaction.on_commit(lambda: ship([entry]))
+    else:
+        transaction.on_commit(lambda: entries.append(entry))
+
+
+def save_entries(entries):
+    """ Inserts the entries in order, keeping the time each change was made """
+    fields = [
+        field for field in LogEntry._meta.concrete_fields if not field.primary_key
+    ]
+    with transaction.atomic():
+        for start in range(0, len(entries), SAVE_BATCH_SIZE):
+            # bulk_create would stamp them all with the time of the insert
+            LogEntry.objects._insert(
+                entries[start : start + SAVE_BATCH_SIZE], fields=fields, raw=True
+            )
+
+
+def dump_entries(entries):
+    return serializers.serialize("json", entries)
+
+
+def load_entries(data):
+    return [
+        deserialized.object for deserialized in serializers.deserialize("json", data)
+    ]
+
+
+def ship(entries):
+    if not entries:
+        return
+    if settings.AUDITLOG_MODE == "celery":
+        from influencers.taskapp.celery import save_log_entries  # noqa
+
+        try:
+            save_log_entries.delay(dump_entries(entries))
+            return
+        except Exception:
+            # Saved here rather than lost when the broker is unreachable
+            logger.exception("Could not send %d audit log entries", len(entries))
+    save_entries(entries)
+
+
+def start_buffer(request):
+    buffer.entries = []
+    buffer.request = request
+
+
+def flush_buffer():
+    entries = getattr(buffer, "entries", None)
+    buffer.entries = buffer.request = None
+    ship(entries)
+
+
+def log_create(sender, instance, created, **kwargs):
+    if not is_buffered():
+        return receivers.log_create(sender, instance, created, **kwargs)
+    if created:
+        changes = model_instance_diff(None, instance)
+        add_entry(build_entry(instance, LogEntry.Action.CREATE, changes))
+
+
+def log_update(sender, instance, **kwargs):
+    if not is_buffered():
+        return receivers.log_update(sender, instance, **kwargs)
+    if instance.pk is None:
+        return
+    try:
+        old = sender.objects.get(pk=instance.pk)
+    except sender.DoesNotExist:
+        return
+    changes = model_instance_diff(old, instance)
+    if changes:
+        add_entry(build_entry(instance, LogEntry.Action.UPDATE, changes))
+
+
+def log_delete(sender, instance, **kwargs):
+    if not is_buffered():
+        return receivers.log_delete(sender, instance, **kwargs)
+    if instance.pk is not None:
+        changes = model_instance_diff(instance, None)
+        add_entry(build_entry(instance, LogEntry.Action.DELETE, changes))
+
+
+def log_entries(entries):
+    if is_buffered():
+        for entry in entries:
+            add_entry(entry)
+    elif entries:
+        save_entries(entries)
+
+
+def log_created(instances):
+    """ Logs the creation of rows saved by bulk_create, which sends no post_save """
+    instances = [
+        instance for instance in instances if auditlog.contains(instance.__class__)
+    ]
+    # The diff shows related rows as their str, they are read once for all the
+    # instances rather than one query per row
+    for model in {instance.__class__ for instance in instances}:
+        prefetch_related_objects(
+            [instance for instance in instances if instance.__class__ is model],
+            *[field.name for field in model._meta.concrete_fields if field.is_relation]
+        )
+    log_entries(
+        [
+            build_entry(
+                instance, LogEntry.Action.CREATE, model_instance_diff(None, instance)
+            )
+            for instance in instances
+        ]
+    )
+
+
+def get_value(field, value):
+    """ value of field as auditlog's model_instance_diff compares it """
+    if isinstance(field, DateTimeField):
+        value = field.to_python(value)
+        if value is not None and settings.USE_TZ and not timezone.is_naive(value):
+            value = timezone.make_naive(value, timezone=timezone.utc)
+        return value
+    return smart_text(value)
+
+
+def log_updated(model, rows):
+    """
+    Logs the updates of rows of model written without save, which sends no
+    pre_save, from ({field name: value}, {field name: (old, new)}) of each,
+    values such as an UPDATE ... RETURNING gives them. One instance carries
+    the values of each row in turn, building one per row would cost more
+    than the update itself.
+    """
+    if not auditlog.contains(model):
+        return
+    tracked = auditlog.get_model_fields(model)
+    instance = model()
+    entries = []
+    for values, changes in rows:
+        for name, value in values.items():
+            setattr(instance, name, value)
+        diff = {}
+        for name, (old, new) in changes.items():
+            if tracked["include_fields"] and name not in tracked["include_fields"]:
+                continue
+            if name in tracked["exclude_fields"]:
+                continue
+            field = model._meta.get_field(name)
+            old, new = get_value(field, old), get_value(field, new)
+            if old != new:
+                diff[name] = (smart_text(old), smart_text(new))
+        if diff:
+            entries.append(build_entry(instance, LogEntry.Action.UPDATE, diff))
+    log_entries(entries)
+
+
+def connect_receivers():
+    """
+    Swaps the receivers auditlog.register connected to every model for the
+    ones of this module, which follow AUDITLOG_MODE
+    """
+    for model in list(auditlog._registry):
+        auditlog._disconnect_signals(model)
+    auditlog._signals = {
+        post_save: log_create,
+        pre_save: log_update,
+        post_delete: log_delete,
+    }
+    for model in list(auditlog._registry):
+        auditlog._connect_signals(model)
@@ -0,0 +1,97 @@
+from uuid import uuid4
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.fields import Field
+from rest_framework.serializers import ModelSerializer
+
+
+# Reference data rarely changes, every change bumps its version anyway
+REFERENCE_TIMEOUT = 60 * 60 * 24
+
+
+def get_namespace(model):
+    return "reference:{}".format(model._meta.label_lower)
+
+
+def get_version(namespace):
+    key = "{}:version".format(namespace)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid4().hex, None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(namespace):
+    """
+    Drop the data cached in namespace. The version is bumped again once the
+    transaction commits, as data cached meanwhile may come from before it.
+    """
+    key = "{}:version".format(namespace)
+    cache.set(key, uuid4().hex, None)
+    transaction.on_commit(lambda: cache.set(key, uuid4().hex, None))
+
+
+def get_cached_data(namespace, name, build, timeout=REFERENCE_TIMEOUT):
+    """ build() result, cached until the version of namespace is bumped """
+    version = get_version(namespace)
+    if version is None:
+        # Cache unavailable
+        return build()
+    key = "{}:{}:{}".format(namespace, name, version)
+    data = cache.get(key)
+    if data is None:
+        data = build()
+        cache.set(key, data, timeout)
+    return data
+
+
+def get_cached_list(serializer_class, queryset):
+    """ serializer_class(queryset, many=True).data from the reference cache """
+    return get_cached_data(
+        get_namespace(queryset.model),
+        serializer_class.__name__,
+        lambda: list(serializer_class(queryset, many=True).data),
+    )
+
+
+def get_nested_serializer(reference_model):
+    """ The serializer ModelSerializer nests a relation to the model with at depth=1 """
+    meta = type("Meta", (), {"model": reference_model, "fields": "__all__"})
+    return type("NestedSerializer", (ModelSerializer,), {"Meta": meta})
+
+
+def get_nested_references(model):
+    """ Every row of model, soft deleted ones included, nested as by depth=1, by pk """
+
+    def build():
+        serializer = get_nested_serializer(model)
+        return {
+            row["id"]: row
+            for row in serializer(model.all_objects.all(), many=True).data
+        }
+
+    return get_cached_data(get_namespace(model), "nested", build)
+
+
+class CachedReferenceField(Field):
+    """
+    Renders a reference data foreign key nested the way depth=1 does,
+    from the cache rather than a query per row.
+    Give it the key column as source, e.g. source="category_id".
+    """
+
+    def __init__(self, model, **kwargs):
+        kwargs["read_only"] = True
+        self.model = model
+        self.references = None
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        # Loaded once for all the rows the serializer renders
+        if self.references is None:
+            self.references = get_nested_references(self.model)
+        if value in self.references:
+            return self.references[value]
+        instance = self.model.all_objects.get(pk=value)
+        return get_nested_serializer(self.model)(instance).data
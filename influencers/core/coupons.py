@@ -0,0 +1,95 @@
+import string
+import threading
+from collections import deque
+from django.db import connection
+from influencers.core.audit import log_created
+from influencers.core.models import Coupon
+
+
+ALPHABET = string.ascii_uppercase
+# Shortest code handed out, longer ones follow once every code of it is used
+CODE_LENGTH = 6
+# Any number coprime with 26 spreads consecutive numbers over the whole space,
+# the offset keeps the first codes from starting with AAA
+MULTIPLIER = 7919315
+OFFSET = 123456789
+
+# Created with INCREMENT BY CODE_BLOCK_SIZE, every value starts a block
+CODE_SEQUENCE = "core_coupon_code_seq"
+CODE_BLOCK_SIZE = 100
+
+RESERVE_SQL = "SELECT nextval(%s) FROM generate_series(1, %s)"
+
+
+def encode(number):
+    """
+    The code of a sequence number, unique to it. Codes of the same length
+    are a permutation of the numbers they cover, so neighbouring numbers
+    give codes that do not look alike and cannot be guessed from each other
+    """
+    length = CODE_LENGTH
+    while number >= len(ALPHABET) ** length:
+        number -= len(ALPHABET) ** length
+        length += 1
+    number = (number * MULTIPLIER + OFFSET) % len(ALPHABET) ** length
+    code = []
+    for _ in range(length):
+        number, digit = divmod(number, len(ALPHABET))
+        code.append(ALPHABET[digit])
+    return "".join(code)
+
+
+class CodeAllocator:
+    """
+    Hands out coupon codes from blocks of sequence numbers reserved in one
+    query, so creating a coupon rarely needs a round trip for its code.
+    Numbers are never given twice, those of a rolled back transaction or of
+    a process stopping are skipped.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.blocks = deque()
+
+    def reserve(self, count):
+        blocks = -(-count // CODE_BLOCK_SIZE)
+        with connection.cursor() as cursor:
+            cursor.execute(RESERVE_SQL, [CODE_SEQUENCE, blocks])
+            self.blocks.extend(
+                range(start, start + CODE_BLOCK_SIZE) for start, in cursor.fetchall()
+            )
+
+    def allocate(self, count):
+        with self.lock:
+            available = sum(len(block) for block in self.blocks)
+            if available < count:
+                self.reserve(count - available)
+            numbers = []
+            while len(numbers) < count:
+                block = self.blocks[0]
+                taken = block[: count - len(numbers)]
+                numbers.extend(taken)
+                if len(taken) == len(block):
+                    self.blocks.popleft()
+                else:
+                    self.blocks[0] = block[len(taken) :]
+        return [encode(number) for number in numbers]
+
+
+allocator = CodeAllocator()
+
+
+def allocate_codes(count):
+    """ count new coupon codes, none of them given before """
+    return allocator.allocate(count)
+
+
+def create_coupons(percentages):
+    """ Coupons of the given percentages, saved at once with new codes """
+    codes = allocate_codes(len(percentages))
+    coupons = Coupon.objects.bulk_create(
+        Coupon(percentage=percentage, code=code)
+        for percentage, code in zip(percentages, codes)
+    )
+    log_created(coupons)
+    return coupons
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from influencers.core.archive import archive
+
+
+class Command(BaseCommand):
+    """
+    Run command 'python manage.py archive_rows'
+    to move old soft deleted rows and audit log entries to the archive now
+    rather than waiting for the nightly task, see settings.ARCHIVE
+    """
+
+    help = "Archive old soft deleted rows and audit log entries"
+
+    def handle(self, *args, **options):
+        report = archive()
+        self.stdout.write("table\trows\tbytes")
+        for table, total in sorted(report.items()):
+            self.stdout.write("{}\t{rows}\t{bytes}".format(table, **total))
+        self.stdout.write(
+            "{} rows, {} bytes reclaimed".format(
+                sum(total["rows"] for total in report.values()),
+                sum(total["bytes"] for total in report.values()),
+            )
+        )
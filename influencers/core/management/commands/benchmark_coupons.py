@@ -0,0 +1,41 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from influencers.core.coupons import create_coupons
+from influencers.core.models import Coupon
+
+
+class Command(BaseCommand):
+    """
+    Run command 'python manage.py benchmark_coupons --coupons 10000'
+    to time creating that many coupons one at a time and in batches.
+    Rows are created in a transaction rolled back after.
+    """
+
+    help = "Measure the throughput of coupon creation"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--coupons", type=int, default=10000)
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        count, batch_size = options["coupons"], options["batch_size"]
+        self.stdout.write("method\tcoupons\tseconds\tcoupons/s")
+        with transaction.atomic():
+            start = time.perf_counter()
+            for _ in range(count):
+                Coupon.objects.create(percentage=10)
+            self.write_line("one at a time", count, start)
+
+            start = time.perf_counter()
+            for offset in range(0, count, batch_size):
+                create_coupons([10] * min(batch_size, count - offset))
+            self.write_line("batches of {}".format(batch_size), count, start)
+
+            transaction.set_rollback(True)
+
+    def write_line(self, method, count, start):
+        duration = time.perf_counter() - start
+        self.stdout.write(
+            "{}\t{}\t{:.2f}\t{:.0f}".format(method, count, duration, count / duration)
+        )
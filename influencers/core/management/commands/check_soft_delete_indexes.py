@@ -0,0 +1,80 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, models
+from safedelete.models import SafeDeleteModel
+
+
+# Leading column of every index restricted to the rows safedelete shows
+PARTIAL_INDEX_COLUMNS_SQL = """
+    SELECT attribute.attname
+    FROM pg_index index
+    JOIN pg_class tab ON tab.oid = index.indrelid
+    JOIN pg_attribute attribute
+        ON attribute.attrelid = index.indrelid AND attribute.attnum = index.indkey[0]
+    WHERE tab.relname = %s
+        AND pg_get_expr(index.indpred, index.indrelid) = '(deleted IS NULL)'
+"""
+
+
+def get_filtered_fields(model):
+    """
+    Fields of model queried along with deleted IS NULL: foreign keys, which
+    reverse relations and soft delete cascades filter on, and the first
+    Meta.ordering column every list sorts by
+    """
+    fields = [
+        field
+        for field in model._meta.concrete_fields
+        if isinstance(field, models.ForeignKey) and not field.one_to_one
+    ]
+    if model._meta.ordering:
+        name = model._meta.ordering[0].lstrip("-")
+        field = model._meta.pk if name == "pk" else model._meta.get_field(name)
+        if field not in fields:
+            fields.insert(0, field)
+    return fields
+
+
+def get_missing_indexes():
+    """ (model, field) of every soft delete filter without a partial index """
+    missing = []
+    with connection.cursor() as cursor:
+        for model in apps.get_models():
+            if not issubclass(model, SafeDeleteModel) or not model._meta.managed:
+                continue
+            cursor.execute(PARTIAL_INDEX_COLUMNS_SQL, [model._meta.db_table])
+            indexed = {column for column, in cursor.fetchall()}
+            missing += [
+                (model, field)
+                for field in get_filtered_fields(model)
+                if field.column not in indexed
+            ]
+    return missing
+
+
+class Command(BaseCommand):
+    """
+    Run command 'python manage.py check_soft_delete_indexes'
+    to list the foreign keys and ordering columns of soft deletable models
+    that no index WHERE deleted IS NULL starts with. Fails if there is any,
+    so it can run along with the migrations on deploy.
+    """
+
+    help = "Report soft delete filters without a partial index"
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("Partial indexes are only checked on PostgreSQL")
+
+        missing = get_missing_indexes()
+        for model, field in missing:
+            self.stdout.write(
+                "{}.{} ({}.{})".format(
+                    model._meta.label, field.name, model._meta.db_table, field.column
+                )
+            )
+        if missing:
+            raise CommandError(
+                "{} soft delete filters have no partial index".format(len(missing))
+            )
+        self.stdout.write("Every soft delete filter has a partial index")
@@ -0,0 +1,137 @@
+import hashlib
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from influencers.core import audit
+
+
+logger = logging.getLogger(__name__)
+
+# Collapses "IN (%s, %s, %s)" style lists so they share one fingerprint
+PLACEHOLDER_LIST = re.compile(r"%s(, %s)+")
+
+
+def get_fingerprint(sql):
+    normalized = PLACEHOLDER_LIST.sub("%s, ...", sql)
+    return hashlib.md5(normalized.encode()).hexdigest()[:8], normalized
+
+
+class QueryCollector:
+    """ Database execute wrapper counting and timing every statement of a request """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.statements[sql] += 1
+
+    def get_duplicates(self):
+        """ Statements run more than once, grouped by fingerprint, most repeated first """
+        duplicates = Counter()
+        samples = {}
+        for sql, count in self.statements.items():
+            fingerprint, normalized = get_fingerprint(sql)
+            duplicates[fingerprint] += count
+            samples.setdefault(fingerprint, normalized)
+        return [
+            (fingerprint, count, samples[fingerprint])
+            for fingerprint, count in duplicates.most_common()
+            if count > 1
+        ]
+
+
+class QueryBudgetMiddleware:
+    """
+    Records the SQL query count, DB time and duplicated statements of sampled
+    requests, exposes them as response headers and logs the requests that go
+    over their route's query budget.
+    Enable it and tune it through the QUERY_BUDGET setting.
+    """
+
+    def __init__(self, get_response):
+        config = settings.QUERY_BUDGET
+        if not config.get("ENABLED"):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.sample_rate = config.get("SAMPLE_RATE", 1.0)
+        self.default_budget = config.get("DEFAULT_BUDGET")
+        self.routes = config.get("ROUTES", {})
+
+    def __call__(self, request):
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        collector = QueryCollector()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(collector))
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        duplicates = collector.get_duplicates()
+        response["X-Query-Count"] = collector.count
+        response["X-Query-Duplicates"] = sum(count for _, count, _ in duplicates)
+        server_timing = 'db;dur={:.2f};desc="{} queries", app;dur={:.2f}'
+        response["Server-Timing"] = server_timing.format(
+            collector.duration * 1000, collector.count, duration * 1000
+        )
+
+        route = self.get_route(request)
+        budget = self.routes.get(route, self.default_budget)
+        if budget is not None and collector.count > budget:
+            logger.warning(
+                "%s %s (%s) ran %d queries in %.2fms, budget is %d. Duplicated: %s",
+                request.method,
+                request.path,
+                route,
+                collector.count,
+                collector.duration * 1000,
+                budget,
+                "; ".join(
+                    "{} x{}: {}".format(fingerprint, count, sql[:200])
+                    for fingerprint, count, sql in duplicates[:5]
+                )
+                or "none",
+            )
+        return response
+
+    def get_route(self, request):
+        resolver_match = getattr(request, "resolver_match", None)
+        if resolver_match is None:
+            return None
+        return resolver_match.view_name
+
+
+class AuditlogBufferMiddleware:
+    """
+    Collects the audit log entries of a request and ships them at once after
+    its transaction commits, as AUDITLOG_MODE says, instead of saving one
+    LogEntry along with every change. Unused when AUDITLOG_MODE is sync.
+    """
+
+    def __init__(self, get_response):
+        if not audit.is_buffered():
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        audit.start_buffer(request)
+        try:
+            return self.get_response(request)
+        finally:
+            audit.flush_buffer()
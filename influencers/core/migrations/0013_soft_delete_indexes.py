@@ -0,0 +1,26 @@
+# Generated by Django 2.1.4 on 2026-10-18 11:47
+
+from django.db import migrations
+import partial_index
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_auto_20190130_1417'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bank',
+            index=partial_index.PartialIndex(fields=['name', 'deleted'], name='core_bank_name_a16f33_partial', unique=False, where=partial_index.PQ(deleted__isnull=True)),
+        ),
+        migrations.AddIndex(
+            model_name='category',
+            index=partial_index.PartialIndex(fields=['name', 'deleted'], name='core_catego_name_96a081_partial', unique=False, where=partial_index.PQ(deleted__isnull=True)),
+        ),
+        migrations.AddIndex(
+            model_name='socialplatform',
+            index=partial_index.PartialIndex(fields=['name', 'deleted'], name='core_social_name_81560b_partial', unique=False, where=partial_index.PQ(deleted__isnull=True)),
+        ),
+    ]
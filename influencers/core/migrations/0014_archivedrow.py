@@ -0,0 +1,31 @@
+# Generated by Django 2.1.4 on 2026-10-18 11:49
+
+import django.contrib.postgres.fields.jsonb
+from django.db import migrations, models
+import django.utils.timezone
+import model_utils.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_soft_delete_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedRow',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', model_utils.fields.AutoCreatedField(default=django.utils.timezone.now, editable=False, verbose_name='created')),
+                ('modified', model_utils.fields.AutoLastModifiedField(default=django.utils.timezone.now, editable=False, verbose_name='modified')),
+                ('table', models.CharField(max_length=63)),
+                ('object_pk', models.CharField(max_length=255)),
+                ('data', django.contrib.postgres.fields.jsonb.JSONField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='archivedrow',
+            index=models.Index(fields=['table', 'object_pk'], name='core_archiv_table_b5a943_idx'),
+        ),
+    ]
@@ -0,0 +1,81 @@
+# Generated by Django 2.1.4 on 2026-10-18 12:14
+
+import string
+
+from django.db import migrations
+from django.db.models import Count, Min
+import partial_index
+
+
+# A copy of influencers.core.coupons as of this migration, so that changing
+# it later cannot change what this migration does
+ALPHABET = string.ascii_uppercase
+CODE_LENGTH = 6
+MULTIPLIER = 7919315
+OFFSET = 123456789
+CODE_BLOCK_SIZE = 100
+
+RESERVE_SQL = "SELECT nextval('core_coupon_code_seq') FROM generate_series(1, %s)"
+
+
+def encode(number):
+    length = CODE_LENGTH
+    while number >= len(ALPHABET) ** length:
+        number -= len(ALPHABET) ** length
+        length += 1
+    number = (number * MULTIPLIER + OFFSET) % len(ALPHABET) ** length
+    code = []
+    for _ in range(length):
+        number, digit = divmod(number, len(ALPHABET))
+        code.append(ALPHABET[digit])
+    return "".join(code)
+
+
+def allocate_codes(connection, count):
+    # Whole blocks are reserved, as the application does, the rest of the
+    # last one is skipped
+    with connection.cursor() as cursor:
+        cursor.execute(RESERVE_SQL, [-(-count // CODE_BLOCK_SIZE)])
+        numbers = [
+            number
+            for start, in cursor.fetchall()
+            for number in range(start, start + CODE_BLOCK_SIZE)
+        ]
+    return [encode(number) for number in numbers[:count]]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_archivedrow'),
+    ]
+
+    def migrate_data(apps, schema_editor):
+        # Codes were random and could be given twice, the oldest coupon of
+        # a duplicated code keeps it and the others get a new one
+        Coupon = apps.get_model("core", "Coupon")
+        duplicates = (
+            Coupon.objects.order_by()
+            .values("code")
+            .annotate(keep=Min("id"), count=Count("id"))
+            .filter(count__gt=1)
+        )
+        for duplicate in duplicates:
+            coupons = Coupon.objects.filter(code=duplicate["code"]).exclude(
+                id=duplicate["keep"]
+            )
+            codes = allocate_codes(schema_editor.connection, len(coupons))
+            for coupon, code in zip(coupons, codes):
+                Coupon.objects.filter(id=coupon.id).update(code=code)
+
+    operations = [
+        migrations.RunSQL(
+            "CREATE SEQUENCE core_coupon_code_seq INCREMENT BY 100 MINVALUE 0 START WITH 0",
+            reverse_sql="DROP SEQUENCE core_coupon_code_seq",
+        ),
+        migrations.RunPython(migrate_data, reverse_code=migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='coupon',
+            index=partial_index.PartialIndex(fields=['code'], name='core_coupon_code_c5d51f_partial', unique=True, where=partial_index.PQ(code__gt='')),
+        ),
+    ]
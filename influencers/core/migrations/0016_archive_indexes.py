@@ -0,0 +1,26 @@
+# Generated by Django 2.1.4 on 2026-10-18 13:12
+
+from django.db import migrations
+import partial_index
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_coupon_code_unique'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bank',
+            index=partial_index.PartialIndex(fields=['deleted'], name='core_bank_deleted_0ec92f_partial', unique=False, where=partial_index.PQ(deleted__isnull=False)),
+        ),
+        migrations.AddIndex(
+            model_name='category',
+            index=partial_index.PartialIndex(fields=['deleted'], name='core_catego_deleted_e56513_partial', unique=False, where=partial_index.PQ(deleted__isnull=False)),
+        ),
+        migrations.AddIndex(
+            model_name='socialplatform',
+            index=partial_index.PartialIndex(fields=['deleted'], name='core_social_deleted_887945_partial', unique=False, where=partial_index.PQ(deleted__isnull=False)),
+        ),
+    ]
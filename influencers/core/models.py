@@ -1,6 +1,5 @@
-import string
+from django.contrib.postgres.fields import JSONField
 from django.db import models
-from django.utils.crypto import get_random_string
 from model_utils.models import TimeStampedModel
 from auditlog.registry import auditlog
 from partial_index import PartialIndex, PQ
@@ -15,6 +14,14 @@ class Category(TimeStampedModel, SafeDeleteModel):
     class Meta:
         verbose_name_plural = "categories"
         ordering = ["name"]
+        indexes = [
+            PartialIndex(
+                fields=["name", "deleted"], unique=False, where=PQ(deleted__isnull=True)
+            ),
+            PartialIndex(
+                fields=["deleted"], unique=False, where=PQ(deleted__isnull=False)
+            ),
+        ]
 
     def __str__(self):
         return self.name
@@ -29,6 +36,14 @@ class SocialPlatform(TimeStampedModel, SafeDeleteModel):
 
     class Meta:
         ordering = ["name"]
+        indexes = [
+            PartialIndex(
+                fields=["name", "deleted"], unique=False, where=PQ(deleted__isnull=True)
+            ),
+            PartialIndex(
+                fields=["deleted"], unique=False, where=PQ(deleted__isnull=False)
+            ),
+        ]
 
     name = models.CharField(max_length=50)
 
@@ -47,7 +62,13 @@ class Bank(TimeStampedModel, SafeDeleteModel):
         indexes = [
             PartialIndex(
                 fields=["swift", "deleted"], unique=True, where=PQ(deleted__isnull=True)
-            )
+            ),
+            PartialIndex(
+                fields=["name", "deleted"], unique=False, where=PQ(deleted__isnull=True)
+            ),
+            PartialIndex(
+                fields=["deleted"], unique=False, where=PQ(deleted__isnull=False)
+            ),
         ]
         ordering = ["name"]
 
@@ -70,6 +91,7 @@ class Coupon(TimeStampedModel):
 
     class Meta:
         ordering = ["code"]
+        indexes = [PartialIndex(fields=["code"], unique=True, where=PQ(code__gt=""))]
 
     percentage = models.IntegerField(default=0)
     code = models.CharField(max_length=10)
@@ -79,16 +101,32 @@ class Coupon(TimeStampedModel):
     def __str__(self):
         return self.code
 
-    def create_code(self):
-        chars = get_random_string(length=4, allowed_chars=string.ascii_uppercase)
-        nums = chars + str(self.percentage)
-        return nums
-
     def save(self, *args, **kwargs):
-        self.code = self.create_code()
+        # A code never changes once given, customers may already be using it
+        if not self.code:
+            from influencers.core.coupons import allocate_codes  # noqa
+
+            self.code = allocate_codes(1)[0]
         return super().save(*args, **kwargs)
 
 
+class ArchivedRow(TimeStampedModel):
+    """
+    A row moved out of its table by influencers.core.archive, soft deleted
+    long ago or an old audit log entry, kept as JSON in case it is needed back
+    """
+
+    table = models.CharField(max_length=63)
+    object_pk = models.CharField(max_length=255)
+    data = JSONField()
+
+    class Meta:
+        indexes = [models.Index(fields=["table", "object_pk"])]
+
+    def __str__(self):
+        return "{} {}".format(self.table, self.object_pk)
+
+
 auditlog.register(Bank)
 auditlog.register(Category)
 auditlog.register(Coupon)
@@ -0,0 +1,272 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import F, Q
+from django.db.models.constants import LOOKUP_SEP
+from rest_framework.compat import coreapi, coreschema
+from rest_framework.exceptions import NotFound, ParseError
+from rest_framework.pagination import (
+    BasePagination,
+    PageNumberPagination,
+    CursorPagination,
+    Cursor,
+    _reverse_ordering,
+)
+from rest_framework.utils.urls import replace_query_param
+
+
+def encode_value(value):
+    # isoformat keeps microseconds, which DjangoJSONEncoder would truncate
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination positioned on every ordering column plus the primary key
+    as a tiebreaker, so each page is a range scan whatever its depth and pages
+    stay stable when rows are inserted meanwhile.
+    The ordering is the queryset's, or its model's Meta.ordering, relations
+    being ordered by their key column. Nulls of nullable columns come last.
+    Orderings on other columns than the model's, or on expressions, have no
+    value on the rows to position a cursor on and are rejected.
+    """
+
+    ordering = None
+    invalid_ordering_message = "This list cannot be paginated with a cursor."
+
+    def get_keys(self, queryset, view):
+        """
+        (descending, field) of each key of the ordering, None when one is not
+        a column of the model
+        """
+        opts = queryset.model._meta
+        ordering = (
+            getattr(view, "keyset_ordering", None)
+            or queryset.query.order_by
+            or opts.ordering
+        )
+        keys = []
+        for key in ordering:
+            if not isinstance(key, str) or LOOKUP_SEP in key:
+                return None
+            name = key.lstrip("-")
+            try:
+                field = opts.pk if name == "pk" else opts.get_field(name)
+            except FieldDoesNotExist:
+                return None
+            # Reverse and many to many relations have no column
+            if getattr(field, "column", None) is None:
+                return None
+            keys.append((key.startswith("-"), field))
+        return keys
+
+    def get_ordering(self, request, queryset, view):
+        opts = queryset.model._meta
+        fields = self.get_keys(queryset, view)
+        if fields is None:
+            raise ParseError(self.invalid_ordering_message)
+        keys = []
+        self.fields = {}
+        for descending, field in fields:
+            keys.append(("-" if descending else "") + field.attname)
+            self.fields[field.attname] = field
+        if opts.pk.attname not in self.fields:
+            descending = bool(keys) and keys[0].startswith("-")
+            keys.append(("-" if descending else "") + opts.pk.attname)
+            self.fields[opts.pk.attname] = opts.pk
+        return tuple(keys)
+
+    def get_order_by(self, ordering, reverse):
+        """ The ordering as expressions, nulls last, first when reversed """
+        order_by = []
+        for key in ordering:
+            name = key.lstrip("-")
+            if not self.fields[name].null:
+                order_by.append(key)
+                continue
+            nulls = {"nulls_first": True} if reverse else {"nulls_last": True}
+            expression = F(name)
+            order_by.append(
+                expression.desc(**nulls)
+                if key.startswith("-")
+                else expression.asc(**nulls)
+            )
+        return order_by
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        position = self.cursor.position if self.cursor is not None else None
+
+        ordering = _reverse_ordering(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*self.get_order_by(ordering, reverse))
+        if position is not None:
+            queryset = queryset.filter(
+                self.get_keyset_filter(ordering, position, reverse)
+            )
+
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[: self.page_size]
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+        return self.page
+
+    def get_after(self, key, value, nulls_first):
+        """ Rows after value on the column of key, None when there are none """
+        name = key.lstrip("-")
+        nullable = self.fields[name].null
+        if value is None:
+            return Q(**{"{}__isnull".format(name): False}) if nulls_first else None
+        lookup = "{}__{}".format(name, "lt" if key.startswith("-") else "gt")
+        after = Q(**{lookup: value})
+        if nullable and not nulls_first:
+            after |= Q(**{"{}__isnull".format(name): True})
+        return after
+
+    def get_keyset_filter(self, ordering, position, nulls_first=False):
+        """
+        Rows strictly after the position: (a > x) OR (a = x AND b > y) ...,
+        ANDed with a >= x, the bound the index range scan starts from
+        """
+        condition = Q()
+        equal = Q()
+        for key, value in zip(ordering, position):
+            name = key.lstrip("-")
+            after = self.get_after(key, value, nulls_first)
+            if after is not None:
+                condition |= equal & after
+            equal &= Q(
+                **{"{}__isnull".format(name): True} if value is None else {name: value}
+            )
+
+        key, value = ordering[0], position[0]
+        name = key.lstrip("-")
+        if value is None:
+            bound = Q() if nulls_first else Q(**{"{}__isnull".format(name): True})
+        else:
+            lookup = "{}__{}".format(name, "lte" if key.startswith("-") else "gte")
+            bound = Q(**{lookup: value})
+            if self.fields[name].null and not nulls_first:
+                bound |= Q(**{"{}__isnull".format(name): True})
+        return bound & condition
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        position = self._get_position_from_instance(self.page[-1], self.ordering)
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        position = self._get_position_from_instance(self.page[0], self.ordering)
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+
+    def _get_position_from_instance(self, instance, ordering):
+        names = [key.lstrip("-") for key in ordering]
+        if isinstance(instance, dict):
+            return [instance[name] for name in names]
+        return [getattr(instance, name) for name in names]
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            reverse, position = json.loads(urlsafe_b64decode(encoded.encode("ascii")))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return Cursor(
+            offset=0, reverse=bool(reverse), position=self.decode_position(position)
+        )
+
+    def decode_position(self, position):
+        """ The position's values as their columns' types, a cursor may be edited """
+        values = []
+        for key, value in zip(self.ordering, position):
+            field = self.fields[key.lstrip("-")]
+            if value is None and field.null:
+                values.append(None)
+                continue
+            try:
+                values.append(field.to_python(value))
+            except (ValidationError, TypeError, ValueError):
+                raise NotFound(self.invalid_cursor_message)
+            if values[-1] is None:
+                raise NotFound(self.invalid_cursor_message)
+        return values
+
+    def encode_cursor(self, cursor):
+        payload = json.dumps(
+            [int(cursor.reverse), cursor.position], default=encode_value
+        )
+        encoded = urlsafe_b64encode(payload.encode("ascii")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+
+class SelectablePagination(BasePagination):
+    """
+    Page number pagination, unless the request asks for keyset pagination
+    with ?pagination=cursor and the list's ordering allows it. Views can
+    still set KeysetPagination directly.
+    """
+
+    pagination_query_param = "pagination"
+
+    def __init__(self):
+        self.paginator = PageNumberPagination()
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if request.query_params.get(self.pagination_query_param) == "cursor":
+            paginator = KeysetPagination()
+            if paginator.get_keys(queryset, view) is not None:
+                self.paginator = paginator
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    @property
+    def display_page_controls(self):
+        return getattr(self.paginator, "display_page_controls", False)
+
+    def to_html(self):
+        return self.paginator.to_html()
+
+    def get_results(self, data):
+        return data["results"]
+
+    def get_schema_fields(self, view):
+        fields = PageNumberPagination().get_schema_fields(view)
+        names = {field.name for field in fields}
+        fields += [
+            field
+            for field in KeysetPagination().get_schema_fields(view)
+            if field.name not in names
+        ]
+        fields.append(
+            coreapi.Field(
+                name=self.pagination_query_param,
+                required=False,
+                location="query",
+                schema=coreschema.String(
+                    title="Pagination",
+                    description="Set to cursor to paginate with keyset cursors.",
+                ),
+            )
+        )
+        return fields
@@ -0,0 +1,15 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from influencers.core.cache import bump_version, get_namespace
+from influencers.core.models import Category, SocialPlatform, Bank
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=SocialPlatform)
+@receiver(post_save, sender=Bank)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=SocialPlatform)
+@receiver(post_delete, sender=Bank)
+def invalidate_reference_cache(sender, **kwargs):
+    """ Soft delete and undelete are saves too, so they are covered here """
+    bump_version(get_namespace(sender))
@@ -1,22 +1,34 @@
-from factory import DjangoModelFactory
+from factory import DjangoModelFactory, Faker, Iterator, LazyFunction, Sequence
+from factory.fuzzy import FuzzyInteger
+from influencers.core.coupons import allocate_codes
 from influencers.core.models import Category, SocialPlatform, Bank, Coupon
 
 
 class CategoryFactory(DjangoModelFactory):
+    name = Faker("word")
+
     class Meta:
         model = Category
 
 
 class SocialPlatformFactory(DjangoModelFactory):
+    name = Iterator(["Snapchat", "Twitter", "Instagram", "Youtube", "Facebook"])
+
     class Meta:
         model = SocialPlatform
 
 
 class BankFactory(DjangoModelFactory):
+    name = Faker("company")
+    swift = Sequence(lambda n: "BANK{:07d}".format(n))
+
     class Meta:
         model = Bank
 
 
 class CouponFactory(DjangoModelFactory):
+    percentage = FuzzyInteger(5, 50)
+    code = LazyFunction(lambda: allocate_codes(1)[0])
+
     class Meta:
         model = Coupon
@@ -0,0 +1,101 @@
+from datetime import timedelta
+from auditlog.models import LogEntry
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from influencers.users.tests.factories import UserFactory
+from influencers.clients.models import Client, Offer
+from influencers.core.archive import archive
+from influencers.core.models import ArchivedRow, Category
+
+
+ARCHIVE = {
+    "SOFT_DELETED_DAYS": 90,
+    "LOG_ENTRY_DAYS": 365,
+    "BATCH_SIZE": 1000,
+    "MAX_BATCHES": 100,
+}
+
+
+@override_settings(ARCHIVE=ARCHIVE)
+class ArchiveTestCase(TestCase):
+    """ Test old soft deleted rows and log entries are moved to the archive """
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.category = Category.objects.create(name="category")
+        self.client_obj = Client.objects.create(
+            name="client", account_manager=self.user
+        )
+        self.offer = Offer.objects.create(
+            name="offer",
+            client=self.client_obj,
+            category=self.category,
+            billing="FIXED_PRICE",
+        )
+        self.long_ago = timezone.now() - timedelta(days=400)
+
+    def test_soft_deleted_rows(self):
+        # The client cascades to its offer
+        self.client_obj.delete()
+        Client.all_objects.update(deleted=self.long_ago)
+        Offer.all_objects.update(deleted=self.long_ago)
+
+        report = archive()
+        self.assertEqual(report["clients_client"]["rows"], 1)
+        self.assertEqual(report["clients_offer"]["rows"], 1)
+        self.assertGreater(report["clients_offer"]["bytes"], 0)
+        self.assertFalse(Client.all_objects.exists())
+        self.assertFalse(Offer.all_objects.exists())
+        self.assertTrue(Category.objects.filter(pk=self.category.pk).exists())
+
+        row = ArchivedRow.objects.get(table="clients_offer")
+        self.assertEqual(row.object_pk, str(self.offer.pk))
+        self.assertEqual(row.data["name"], "offer")
+        self.assertEqual(row.data["client_id"], self.client_obj.pk)
+
+    def test_recently_deleted_rows_are_kept(self):
+        self.client_obj.delete()
+
+        self.assertEqual(archive(), {})
+        self.assertTrue(Client.all_objects.exists())
+
+    def test_referenced_rows_are_kept(self):
+        # Soft deleted without its cascade, the offer still needs it
+        Category.all_objects.update(deleted=self.long_ago)
+
+        self.assertEqual(archive(), {})
+        self.assertTrue(Category.all_objects.filter(pk=self.category.pk).exists())
+
+    def test_log_entries(self):
+        LogEntry.objects.update(timestamp=self.long_ago)
+        count = LogEntry.objects.count()
+        self.assertGreater(count, 0)
+
+        report = archive()
+        self.assertEqual(report["auditlog_logentry"]["rows"], count)
+        self.assertFalse(LogEntry.objects.exists())
+        self.assertEqual(
+            ArchivedRow.objects.filter(table="auditlog_logentry").count(), count
+        )
+
+    @override_settings(ARCHIVE=dict(ARCHIVE, BATCH_SIZE=1, MAX_BATCHES=2))
+    def test_batches(self):
+        LogEntry.objects.update(timestamp=self.long_ago)
+        count = LogEntry.objects.count()
+        self.assertGreater(count, 2)
+
+        self.assertEqual(archive()["auditlog_logentry"]["rows"], 2)
+        self.assertEqual(LogEntry.objects.count(), count - 2)
+
+    @override_settings(ARCHIVE=dict(ARCHIVE, BATCH_SIZE=1, MAX_BATCHES=1))
+    def test_batches_of_each_model(self):
+        # Archived first, the clients do not use up the log entries' batches
+        Client.objects.create(name="another", account_manager=self.user).delete()
+        self.client_obj.delete()
+        Client.all_objects.update(deleted=self.long_ago)
+        Offer.all_objects.update(deleted=self.long_ago)
+        LogEntry.objects.update(timestamp=self.long_ago)
+
+        report = archive()
+        self.assertEqual(report["clients_client"]["rows"], 1)
+        self.assertEqual(report["auditlog_logentry"]["rows"], 1)
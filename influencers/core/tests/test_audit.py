@@ -0,0 +1,79 @@
+import json
+from unittest.mock import patch
+from auditlog.models import LogEntry
+from django.db import transaction
+from django.urls import reverse
+from django.test import TransactionTestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+from influencers.users.tests.factories import UserFactory
+from influencers.core.models import Category
+from influencers.taskapp.celery import save_log_entries
+
+
+@override_settings(AUDITLOG_MODE="commit")
+class BufferedAuditlogTestCase(TransactionTestCase):
+    """ Test audit log entries shipped at once after the request commits """
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        LogEntry.objects.all().delete()
+
+    def create_category(self, name):
+        response = self.client.post(
+            reverse("core:category-list"), {"name": name}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return json.loads(response.content)["id"]
+
+    def test_entries_keep_actor_and_order(self):
+        pk = self.create_category("first")
+        response = self.client.patch(
+            reverse("core:category-detail", args=[pk]),
+            {"name": "second"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        entries = list(LogEntry.objects.order_by("id"))
+        self.assertEqual(
+            [entry.action for entry in entries],
+            [LogEntry.Action.CREATE, LogEntry.Action.UPDATE],
+        )
+        self.assertEqual({entry.actor for entry in entries}, {self.user})
+        self.assertEqual({entry.object_id for entry in entries}, {pk})
+        self.assertLess(entries[0].timestamp, entries[1].timestamp)
+        self.assertEqual(json.loads(entries[1].changes), {"name": ["first", "second"]})
+
+    def test_rolled_back_changes_are_not_logged(self):
+        with transaction.atomic():
+            Category.objects.create(name="kept")
+            try:
+                with transaction.atomic():
+                    Category.objects.create(name="rolled back")
+                    raise ValueError
+            except ValueError:
+                pass
+
+        self.assertEqual(
+            list(LogEntry.objects.values_list("object_repr", flat=True)), ["kept"]
+        )
+
+    @override_settings(AUDITLOG_MODE="celery")
+    def test_celery(self):
+        with patch.object(
+            save_log_entries, "delay", side_effect=save_log_entries
+        ) as delay:
+            pk = self.create_category("test")
+        self.assertEqual(delay.call_count, 1)
+        entry = LogEntry.objects.get()
+        self.assertEqual((entry.object_id, entry.actor), (pk, self.user))
+
+    @override_settings(AUDITLOG_MODE="celery")
+    def test_celery_unavailable(self):
+        with patch.object(save_log_entries, "delay", side_effect=OSError):
+            pk = self.create_category("test")
+        entry = LogEntry.objects.get()
+        self.assertEqual((entry.object_id, entry.actor), (pk, self.user))
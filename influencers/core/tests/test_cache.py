@@ -0,0 +1,107 @@
+import json
+from django.db import connection, transaction
+from django.urls import reverse
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.serializers import ModelSerializer
+from rest_framework.test import APIClient
+from influencers.core.cache import get_cached_data, get_cached_list, get_namespace
+from influencers.users.tests.factories import UserFactory
+from influencers.core.models import Category, Bank
+from influencers.core.serializers import CategorySerializer
+from influencers.influencers.models import Influencer
+from influencers.influencers.serializers import InfluencerSerializer
+
+
+def count_selects(queries):
+    return len([query for query in queries if query["sql"].startswith("SELECT")])
+
+
+class ReferenceCacheTestCase(TestCase):
+    """ Test reference data served from the cache """
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("core:category-list")
+        self.category = Category.objects.create(name="test")
+
+    def get_names(self):
+        response = self.client.get(self.url, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [
+            category["name"] for category in json.loads(response.content)["results"]
+        ]
+
+    def test_list_is_cached(self):
+        self.assertEqual(self.get_names(), ["test"])
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.get_names(), ["test"])
+        self.assertEqual(count_selects(queries), 0)
+
+    def test_list_invalidated_on_save(self):
+        self.get_names()
+        self.client.post(self.url, {"name": "another"}, format="json")
+        self.assertEqual(self.get_names(), ["another", "test"])
+        self.category.name = "renamed"
+        self.category.save()
+        self.assertEqual(self.get_names(), ["another", "renamed"])
+
+    def test_list_invalidated_on_soft_delete(self):
+        self.get_names()
+        self.category.delete()
+        self.assertEqual(self.get_names(), [])
+        self.category.undelete()
+        self.assertEqual(self.get_names(), ["test"])
+
+    def test_nested_reference(self):
+        class DepthSerializer(ModelSerializer):
+            class Meta:
+                model = Influencer
+                depth = 1
+                fields = ("id", "category", "bank")
+
+        influencer = Influencer.objects.create(
+            name="influencer1",
+            gender="MALE",
+            category=self.category,
+            email="influencer@mail.com",
+            bank=Bank.objects.create(name="test", swift="BEASUS33yyy"),
+            IBAN="SA44 2000 0001",
+            account_holder_name="influencer_",
+        )
+        expected = DepthSerializer(influencer).data
+        data = InfluencerSerializer(influencer).data
+        self.assertEqual(data["category"], expected["category"])
+        self.assertEqual(data["bank"], expected["bank"])
+
+        influencer = Influencer.objects.get()
+        with CaptureQueriesContext(connection) as queries:
+            InfluencerSerializer(influencer).data
+        self.assertEqual(count_selects(queries), 1)
+
+
+class ReferenceCacheCommitTestCase(TransactionTestCase):
+    """
+    Test a list cached by another request while a change to it is not
+    committed yet, so from the rows before it, is not served once it is
+    """
+
+    def get_names(self):
+        data = get_cached_list(CategorySerializer, Category.objects.all())
+        return [category["name"] for category in data]
+
+    def test_saved(self):
+        category = Category.objects.create(name="test")
+        before = get_cached_list(CategorySerializer, Category.objects.all())
+        with transaction.atomic():
+            category.name = "renamed"
+            category.save()
+            # Cached the way a concurrent request would
+            get_cached_data(
+                get_namespace(Category), "CategorySerializer", lambda: before
+            )
+            self.assertEqual(self.get_names(), ["test"])
+        self.assertEqual(self.get_names(), ["renamed"])
@@ -0,0 +1,31 @@
+from io import StringIO
+from unittest import skipUnless
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase
+from influencers.clients.models import Offer
+
+
+@skipUnless(connection.vendor == "postgresql", "Partial indexes checked on PostgreSQL")
+class CheckSoftDeleteIndexesTestCase(TestCase):
+    """ Test the report of soft delete filters without a partial index """
+
+    def test_all_indexed(self):
+        out = StringIO()
+        call_command("check_soft_delete_indexes", stdout=out)
+        self.assertIn("Every soft delete filter has a partial index", out.getvalue())
+
+    def test_missing_index(self):
+        index = next(
+            index for index in Offer._meta.indexes if index.fields[0] == "client"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("DROP INDEX {}".format(index.name))
+
+        out = StringIO()
+        with self.assertRaisesMessage(
+            CommandError, "1 soft delete filters have no partial index"
+        ):
+            call_command("check_soft_delete_indexes", stdout=out)
+        self.assertIn("clients.Offer.client (clients_offer.client_id)", out.getvalue())
@@ -0,0 +1,69 @@
+from auditlog.models import LogEntry
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from influencers.core.coupons import (
+    ALPHABET,
+    CODE_BLOCK_SIZE,
+    CODE_LENGTH,
+    CodeAllocator,
+    allocate_codes,
+    create_coupons,
+    encode,
+)
+from influencers.core.models import Coupon
+
+
+class EncodeTestCase(TestCase):
+    """ Test sequence numbers map to distinct codes """
+
+    def test_unique(self):
+        codes = [encode(number) for number in range(len(ALPHABET) ** 3 * 10)]
+        self.assertEqual(len(set(codes)), len(codes))
+        self.assertEqual({len(code) for code in codes}, {CODE_LENGTH})
+
+    def test_longer_codes(self):
+        last = len(ALPHABET) ** CODE_LENGTH
+        self.assertEqual(len(encode(last - 1)), CODE_LENGTH)
+        self.assertEqual(len(encode(last)), CODE_LENGTH + 1)
+
+
+class CouponAllocationTestCase(TestCase):
+    """ Test coupon codes are reserved in blocks and never change """
+
+    def test_blocks(self):
+        allocator = CodeAllocator()
+        with CaptureQueriesContext(connection) as queries:
+            codes = allocator.allocate(CODE_BLOCK_SIZE - 1)
+            codes += allocator.allocate(1)
+        self.assertEqual(len(queries), 1)
+        with CaptureQueriesContext(connection) as queries:
+            codes += allocator.allocate(CODE_BLOCK_SIZE * 2 + 1)
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(len(set(codes)), CODE_BLOCK_SIZE * 3 + 1)
+
+    def test_code_kept_on_save(self):
+        coupon = Coupon.objects.create(percentage=10)
+        code = coupon.code
+        coupon.percentage = 20
+        coupon.save()
+        coupon.refresh_from_db()
+        self.assertEqual(coupon.code, code)
+
+    def test_create_coupons(self):
+        LogEntry.objects.all().delete()
+        coupons = create_coupons([10, 20, 30])
+        self.assertEqual(
+            sorted(Coupon.objects.values_list("percentage", flat=True)), [10, 20, 30]
+        )
+        self.assertEqual(len({coupon.code for coupon in coupons}), 3)
+        self.assertEqual(
+            set(LogEntry.objects.values_list("object_id", flat=True)),
+            {coupon.pk for coupon in coupons},
+        )
+
+    def test_unique_code(self):
+        code = allocate_codes(1)[0]
+        Coupon.objects.create(code=code)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Coupon.objects.create(code=code)
@@ -0,0 +1,65 @@
+from django.urls import reverse
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+from influencers.users.tests.factories import UserFactory
+from influencers.core.models import Category
+from influencers.core.middleware import QueryCollector
+
+
+QUERY_BUDGET = {
+    "ENABLED": True,
+    "SAMPLE_RATE": 1.0,
+    "DEFAULT_BUDGET": 100,
+    "ROUTES": {"core:category-list": 1},
+}
+
+
+@override_settings(QUERY_BUDGET=QUERY_BUDGET)
+class QueryBudgetMiddlewareTestCase(TestCase):
+    """ Test per request SQL instrumentation """
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        Category.objects.create(name="test")
+
+    def test_query_headers(self):
+        response = self.client.get(reverse("core:category-list"), format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertGreater(int(response["X-Query-Count"]), 0)
+        self.assertIn("X-Query-Duplicates", response)
+        self.assertTrue(response["Server-Timing"].startswith("db;dur="))
+
+    def test_over_budget_is_logged(self):
+        with self.assertLogs("influencers.core.middleware", level="WARNING") as logs:
+            self.client.get(reverse("core:category-list"), format="json")
+        self.assertIn("core:category-list", logs.output[0])
+
+    @override_settings(QUERY_BUDGET=dict(QUERY_BUDGET, SAMPLE_RATE=0.0))
+    def test_unsampled_request(self):
+        response = self.client.get(reverse("core:category-list"), format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("X-Query-Count", response)
+
+    @override_settings(QUERY_BUDGET=dict(QUERY_BUDGET, ENABLED=False))
+    def test_disabled(self):
+        response = self.client.get(reverse("core:category-list"), format="json")
+        self.assertNotIn("Server-Timing", response)
+
+
+class QueryCollectorTestCase(TestCase):
+    """ Test duplicated statements fingerprinting """
+
+    def test_duplicates_share_fingerprint(self):
+        collector = QueryCollector()
+        execute = lambda sql, params, many, context: None  # noqa E731
+        collector(execute, "SELECT 1 WHERE id = %s", (1,), False, {})
+        collector(execute, "SELECT 1 WHERE id = %s", (2,), False, {})
+        collector(execute, "SELECT 1 WHERE id IN (%s, %s)", (1, 2), False, {})
+        collector(execute, "SELECT 1 WHERE id IN (%s, %s, %s)", (1, 2, 3), False, {})
+        collector(execute, "SELECT 2", (), False, {})
+        duplicates = collector.get_duplicates()
+        self.assertEqual(collector.count, 5)
+        self.assertEqual([count for _, count, _ in duplicates], [2, 2])
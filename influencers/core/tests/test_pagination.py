@@ -0,0 +1,153 @@
+import json
+from base64 import urlsafe_b64encode
+from datetime import timedelta
+from django.urls import reverse
+from django.utils import timezone
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+from influencers.core.pagination import KeysetPagination, SelectablePagination
+from influencers.users.tests.factories import UserFactory
+from influencers.core.models import Category
+from influencers.clients.models import AssignedInfluencer, Campaign
+from influencers.clients.tests.factories import (
+    AssignedInfluencerFactory,
+    CampaignFactory,
+)
+
+
+class KeysetPaginationTestCase(TestCase):
+    """
+    Test walking a list with ?pagination=cursor
+    """
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("core:category-list")
+        for name in ["b", "a", "b", "c", "b", "a", "d"] * 4:
+            Category.objects.create(name=name)
+
+    def walk(self, url):
+        ids = []
+        while url:
+            response = self.client.get(url, format="json")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            content = json.loads(response.content)
+            ids += [category["id"] for category in content["results"]]
+            url = content["next"]
+        return ids
+
+    def test_walk_with_duplicated_ordering_values(self):
+        ids = self.walk(self.url + "?pagination=cursor")
+        expected = list(
+            Category.objects.order_by("name", "id").values_list("id", flat=True)
+        )
+        self.assertEqual(ids, expected)
+
+    def test_rows_inserted_during_the_walk(self):
+        response = self.client.get(self.url + "?pagination=cursor", format="json")
+        content = json.loads(response.content)
+        self.assertNotIn("count", content)
+        ids = [category["id"] for category in content["results"]]
+        Category.objects.create(name="a")
+        ids += self.walk(content["next"])
+        self.assertEqual(len(ids), len(set(ids)))
+        self.assertEqual(len(ids), Category.objects.count() - 1)
+
+    def test_previous_page(self):
+        first = json.loads(self.client.get(self.url + "?pagination=cursor").content)
+        second = json.loads(self.client.get(first["next"]).content)
+        previous = json.loads(self.client.get(second["previous"]).content)
+        self.assertEqual(previous["results"], first["results"])
+        self.assertIsNone(first["previous"])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url, {"pagination": "cursor", "cursor": "nope"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_of_wrong_types(self):
+        for position in (["a", "nope"], ["a", None], ["a", {"id": 1}]):
+            cursor = urlsafe_b64encode(json.dumps([0, position]).encode()).decode()
+            response = self.client.get(
+                self.url, {"pagination": "cursor", "cursor": cursor}
+            )
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_page_number_stays_the_default(self):
+        content = json.loads(self.client.get(self.url, format="json").content)
+        self.assertEqual(content["count"], Category.objects.count())
+
+
+class NullableKeysetPaginationTestCase(TestCase):
+    """
+    Test walking campaigns, ordered by their nullable start, with ?pagination=cursor
+    """
+
+    def setUp(self):
+        self.user = UserFactory(is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("clients:campaign-list")
+        now = timezone.now()
+        for day in [1, None, 2, 1, None, 3, None, 2] * 4:
+            start = now - timedelta(days=day) if day else None
+            CampaignFactory(start=start, end=start)
+
+    def walk(self, url):
+        pages = []
+        while url:
+            response = self.client.get(url, format="json")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            content = json.loads(response.content)
+            pages.append(content)
+            url = content["next"]
+        return pages
+
+    def test_walk_nulls_last(self):
+        pages = self.walk(self.url + "?pagination=cursor")
+        ids = [campaign["id"] for page in pages for campaign in page["results"]]
+        expected = [
+            campaign.id
+            for campaign in sorted(
+                Campaign.objects.all(),
+                key=lambda campaign: (
+                    campaign.start is None,
+                    -campaign.start.timestamp() if campaign.start else 0,
+                    -campaign.id,
+                ),
+            )
+        ]
+        self.assertEqual(ids, expected)
+
+    def test_previous_page_over_nulls(self):
+        pages = self.walk(self.url + "?pagination=cursor")
+        for page, following in zip(pages, pages[1:]):
+            previous = json.loads(self.client.get(following["previous"]).content)
+            self.assertEqual(previous["results"], page["results"])
+
+
+class UnkeyedOrderingTestCase(TestCase):
+    """
+    Test lists ordered by a related column, which cursors cannot be positioned on
+    """
+
+    def setUp(self):
+        for _ in range(3):
+            AssignedInfluencerFactory()
+        self.queryset = AssignedInfluencer.objects.order_by("campaign__start", "pk")
+        self.request = Request(APIRequestFactory().get("/", {"pagination": "cursor"}))
+
+    def test_selectable_falls_back_to_page_numbers(self):
+        paginator = SelectablePagination()
+        page = paginator.paginate_queryset(self.queryset, self.request)
+        self.assertEqual(len(page), 3)
+        response = paginator.get_paginated_response([])
+        self.assertEqual(response.data["count"], 3)
+
+    def test_keyset_rejected(self):
+        with self.assertRaises(ParseError):
+            KeysetPagination().paginate_queryset(self.queryset, self.request)
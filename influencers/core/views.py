@@ -1,18 +1,104 @@
+import hashlib
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
+from .cache import get_cached_list
 from .serializers import CategorySerializer, SocialPlatformSerializer, BankSerializer
 from .models import Category, SocialPlatform, Bank
 
 
-class CategoryViewSet(ModelViewSet):
+class CachedListMixin:
+    """
+    Lists from the reference data cache, cursor pagination still queries
+    as it filters on the cursor position
+    """
+
+    def list(self, request, *args, **kwargs):
+        if request.query_params.get("pagination") == "cursor":
+            return super().list(request, *args, **kwargs)
+        data = get_cached_list(
+            self.get_serializer_class(), self.filter_queryset(self.get_queryset())
+        )
+        page = self.paginate_queryset(data)
+        if page is not None:
+            return self.get_paginated_response(page)
+        return Response(data)
+
+
+class ConditionalGetMixin:
+    """
+    Adds ETag and Last-Modified validators to list and detail responses and
+    answers 304 before querying or serializing the rows when they still match.
+    Validators come from the max modified and count of the rows and of the
+    relations rendered with them, listed in conditional_relations.
+    """
+
+    conditional_relations = ()
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return self.get_conditional_response(queryset, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset()).filter(
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        )
+        return self.get_conditional_response(
+            queryset, super().retrieve, *args, **kwargs
+        )
+
+    def get_conditional_response(self, queryset, view, *args, **kwargs):
+        etag, last_modified = self.get_validators(queryset)
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(
+            self.request, etag=etag, last_modified=timestamp
+        )
+        if response is None:
+            response = view(self.request, *args, **kwargs)
+        response["ETag"] = etag
+        if timestamp is not None:
+            response["Last-Modified"] = http_date(timestamp)
+        # Validators depend on the user, and must be checked every time
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def get_validators(self, queryset):
+        aggregates = {"count": Count("pk", distinct=True), "modified": Max("modified")}
+        for relation in self.conditional_relations:
+            aggregates[relation + "_count"] = Count(relation, distinct=True)
+            aggregates[relation + "_modified"] = Max(relation + "__modified")
+        values = queryset.order_by().aggregate(**aggregates)
+
+        timestamps = [
+            value
+            for key, value in values.items()
+            if key.endswith("modified") and value is not None
+        ]
+        last_modified = max(timestamps) if timestamps else None
+        # Same rows may render differently by page, user or format
+        key = "{}:{}:{}:{}".format(
+            self.request.build_absolute_uri(),
+            self.request.user.pk,
+            self.request.accepted_renderer.format,
+            sorted(values.items()),
+        )
+        etag = '"{}"'.format(hashlib.md5(key.encode()).hexdigest())
+        return etag, last_modified
+
+
+class CategoryViewSet(CachedListMixin, ModelViewSet):
     serializer_class = CategorySerializer
     queryset = Category.objects.all()
 
 
-class SocialPlatformViewSet(ModelViewSet):
+class SocialPlatformViewSet(CachedListMixin, ModelViewSet):
     serializer_class = SocialPlatformSerializer
     queryset = SocialPlatform.objects.all()
 
 
-class BankViewSet(ModelViewSet):
+class BankViewSet(CachedListMixin, ModelViewSet):
     serializer_class = BankSerializer
     queryset = Bank.objects.all()
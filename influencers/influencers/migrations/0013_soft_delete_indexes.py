@@ -0,0 +1,38 @@
+# Generated by Django 2.1.4 on 2026-10-18 11:47
+
+from django.db import migrations
+import partial_index
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('influencers', '0012_auto_20190130_1417'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='influencer',
+            index=partial_index.PartialIndex(fields=['name', 'deleted'], name='influencers_name_faeff4_partial', unique=False, where=partial_index.PQ(deleted__isnull=True)),
+        ),
+        migrations.AddIndex(
+            model_name='influencer',
+            index=partial_index.PartialIndex(fields=['category', 'deleted'], name='influencers_categor_bb4361_partial', unique=False, where=partial_index.PQ(deleted__isnull=True)),
+        ),
+        migrations.AddIndex(
+            model_name='influencer',
+            index=partial_index.PartialIndex(fields=['bank', 'deleted'], name='influencers_bank_id_670e71_partial', unique=False, where=partial_index.PQ(deleted__isnull=True)),
+        ),
+        migrations.AddIndex(
+            model_name='socialaccount',
+            index=partial_index.PartialIndex(fields=['username', 'deleted'], name='influencers_usernam_710073_partial', unique=False, where=partial_index.PQ(deleted__isnull=True)),
+        ),
+        migrations.AddIndex(
+            model_name='socialaccount',
+            index=partial_index.PartialIndex(fields=['influencer', 'deleted'], name='influencers_influen_da23b2_partial', unique=False, where=partial_index.PQ(deleted__isnull=True)),
+        ),
+        migrations.AddIndex(
+            model_name='socialaccount',
+            index=partial_index.PartialIndex(fields=['platform', 'deleted'], name='influencers_platfor_a4c963_partial', unique=False, where=partial_index.PQ(deleted__isnull=True)),
+        ),
+    ]
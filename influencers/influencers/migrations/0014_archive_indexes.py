@@ -0,0 +1,22 @@
+# Generated by Django 2.1.4 on 2026-10-18 13:12
+
+from django.db import migrations
+import partial_index
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('influencers', '0013_soft_delete_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='influencer',
+            index=partial_index.PartialIndex(fields=['deleted'], name='influencers_deleted_5a4d26_partial', unique=False, where=partial_index.PQ(deleted__isnull=False)),
+        ),
+        migrations.AddIndex(
+            model_name='socialaccount',
+            index=partial_index.PartialIndex(fields=['deleted'], name='influencers_deleted_e18107_partial', unique=False, where=partial_index.PQ(deleted__isnull=False)),
+        ),
+    ]
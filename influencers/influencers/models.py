@@ -22,7 +22,21 @@ class Influencer(TimeStampedModel, SafeDeleteModel):
         indexes = [
             PartialIndex(
                 fields=["IBAN", "deleted"], unique=True, where=PQ(deleted__isnull=True)
-            )
+            ),
+            PartialIndex(
+                fields=["name", "deleted"], unique=False, where=PQ(deleted__isnull=True)
+            ),
+            PartialIndex(
+                fields=["category", "deleted"],
+                unique=False,
+                where=PQ(deleted__isnull=True),
+            ),
+            PartialIndex(
+                fields=["bank", "deleted"], unique=False, where=PQ(deleted__isnull=True)
+            ),
+            PartialIndex(
+                fields=["deleted"], unique=False, where=PQ(deleted__isnull=False)
+            ),
         ]
         ordering = ["name"]
 
@@ -66,6 +80,26 @@ class SocialAccount(TimeStampedModel, SafeDeleteModel):
 
     class Meta:
         ordering = ["username"]
+        indexes = [
+            PartialIndex(
+                fields=["username", "deleted"],
+                unique=False,
+                where=PQ(deleted__isnull=True),
+            ),
+            PartialIndex(
+                fields=["influencer", "deleted"],
+                unique=False,
+                where=PQ(deleted__isnull=True),
+            ),
+            PartialIndex(
+                fields=["platform", "deleted"],
+                unique=False,
+                where=PQ(deleted__isnull=True),
+            ),
+            PartialIndex(
+                fields=["deleted"], unique=False, where=PQ(deleted__isnull=False)
+            ),
+        ]
 
     username = models.CharField(max_length=50, blank=False)
     platform = models.ForeignKey(
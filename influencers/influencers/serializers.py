@@ -1,5 +1,7 @@
 from rest_framework.serializers import ModelSerializer, ValidationError
 from django.db.utils import IntegrityError
+from influencers.core.cache import CachedReferenceField
+from influencers.core.models import Category, Bank, SocialPlatform
 from .models import Influencer, SocialAccount
 
 
@@ -31,6 +33,9 @@ class CreateInfluencerSerializer(ModelSerializer):
 
 
 class InfluencerSerializer(ModelSerializer):
+    category = CachedReferenceField(Category, source="category_id")
+    bank = CachedReferenceField(Bank, source="bank_id")
+
     class Meta:
         model = Influencer
         depth = 1
@@ -57,6 +62,8 @@ class CreateSocialAccountSerializer(ModelSerializer):
 
 
 class SocialAccountSerializer(ModelSerializer):
+    platform = CachedReferenceField(SocialPlatform, source="platform_id")
+
     class Meta:
         model = SocialAccount
         depth = 1
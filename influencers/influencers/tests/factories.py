@@ -1,12 +1,33 @@
-from factory import DjangoModelFactory
+from factory import DjangoModelFactory, Faker, Sequence, SubFactory, SelfAttribute
+from factory.fuzzy import FuzzyChoice, FuzzyInteger
+from influencers.core.tests.factories import (
+    CategoryFactory,
+    SocialPlatformFactory,
+    BankFactory,
+)
 from influencers.influencers.models import Influencer, SocialAccount
 
 
 class InfluencerFactory(DjangoModelFactory):
+    name = Faker("name")
+    gender = FuzzyChoice([value for value, _ in Influencer.GENDERS])
+    category = SubFactory(CategoryFactory)
+    phone = Sequence(lambda n: "+2010{:08d}".format(n))
+    email = Faker("email")
+    bank = SubFactory(BankFactory)
+    IBAN = Sequence(lambda n: "SA{:022d}".format(n))
+    account_holder_name = SelfAttribute("name")
+    city = Faker("city")
+
     class Meta:
         model = Influencer
 
 
 class SocialAccountFactory(DjangoModelFactory):
+    username = Faker("user_name")
+    platform = SubFactory(SocialPlatformFactory)
+    influencer = SubFactory(InfluencerFactory)
+    cost = FuzzyInteger(100, 10000)
+
     class Meta:
         model = SocialAccount
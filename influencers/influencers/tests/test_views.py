@@ -48,6 +48,31 @@ class InfluencerCreateAPITestCase(TestCase):
             json.loads(response.content)["count"], Influencer.objects.count()
         )
 
+    def test_conditional_list_influencers(self):
+        influencer = Influencer.objects.create(
+            name="Test Influencer",
+            gender="MALE",
+            category=self.category,
+            IBAN="SA44 2000 0001",
+            account_holder_name="test",
+        )
+
+        response = self.client.get(self.url, format="json")
+        self.assertIn("Last-Modified", response)
+        etag = response["ETag"]
+        # Only the validators query, within the request savepoint
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url, format="json", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        SocialAccount.objects.create(
+            username="social account1",
+            platform=SocialPlatform.objects.create(name="Test platform"),
+            influencer=influencer,
+        )
+        response = self.client.get(self.url, format="json", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
 
 class InfluencerDetailAPITestCase(TestCase):
     """
@@ -88,6 +113,21 @@ class InfluencerDetailAPITestCase(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertContains(response, "New Influencer")
 
+    def test_conditional_get_influencer(self):
+        response = self.client.get(self.url, format="json")
+        etag = response["ETag"]
+        response = self.client.get(self.url, format="json", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+
+        # A change to a nested relation changes the ETag too
+        self.category.name = "Renamed category"
+        self.category.save()
+        response = self.client.get(self.url, format="json", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertContains(response, "Renamed category")
+        self.assertNotEqual(response["ETag"], etag)
+
     def test_delete_influencer(self):
         response = self.client.delete(self.url, format="json")
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
@@ -1,5 +1,6 @@
 from rest_framework.viewsets import ModelViewSet
 from rest_framework.generics import ListCreateAPIView
+from influencers.core.views import ConditionalGetMixin
 from .models import Influencer, SocialAccount
 from .serializers import (
     InfluencerSerializer,
@@ -9,7 +10,8 @@ from .serializers import (
 )
 
 
-class InfluencerViewSet(ModelViewSet):
+class InfluencerViewSet(ConditionalGetMixin, ModelViewSet):
+    conditional_relations = ("category", "bank", "accounts")
     queryset = Influencer.objects.all()
 
     def get_serializer_class(self, *args, **kwargs):
@@ -18,7 +20,8 @@ class InfluencerViewSet(ModelViewSet):
         return InfluencerSerializer
 
 
-class SocialAccountViewSet(ModelViewSet):
+class SocialAccountViewSet(ConditionalGetMixin, ModelViewSet):
+    conditional_relations = ("platform", "influencer")
     queryset = SocialAccount.objects.all()
 
     def get_serializer_class(self, *args, **kwargs):
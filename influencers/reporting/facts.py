@@ -0,0 +1,201 @@
+import logging
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, Max, Min, Q
+from django.utils import timezone
+from influencers.clients.models import (
+    Offer,
+    Campaign,
+    AssignedInfluencer,
+    InfluencerHistory,
+)
+from influencers.influencers.models import SocialAccount
+from influencers.reporting.models import DailyCampaignFact, RefreshWatermark
+
+
+logger = logging.getLogger(__name__)
+
+FACTS_WATERMARK = "daily_campaign_facts"
+
+# Rows the facts are computed from, and the lookup of their campaigns
+SOURCES = (
+    (InfluencerHistory, "assigned_influencer__campaign"),
+    (AssignedInfluencer, "campaign"),
+    (SocialAccount, "assigned_influencer__campaign"),
+    (Campaign, "pk"),
+    (Offer, "campaigns"),
+)
+
+
+# Sales of every history row and costs of every assignment, summed per
+# campaign, influencer, platform and day, soft deleted rows left out
+INSERT_FACTS_SQL = """
+    INSERT INTO {facts} (
+        campaign_id, offer_id, client_id, influencer_id, platform_id, day,
+        raw_sales, validated_sales, cost, discount, assignments
+    )
+    SELECT
+        campaign_id, offer_id, client_id, influencer_id, platform_id, day,
+        sum(raw_sales), sum(validated_sales), sum(cost), sum(discount),
+        sum(assignments)
+    FROM (
+        SELECT
+            assigned.campaign_id, assigned.influencer_id,
+            account.platform_id, history.day_sales AS day,
+            CASE WHEN history.data_type = 'RAW_DATA'
+                THEN history.no_sales ELSE 0 END AS raw_sales,
+            CASE WHEN history.data_type = 'VALIDATED_DATA'
+                THEN history.no_sales ELSE 0 END AS validated_sales,
+            0 AS cost, 0 AS discount, 0 AS assignments
+        FROM {history} AS history
+        JOIN {assigned} AS assigned ON assigned.id = history.assigned_influencer_id
+        JOIN {account} AS account ON account.id = assigned.social_account_id
+        WHERE history.deleted IS NULL AND assigned.deleted IS NULL{campaigns}
+        UNION ALL
+        SELECT
+            assigned.campaign_id, assigned.influencer_id,
+            account.platform_id, assigned.day,
+            0, 0, assigned.cost, assigned.discount, 1
+        FROM {assigned} AS assigned
+        JOIN {account} AS account ON account.id = assigned.social_account_id
+        WHERE assigned.deleted IS NULL{campaigns}
+    ) AS facts
+    JOIN {campaign} AS campaign ON campaign.id = facts.campaign_id
+    JOIN {offer} AS offer ON offer.id = campaign.offer_id
+    WHERE campaign.deleted IS NULL
+    GROUP BY campaign_id, offer_id, client_id, influencer_id, platform_id, day
+"""
+
+CAMPAIGNS_SQL = " AND assigned.campaign_id = ANY(%s)"
+
+
+def rebuild_facts(campaign_ids=None):
+    """
+    Computes the facts of the given campaigns again, of all of them when
+    None, in one transaction. Returns the number of facts written.
+    """
+    facts = DailyCampaignFact.objects.all()
+    params = []
+    if campaign_ids is not None:
+        campaign_ids = sorted(set(campaign_ids))
+        if not campaign_ids:
+            return 0
+        facts = facts.filter(campaign__in=campaign_ids)
+        # Once per half of the union
+        params = [campaign_ids, campaign_ids]
+
+    quote = connection.ops.quote_name
+    with transaction.atomic(), connection.cursor() as cursor:
+        facts.delete()
+        cursor.execute(
+            INSERT_FACTS_SQL.format(
+                facts=quote(DailyCampaignFact._meta.db_table),
+                history=quote(InfluencerHistory._meta.db_table),
+                assigned=quote(AssignedInfluencer._meta.db_table),
+                account=quote(SocialAccount._meta.db_table),
+                campaign=quote(Campaign._meta.db_table),
+                offer=quote(Offer._meta.db_table),
+                campaigns=CAMPAIGNS_SQL if params else "",
+            ),
+            params,
+        )
+        return cursor.rowcount
+
+
+def get_changes(model, lookup, since, watermark):
+    """
+    Campaigns of the rows of model modified after since, and the number, the
+    oldest and the latest modified of the ones modified after watermark
+    """
+    # all_objects, a soft delete is a change too
+    changed = model.all_objects.filter(modified__gt=since).order_by()
+    new = Q(modified__gt=watermark)
+    stats = changed.aggregate(
+        rows=Count("pk", filter=new),
+        first=Min("modified", filter=new),
+        last=Max("modified"),
+    )
+    campaigns = set(
+        changed.filter(**{"{}__isnull".format(lookup): False})
+        .values_list(lookup, flat=True)
+        .distinct()
+    )
+    if model is AssignedInfluencer:
+        # An assignment may have moved from a campaign, which still has facts
+        # of its influencer
+        campaigns.update(
+            DailyCampaignFact.objects.filter(
+                influencer__in=changed.values("influencer")
+            )
+            .values_list("campaign", flat=True)
+            .distinct()
+        )
+    return campaigns, stats
+
+
+def refresh_facts():
+    """
+    Computes the facts of the campaigns whose rows changed since the last
+    refresh again, changes being told by the modified column of the rows.
+    Rows modified up to REPORTING["REFRESH_OVERLAP"] seconds before the
+    watermark are looked at again, as a transaction can commit a while after
+    it stamped its rows. The first refresh rebuilds every campaign.
+    Returns the RefreshWatermark, holding the metrics of the refresh.
+    """
+    start = time.perf_counter()
+    with transaction.atomic():
+        RefreshWatermark.objects.get_or_create(name=FACTS_WATERMARK)
+        # Concurrent refreshes wait for each other
+        watermark = RefreshWatermark.objects.select_for_update().get(
+            name=FACTS_WATERMARK
+        )
+
+        if watermark.watermark is None:
+            campaigns, rows, first = None, 0, None
+            last = max(
+                filter(
+                    None,
+                    (
+                        model.all_objects.aggregate(last=Max("modified"))["last"]
+                        for model, _ in SOURCES
+                    ),
+                ),
+                default=None,
+            )
+            rebuild_facts()
+            watermark.partitions = Campaign.objects.count()
+        else:
+            since = watermark.watermark - timedelta(
+                seconds=settings.REPORTING["REFRESH_OVERLAP"]
+            )
+            campaigns, rows, first, last = set(), 0, None, watermark.watermark
+            for model, lookup in SOURCES:
+                changed, stats = get_changes(model, lookup, since, watermark.watermark)
+                campaigns |= changed
+                rows += stats["rows"]
+                if stats["first"] and (first is None or stats["first"] < first):
+                    first = stats["first"]
+                if stats["last"] and stats["last"] > last:
+                    last = stats["last"]
+            rebuild_facts(campaigns)
+            watermark.partitions = len(campaigns)
+
+        now = timezone.now()
+        watermark.watermark = last
+        watermark.refreshed = now
+        watermark.lag = (now - first).total_seconds() if first else 0.0
+        watermark.rows = rows
+        watermark.duration = time.perf_counter() - start
+        watermark.save()
+
+    logger.info(
+        "Refreshed the facts of %d campaigns from %d changed rows in %.1fs, "
+        "%.1fs after the oldest change",
+        watermark.partitions,
+        watermark.rows,
+        watermark.duration,
+        watermark.lag,
+    )
+    return watermark
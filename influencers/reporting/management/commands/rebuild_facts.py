@@ -0,0 +1,37 @@
+import time
+from django.core.management.base import BaseCommand
+from influencers.reporting.facts import rebuild_facts, refresh_facts
+
+
+class Command(BaseCommand):
+    """
+    Run command 'python manage.py rebuild_facts'
+    to compute the daily campaign facts reports read from again,
+    of every campaign or of the ones given with --campaign.
+    With --incremental, only of the campaigns changed since the last refresh
+    """
+
+    help = "Rebuild the daily campaign facts"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--campaign", type=int, action="append")
+        parser.add_argument("--incremental", action="store_true")
+
+    def handle(self, *args, **options):
+        if options["incremental"]:
+            watermark = refresh_facts()
+            self.stdout.write(
+                "{} campaigns of {} changed rows refreshed in {:.1f}s, "
+                "{:.1f}s after the oldest change".format(
+                    watermark.partitions,
+                    watermark.rows,
+                    watermark.duration,
+                    watermark.lag,
+                )
+            )
+            return
+        start = time.perf_counter()
+        facts = rebuild_facts(options["campaign"])
+        self.stdout.write(
+            "{} facts written in {:.1f}s".format(facts, time.perf_counter() - start)
+        )
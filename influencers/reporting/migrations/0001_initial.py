@@ -0,0 +1,59 @@
+# Generated by Django 2.1.4 on 2026-10-18 12:19
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('clients', '0024_soft_delete_indexes'),
+        ('influencers', '0013_soft_delete_indexes'),
+        ('core', '0015_coupon_code_unique'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyCampaignFact',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('raw_sales', models.FloatField(default=0.0)),
+                ('validated_sales', models.FloatField(default=0.0)),
+                ('cost', models.FloatField(default=0.0)),
+                ('discount', models.IntegerField(default=0)),
+                ('assignments', models.IntegerField(default=0)),
+                ('campaign', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_facts', to='clients.Campaign')),
+                ('client', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='clients.Client')),
+                ('influencer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='influencers.Influencer')),
+                ('offer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='clients.Offer')),
+                ('platform', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.SocialPlatform')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='dailycampaignfact',
+            index=models.Index(fields=['client', 'day'], name='reporting_d_client__1396b8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dailycampaignfact',
+            index=models.Index(fields=['offer', 'day'], name='reporting_d_offer_i_c95322_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dailycampaignfact',
+            index=models.Index(fields=['influencer', 'day'], name='reporting_d_influen_a04bce_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dailycampaignfact',
+            index=models.Index(fields=['platform', 'day'], name='reporting_d_platfor_b41db6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dailycampaignfact',
+            index=models.Index(fields=['day'], name='reporting_d_day_a59838_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='dailycampaignfact',
+            unique_together={('campaign', 'influencer', 'platform', 'day')},
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 2.1.4 on 2026-10-18 12:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reporting', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RefreshWatermark',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('watermark', models.DateTimeField(blank=True, null=True)),
+                ('refreshed', models.DateTimeField(blank=True, null=True)),
+                ('lag', models.FloatField(default=0.0)),
+                ('duration', models.FloatField(default=0.0)),
+                ('rows', models.IntegerField(default=0)),
+                ('partitions', models.IntegerField(default=0)),
+            ],
+        ),
+    ]
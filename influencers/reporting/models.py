@@ -0,0 +1,69 @@
+from django.db import models
+from influencers.clients.models import Client, Offer, Campaign
+from influencers.core.models import SocialPlatform
+from influencers.influencers.models import Influencer
+
+
+class DailyCampaignFact(models.Model):
+    """
+    Sales and costs of a campaign's influencer on a platform for a day,
+    derived from InfluencerHistory and AssignedInfluencer by
+    influencers.reporting.facts so reports sum a few rows per day instead of
+    scanning history. Sales count on the day they were made, costs and
+    discounts on the day of the assignment.
+    """
+
+    campaign = models.ForeignKey(
+        Campaign, on_delete=models.CASCADE, related_name="daily_facts"
+    )
+    # Denormalized from the campaign to filter and group without joins
+    offer = models.ForeignKey(Offer, on_delete=models.CASCADE, related_name="+")
+    client = models.ForeignKey(Client, on_delete=models.CASCADE, related_name="+")
+    influencer = models.ForeignKey(
+        Influencer, on_delete=models.CASCADE, related_name="+"
+    )
+    platform = models.ForeignKey(
+        SocialPlatform, on_delete=models.CASCADE, related_name="+"
+    )
+    day = models.DateField()
+    raw_sales = models.FloatField(default=0.0)
+    validated_sales = models.FloatField(default=0.0)
+    cost = models.FloatField(default=0.0)
+    # Sum of the assignments' discount percentages, over assignments it
+    # gives their average
+    discount = models.IntegerField(default=0)
+    assignments = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ("campaign", "influencer", "platform", "day")
+        indexes = [
+            models.Index(fields=["client", "day"]),
+            models.Index(fields=["offer", "day"]),
+            models.Index(fields=["influencer", "day"]),
+            models.Index(fields=["platform", "day"]),
+            models.Index(fields=["day"]),
+        ]
+
+    def __str__(self):
+        return "Campaign {} of influencer {} on {}".format(
+            self.campaign_id, self.influencer_id, self.day
+        )
+
+
+class RefreshWatermark(models.Model):
+    """
+    How far a derived table was refreshed: the latest modified timestamp of
+    the rows it was computed from, and metrics of the last refresh
+    """
+
+    name = models.CharField(max_length=50, unique=True)
+    watermark = models.DateTimeField(null=True, blank=True)
+    refreshed = models.DateTimeField(null=True, blank=True)
+    # Seconds from the oldest change picked up to the end of the refresh
+    lag = models.FloatField(default=0.0)
+    duration = models.FloatField(default=0.0)
+    rows = models.IntegerField(default=0)
+    partitions = models.IntegerField(default=0)
+
+    def __str__(self):
+        return "{} refreshed up to {}".format(self.name, self.watermark)
@@ -0,0 +1,36 @@
+from rest_framework.serializers import (
+    Serializer,
+    CharField,
+    DateField,
+    IntegerField,
+    ValidationError,
+)
+
+
+# Columns a report can be grouped by, months being the facts' days truncated
+GROUPS = ("client", "offer", "campaign", "influencer", "platform", "day", "month")
+
+
+class ReportFilterSerializer(Serializer):
+    """ Query parameters of a report, all optional """
+
+    # Comma separated GROUPS, the totals of the whole selection without any
+    group_by = CharField(required=False, default="")
+    start = DateField(required=False)
+    end = DateField(required=False)
+    client = IntegerField(required=False)
+    offer = IntegerField(required=False)
+    campaign = IntegerField(required=False)
+    influencer = IntegerField(required=False)
+    platform = IntegerField(required=False)
+
+    def validate_group_by(self, value):
+        groups = [group.strip() for group in value.split(",") if group.strip()]
+        unknown = [group for group in groups if group not in GROUPS]
+        if unknown:
+            raise ValidationError(
+                "Unknown groups {}, choose from {}.".format(
+                    ", ".join(unknown), ", ".join(GROUPS)
+                )
+            )
+        return list(dict.fromkeys(groups))
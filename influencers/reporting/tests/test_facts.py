@@ -0,0 +1,109 @@
+from datetime import date, timedelta
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from influencers.clients.models import InfluencerHistory
+from influencers.clients.tests.factories import (
+    AssignedInfluencerFactory,
+    CampaignFactory,
+    InfluencerHistoryFactory,
+)
+from influencers.reporting.facts import FACTS_WATERMARK, refresh_facts
+from influencers.reporting.models import DailyCampaignFact, RefreshWatermark
+from influencers.taskapp.celery import refresh_reporting_facts
+
+
+def get_sales(campaign):
+    return sorted(
+        DailyCampaignFact.objects.filter(campaign=campaign).values_list(
+            "day", "raw_sales"
+        )
+    )
+
+
+@override_settings(REPORTING={"REFRESH_OVERLAP": 0})
+class RefreshFactsTestCase(TestCase):
+    """ Test facts refreshed from the rows changed since the last refresh """
+
+    def setUp(self):
+        self.assigned_influencer = AssignedInfluencerFactory(day=date(2019, 1, 10))
+        self.campaign = self.assigned_influencer.campaign
+        self.history = InfluencerHistoryFactory(
+            assigned_influencer=self.assigned_influencer,
+            data_type="RAW_DATA",
+            no_sales=5,
+            day_sales=date(2019, 1, 10),
+        )
+        self.other = AssignedInfluencerFactory(day=date(2019, 1, 10))
+        self.watermark = refresh_facts()
+
+    def test_first_refresh(self):
+        self.assertEqual(self.watermark.name, FACTS_WATERMARK)
+        self.assertEqual(self.watermark.watermark, self.other.modified)
+        self.assertEqual(DailyCampaignFact.objects.count(), 2)
+        self.assertEqual(get_sales(self.campaign), [(date(2019, 1, 10), 5.0)])
+
+    def test_nothing_changed(self):
+        watermark = refresh_facts()
+        self.assertEqual((watermark.rows, watermark.partitions), (0, 0))
+        self.assertEqual(watermark.lag, 0.0)
+        self.assertEqual(DailyCampaignFact.objects.count(), 2)
+
+    def test_changed_history(self):
+        self.history.no_sales = 7
+        self.history.save()
+        InfluencerHistoryFactory(
+            assigned_influencer=self.assigned_influencer,
+            data_type="RAW_DATA",
+            no_sales=1,
+            day_sales=date(2019, 1, 12),
+        )
+        # Stale facts of the other campaign are left alone
+        DailyCampaignFact.objects.exclude(campaign=self.campaign).update(cost=-1)
+
+        watermark = refresh_facts()
+        self.assertEqual((watermark.rows, watermark.partitions), (2, 1))
+        self.assertGreater(watermark.lag, 0.0)
+        self.assertEqual(
+            watermark.watermark, InfluencerHistory.objects.latest("modified").modified
+        )
+        self.assertEqual(
+            get_sales(self.campaign),
+            [(date(2019, 1, 10), 7.0), (date(2019, 1, 12), 1.0)],
+        )
+        self.assertTrue(DailyCampaignFact.objects.filter(cost=-1).exists())
+
+    def test_soft_delete(self):
+        self.history.delete()
+        refresh_facts()
+        self.assertEqual(get_sales(self.campaign), [(date(2019, 1, 10), 0.0)])
+
+        self.assigned_influencer.delete()
+        refresh_facts()
+        self.assertEqual(get_sales(self.campaign), [])
+
+    def test_moved_assignment(self):
+        self.assigned_influencer.campaign = CampaignFactory()
+        self.assigned_influencer.save()
+        refresh_facts()
+        self.assertEqual(get_sales(self.campaign), [])
+        self.assertEqual(
+            get_sales(self.assigned_influencer.campaign), [(date(2019, 1, 10), 5.0)]
+        )
+
+    def test_overlap(self):
+        # Committed late, stamped before the last refresh
+        InfluencerHistory.objects.filter(pk=self.history.pk).update(
+            no_sales=9, modified=self.watermark.watermark - timedelta(seconds=10)
+        )
+        refresh_facts()
+        self.assertEqual(get_sales(self.campaign), [(date(2019, 1, 10), 5.0)])
+        with override_settings(REPORTING={"REFRESH_OVERLAP": 60}):
+            refresh_facts()
+        self.assertEqual(get_sales(self.campaign), [(date(2019, 1, 10), 9.0)])
+
+    def test_task(self):
+        self.history.save()
+        metrics = refresh_reporting_facts()
+        self.assertEqual((metrics["rows"], metrics["partitions"]), (1, 1))
+        watermark = RefreshWatermark.objects.get(name=FACTS_WATERMARK)
+        self.assertLessEqual(watermark.refreshed, timezone.now())
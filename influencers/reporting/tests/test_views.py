@@ -0,0 +1,131 @@
+import json
+from datetime import date
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from influencers.clients.tests.factories import (
+    AssignedInfluencerFactory,
+    InfluencerHistoryFactory,
+)
+from influencers.reporting.facts import rebuild_facts
+from influencers.reporting.models import DailyCampaignFact
+from influencers.users.tests.factories import UserFactory
+
+
+class CampaignReportTestCase(TestCase):
+    """ Test reports summed from the daily facts """
+
+    def setUp(self):
+        self.user = UserFactory(is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("reporting:campaign-report")
+
+        self.january = AssignedInfluencerFactory(
+            day=date(2019, 1, 10), cost=100.0, discount=10
+        )
+        self.campaign = self.january.campaign
+        self.february = AssignedInfluencerFactory(
+            social_account=self.january.social_account,
+            campaign=self.campaign,
+            day=date(2019, 2, 1),
+            cost=50.0,
+            discount=20,
+        )
+        for day, data_type, no_sales in (
+            (date(2019, 1, 10), "RAW_DATA", 5),
+            (date(2019, 1, 10), "RAW_DATA", 3),
+            (date(2019, 1, 11), "VALIDATED_DATA", 4),
+        ):
+            InfluencerHistoryFactory(
+                assigned_influencer=self.january,
+                day_sales=day,
+                data_type=data_type,
+                no_sales=no_sales,
+            )
+        # Another campaign, and a deleted sale left out
+        self.other = AssignedInfluencerFactory(day=date(2019, 1, 10), cost=1000.0)
+        InfluencerHistoryFactory(assigned_influencer=self.january).delete()
+
+    def get_report(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return json.loads(response.content)["results"]
+
+    def test_rebuild(self):
+        self.assertEqual(rebuild_facts(), 4)
+        fact = DailyCampaignFact.objects.get(
+            campaign=self.campaign, day=date(2019, 1, 10)
+        )
+        self.assertEqual(
+            (fact.raw_sales, fact.validated_sales, fact.cost, fact.assignments),
+            (8.0, 0.0, 100.0, 1),
+        )
+        self.assertEqual(fact.client_id, self.campaign.offer.client_id)
+        self.assertEqual(fact.platform_id, self.january.social_account.platform_id)
+
+        # Only the campaign's facts are written again
+        self.january.delete()
+        self.assertEqual(rebuild_facts([self.campaign.id]), 1)
+        self.assertEqual(DailyCampaignFact.objects.count(), 2)
+
+    def test_report(self):
+        rebuild_facts()
+        client_id = self.campaign.offer.client_id
+        with CaptureQueriesContext(connection) as queries:
+            rows = self.get_report(group_by="client,month", client=client_id)
+        self.assertFalse(
+            [q for q in queries if "clients_influencerhistory" in q["sql"]]
+        )
+        self.assertEqual(
+            [
+                (
+                    row["month"],
+                    row["total_raw_sales"],
+                    row["total_validated_sales"],
+                    row["total_cost"],
+                )
+                for row in rows
+            ],
+            [("2019-01-01", 8.0, 4.0, 100.0), ("2019-02-01", 0.0, 0.0, 50.0)],
+        )
+        self.assertEqual(rows[0]["client_name"], self.campaign.offer.client.name)
+
+        rows = self.get_report(campaign=self.campaign.id, end="2019-01-31")
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(
+            (rows[0]["total_assignments"], rows[0]["average_discount"]), (1, 10.0)
+        )
+
+        rows = self.get_report(group_by="campaign", start="2019-01-01")
+        self.assertEqual(
+            [row["total_cost"] for row in rows],
+            [150.0, 1000.0]
+            if self.campaign.id < self.other.campaign_id
+            else [1000.0, 150.0],
+        )
+
+    def test_account_manager(self):
+        rebuild_facts()
+        self.client.force_authenticate(user=self.campaign.account_manager)
+        rows = self.get_report(group_by="campaign")
+        self.assertEqual([row["campaign"] for row in rows], [self.campaign.id])
+
+    def test_cursor_pagination_ignored(self):
+        rebuild_facts()
+        for group_by in ("", "month", "campaign,influencer"):
+            response = self.client.get(
+                self.url, {"group_by": group_by, "pagination": "cursor"}
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertIn("count", json.loads(response.content))
+        rows = self.get_report(group_by="campaign", pagination="cursor")
+        self.assertEqual(len(rows), 2)
+
+    def test_unknown_group(self):
+        response = self.client.get(self.url, {"group_by": "client,week"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("group_by", json.loads(response.content))
@@ -0,0 +1,7 @@
+from django.urls import path
+from influencers.reporting.views import CampaignReport
+
+
+app_name = "reporting"
+
+urlpatterns = [path(r"campaigns/", CampaignReport.as_view(), name="campaign-report")]
@@ -0,0 +1,102 @@
+from django.db.models import (
+    ExpressionWrapper,
+    F,
+    FloatField,
+    Func,
+    IntegerField,
+    Sum,
+    Value,
+)
+from django.db.models.functions import Cast, TruncMonth
+from rest_framework.generics import GenericAPIView
+from rest_framework.pagination import PageNumberPagination
+from influencers.reporting.models import DailyCampaignFact
+from influencers.reporting.serializers import ReportFilterSerializer
+
+
+# Names shown next to the ids of the groups that have one
+GROUP_NAMES = {
+    "client": "client__name",
+    "offer": "offer__name",
+    "influencer": "influencer__name",
+    "platform": "platform__name",
+}
+
+
+def get_totals():
+    return {
+        "total_raw_sales": Sum("raw_sales"),
+        "total_validated_sales": Sum("validated_sales"),
+        "total_cost": Sum("cost"),
+        "total_assignments": Sum("assignments"),
+        # Percentage of the assignments, none on days of sales only
+        "average_discount": ExpressionWrapper(
+            Cast(Sum("discount"), FloatField())
+            / Func(
+                Sum("assignments"),
+                Value(0),
+                function="NULLIF",
+                output_field=IntegerField(),
+            ),
+            output_field=FloatField(),
+        ),
+    }
+
+
+class CampaignReport(GenericAPIView):
+    """
+    Sales and costs of campaigns summed by ?group_by= (client, offer,
+    campaign, influencer, platform, day or month, comma separated), filtered
+    by ?start= and ?end= (YYYY-MM-DD, both included) and any of ?client=,
+    ?offer=, ?campaign=, ?influencer= or ?platform=.
+    Read from the daily facts, up to date as of their last refresh.
+    """
+
+    queryset = DailyCampaignFact.objects.all()
+    # Grouped rows have no key to position a cursor on, ?pagination=cursor
+    # is ignored
+    pagination_class = PageNumberPagination
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        user = self.request.user
+        if user.is_superuser or user.is_staff:
+            return queryset
+        return queryset.filter(campaign__account_manager=user)
+
+    def filter_queryset(self, queryset):
+        params = ReportFilterSerializer(data=self.request.query_params)
+        params.is_valid(raise_exception=True)
+        filters = params.validated_data
+        groups = filters.pop("group_by")
+        if "start" in filters:
+            queryset = queryset.filter(day__gte=filters.pop("start"))
+        if "end" in filters:
+            queryset = queryset.filter(day__lte=filters.pop("end"))
+        queryset = queryset.filter(**filters)
+
+        fields = [group for group in groups if group != "month"]
+        expressions = {
+            "{}_name".format(group): F(GROUP_NAMES[group])
+            for group in groups
+            if group in GROUP_NAMES
+        }
+        if "month" in groups:
+            expressions["month"] = TruncMonth("day")
+        if not groups:
+            # One row of the totals of the whole selection
+            return [queryset.aggregate(**get_totals())]
+        return (
+            queryset.values(*fields, **expressions).annotate(**get_totals())
+            # By key rather than by the related models' own ordering
+            .order_by(
+                *(
+                    group if group in ("day", "month") else "{}_id".format(group)
+                    for group in groups
+                )
+            )
+        )
+
+    def get(self, request, *args, **kwargs):
+        page = self.paginate_queryset(self.filter_queryset(self.get_queryset()))
+        return self.get_paginated_response(page)
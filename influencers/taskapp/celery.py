@@ -62,8 +62,50 @@ def save_notification_into_db():
     save_assigned_influencers_unpaid()
 
 
+@app.task(acks_late=True, reject_on_worker_lost=True)
+def save_log_entries(data):
+    """
+    Save the audit log entries of a request, acknowledged once saved
+    so they are sent to another worker if this one dies meanwhile
+    """
+    from influencers.core.audit import load_entries, save_entries  # noqa
+
+    save_entries(load_entries(data))
+
+
+@app.task
+def archive_rows():
+    """
+    Move old soft deleted rows and audit log entries to the archive
+    at 3 am every day, returns the rows and bytes reclaimed per table
+    """
+    from influencers.core.archive import archive  # noqa
+
+    return archive()
+
+
+@app.task
+def refresh_reporting_facts():
+    """
+    Refresh the daily campaign facts of the campaigns changed since the
+    last run every 5 minutes, returns the metrics of the refresh
+    """
+    from influencers.reporting.facts import refresh_facts  # noqa
+
+    watermark = refresh_facts()
+    return {
+        "watermark": watermark.watermark and watermark.watermark.isoformat(),
+        "lag": watermark.lag,
+        "duration": watermark.duration,
+        "rows": watermark.rows,
+        "partitions": watermark.partitions,
+    }
+
+
 @app.on_after_configure.connect
 def setup_periodic_tasks(sender, **kwargs):
     # Executes every day morning at 9 a.m.
     sender.add_periodic_task(crontab(hour=9, minute=0), send_mail_to_finance)
     sender.add_periodic_task(crontab(hour=9, minute=0), save_notification_into_db)
+    sender.add_periodic_task(crontab(hour=3, minute=0), archive_rows)
+    sender.add_periodic_task(crontab(minute="*/5"), refresh_reporting_facts)
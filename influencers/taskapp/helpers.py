@@ -1,13 +1,28 @@
 from datetime import date, timedelta
 
 from django.contrib.auth.models import Permission
+from django.db import connection
 from django.db.models import Q
+from django.utils import timezone
 
 from influencers.clients.models import AssignedInfluencer
+from influencers.core.audit import log_created
+from influencers.core.cache import get_cached_data
+from influencers.users.backends import PERMISSIONS_NAMESPACE
 from influencers.users.models import User
 from influencers.clients.models import InfluencerUnPaidNotification
 
 
+# The conflict target is the unique partial index of the notifications
+SAVE_UNPAID_SQL = """
+    INSERT INTO {table} (created, modified, influencer_id, cost, day)
+    SELECT %s, %s, unpaid.influencer_id, unpaid.cost, unpaid.day
+    FROM ({select}) AS unpaid
+    ON CONFLICT (influencer_id, cost, day) WHERE deleted IS NULL DO NOTHING
+    RETURNING id, influencer_id, cost, day
+"""
+
+
 def get_days_range_from_today(no_days=5):
     # 5 days before current date
     days_before = (date.today() - timedelta(days=no_days)).isoformat()
@@ -35,28 +50,59 @@ def get_assigned_influencers_unpaid():
 
 def get_finance_has_permission_view_payment():
     """
-    Get all email users has 'view_influencerpayment' permission
+    Get all email users has 'view_influencerpayment' permission,
+    cached until users, groups or permissions change
     """
-    perm = Permission.objects.get(codename="view_influencerpayment")
-    users = User.objects.filter(
-        Q(groups__permissions=perm) | Q(user_permissions=perm)
-    ).distinct()
-    emails = [user.email for user in users]
-    return emails
+
+    def get_emails():
+        perm = Permission.objects.get(codename="view_influencerpayment")
+        users = User.objects.filter(
+            Q(groups__permissions=perm) | Q(user_permissions=perm)
+        ).distinct()
+        return [user.email for user in users]
+
+    return get_cached_data(PERMISSIONS_NAMESPACE, "finance_emails", get_emails)
 
 
 def save_assigned_influencers_unpaid():
     """
     save assigned influencers unpaid to InfluencerUnPaidNotification
-    to notify finance gouplater
+    to notify finance gouplater.
+    Inserts the missing (influencer, cost, day) notifications in one statement,
+    the unique index on them skips the ones already there, even when saved
+    by a concurrent run. The ones created are audit logged, returns their
+    number.
     """
-    results_obj_lst = get_assigned_influencers_unpaid()
-    for assign in results_obj_lst:
-        found = InfluencerUnPaidNotification.objects.filter(
-            influencer=assign.influencer, cost=assign.cost, day=assign.day
-        ).exists()
-        if not found:
-            infl_not_paid = InfluencerUnPaidNotification(
-                influencer=assign.influencer, cost=assign.cost, day=assign.day
-            )
-            infl_not_paid.save()
+    # The query is compiled below rather than evaluated, so safedelete
+    # does not add its deleted filter itself
+    unpaid = (
+        get_assigned_influencers_unpaid()
+        .filter(deleted__isnull=True)
+        .order_by()
+        .values("influencer", "cost", "day")
+        .distinct()
+    )
+    select_sql, params = unpaid.query.sql_with_params()
+    now = timezone.now()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            SAVE_UNPAID_SQL.format(
+                table=InfluencerUnPaidNotification._meta.db_table, select=select_sql
+            ),
+            [now, now, *params],
+        )
+        created = cursor.fetchall()
+
+    # The insert sends no post_save for auditlog to log it on
+    log_created(
+        InfluencerUnPaidNotification(
+            pk=pk,
+            created=now,
+            modified=now,
+            influencer_id=influencer_id,
+            cost=cost,
+            day=day,
+        )
+        for pk, influencer_id, cost, day in created
+    )
+    return len(created)
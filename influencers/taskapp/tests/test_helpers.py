@@ -1,8 +1,9 @@
 from datetime import date
 from unittest.mock import MagicMock
-from django.db import models
+from auditlog.models import LogEntry
+from django.db import models, transaction, IntegrityError
 from django.test import TestCase
-from django.contrib.auth.models import Permission
+from django.contrib.auth.models import Group, Permission
 from influencers.clients.tests.factories import (
     ClientFactory,
     OfferFactory,
@@ -22,9 +23,11 @@ from influencers.influencers.tests.factories import (
     SocialAccountFactory,
 )
 from influencers.users.models import User
+from influencers.clients.models import InfluencerUnPaidNotification
 from influencers.taskapp.helpers import (
     get_assigned_influencers_unpaid,
     get_finance_has_permission_view_payment,
+    save_assigned_influencers_unpaid,
 )
 
 
@@ -95,6 +98,31 @@ class GetAssignedInfluencersUnpaid(TestCase):
         self.assertIsNotNone(assigned_influencers_unpaid_lst)
         self.assertIn(self.assigned_influencer, assigned_influencers_unpaid_lst)
 
+    def test_save_assigned_influencers_unpaid(self):
+        self.assertEqual(save_assigned_influencers_unpaid(), 1)
+        # Running it again does not duplicate notifications
+        self.assertEqual(save_assigned_influencers_unpaid(), 0)
+        notification = InfluencerUnPaidNotification.objects.get()
+        self.assertEqual(notification.influencer, self.influencer)
+        self.assertEqual(notification.cost, 20.0)
+        self.assertEqual(notification.day, date.today())
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            InfluencerUnPaidNotification.objects.create(
+                influencer=self.influencer, cost=20.0, day=date.today()
+            )
+
+    def test_save_assigned_influencers_unpaid_logged(self):
+        save_assigned_influencers_unpaid()
+        save_assigned_influencers_unpaid()
+        notification = InfluencerUnPaidNotification.objects.get()
+        entry = LogEntry.objects.get_for_object(notification).get()
+        self.assertEqual(entry.action, LogEntry.Action.CREATE)
+        self.assertIn('"cost": ["None", "20.0"]', entry.changes)
+
+    def test_save_assigned_influencers_unpaid_deleted(self):
+        self.assigned_influencer.delete()
+        self.assertEqual(save_assigned_influencers_unpaid(), 0)
+
 
 class GetFinanceHasPermissionViewPayment(TestCase):
     """
@@ -110,3 +138,18 @@ class GetFinanceHasPermissionViewPayment(TestCase):
     def test_get_assigned_influencers_unpaid(self):
         email_lst = get_finance_has_permission_view_payment()
         self.assertIn(self.user.email, email_lst)
+
+    def test_cached_until_permissions_change(self):
+        get_finance_has_permission_view_payment()
+        with self.assertNumQueries(0):
+            email_lst = get_finance_has_permission_view_payment()
+        self.assertEqual(email_lst, [self.user.email])
+
+        group = Group.objects.create(name="finance")
+        group.permissions.add(self.perm)
+        other = User.objects.create(email="other_finance@mail.com")
+        other.groups.add(group)
+        self.assertEqual(
+            sorted(get_finance_has_permission_view_payment()),
+            [self.user.email, other.email],
+        )
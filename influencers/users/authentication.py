@@ -0,0 +1,79 @@
+from django.db import router
+from django.utils.translation import ugettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from influencers.core.cache import get_cached_data
+from influencers.users.models import User
+
+
+# Deactivations and role changes show within this many seconds even if the
+# cache misses the save, as when the row is updated outside of the ORM
+USER_STATE_TIMEOUT = 60
+
+# Token claims filled in by TokenObtainSerializer.get_token
+CLAIM_FIELDS = {"name": "name"}
+
+
+def get_user_namespace(pk):
+    return "user:{}".format(pk)
+
+
+def get_user_state(pk):
+    """ (is_active, is_superuser, is_staff) of the user, empty if there is none """
+
+    def build():
+        # UserManager does not leave soft deleted users out
+        state = (
+            User.objects.filter(pk=pk, deleted__isnull=True)
+            .values_list("is_active", "is_superuser", "is_staff")
+            .first()
+        )
+        return state or ()
+
+    return get_cached_data(
+        get_user_namespace(pk), "state", build, timeout=USER_STATE_TIMEOUT
+    )
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication without the user query of every request. The user is
+    built from the token claims and its cached state, other fields are
+    deferred and loaded together the first time one of them is read.
+    Saving it writes what the database has for the fields built from the
+    token, unless they were changed, as they may be outdated. Not the
+    default, set DJANGO_JWT_STATELESS to use it.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        state = get_user_state(user_id)
+        if not state:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        is_active, is_superuser, is_staff = state
+        if not is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        fields = [api_settings.USER_ID_FIELD, "is_active", "is_superuser", "is_staff"]
+        values = [user_id, is_active, is_superuser, is_staff]
+        for claim, field in CLAIM_FIELDS.items():
+            if claim in validated_token:
+                fields.append(field)
+                values.append(validated_token[claim])
+        # Sorted the way from_db expects them
+        columns = [field.attname for field in User._meta.concrete_fields]
+        fields, values = zip(
+            *sorted(zip(fields, values), key=lambda pair: columns.index(pair[0]))
+        )
+        user = User.from_db(router.db_for_read(User), list(fields), list(values))
+        user.token_values = {
+            field: value
+            for field, value in zip(fields, values)
+            if field != api_settings.USER_ID_FIELD
+        }
+        return user
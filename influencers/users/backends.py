@@ -0,0 +1,26 @@
+from django.contrib.auth.backends import ModelBackend
+from influencers.core.cache import get_cached_data
+
+
+# Bumped by any change to users, groups or permissions, see users.signals
+PERMISSIONS_NAMESPACE = "permissions"
+
+
+class CachedPermissionBackend(ModelBackend):
+    """
+    ModelBackend keeping the permissions of every user in the shared cache,
+    as a user loaded for each request would query them again on each one
+    """
+
+    def get_all_permissions(self, user_obj, obj=None):
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+        if not hasattr(user_obj, "_perm_cache"):
+            user_obj._perm_cache = get_cached_data(
+                PERMISSIONS_NAMESPACE,
+                "user:{}".format(user_obj.pk),
+                lambda: super(CachedPermissionBackend, self).get_all_permissions(
+                    user_obj
+                ),
+            )
+        return user_obj._perm_cache
@@ -0,0 +1,35 @@
+from django.db import migrations
+
+
+# The audit feed is read latest first, by keyset on (timestamp, id), often
+# restricted to a model, an object of it or an actor. CONCURRENTLY keeps
+# the audit log writable while they are built.
+INDEXES = [
+    ("auditlog_logentry_feed", "timestamp DESC, id DESC"),
+    ("auditlog_logentry_feed_model", "content_type_id, timestamp DESC, id DESC"),
+    (
+        "auditlog_logentry_feed_object",
+        "content_type_id, object_id, timestamp DESC, id DESC",
+    ),
+    ("auditlog_logentry_feed_actor", "actor_id, timestamp DESC, id DESC"),
+]
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ("users", "0009_auto_20190205_1101"),
+        ("auditlog", "0007_object_pk_type"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS {} ON auditlog_logentry ({})".format(
+                name, columns
+            ),
+            reverse_sql="DROP INDEX CONCURRENTLY IF EXISTS {}".format(name),
+        )
+        for name, columns in INDEXES
+    ]
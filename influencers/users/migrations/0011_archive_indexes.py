@@ -0,0 +1,18 @@
+# Generated by Django 2.1.4 on 2026-10-18 13:12
+
+from django.db import migrations
+import partial_index
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0010_logentry_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=partial_index.PartialIndex(fields=['deleted'], name='users_user_deleted_6c81f4_partial', unique=False, where=partial_index.PQ(deleted__isnull=False)),
+        ),
+    ]
@@ -41,13 +41,48 @@ class User(AbstractBaseUser, PermissionsMixin, SafeDeleteModel):
         indexes = [
             PartialIndex(
                 fields=["email", "deleted"], unique=True, where=PQ(deleted__isnull=True)
-            )
+            ),
+            PartialIndex(
+                fields=["deleted"], unique=False, where=PQ(deleted__isnull=False)
+            ),
         ]
 
+    # Values of the fields StatelessJWTAuthentication built the user with
+    # from its token and cached state, which may be outdated
+    token_values = None
+
     def clean(self):
         super().clean()
         self.email = self.__class__.objects.normalize_email(self.email)
 
+    def refresh_from_db(self, using=None, fields=None):
+        # Reading a field left out of the token loads all of them at once
+        deferred = self.get_deferred_fields()
+        if self.token_values is not None and fields and deferred >= set(fields):
+            fields = list(deferred)
+        super().refresh_from_db(using, fields)
+
+    def save(self, *args, **kwargs):
+        if self.token_values:
+            # Fields set from the token are written back as the database has
+            # them, unless changed since, not to revert a newer rename or role
+            unchanged = [
+                name
+                for name, value in self.token_values.items()
+                if getattr(self, name) == value
+            ]
+            if unchanged:
+                current = (
+                    type(self)
+                    ._base_manager.filter(pk=self.pk)
+                    .values(*unchanged)
+                    .first()
+                )
+                for name, value in (current or {}).items():
+                    setattr(self, name, value)
+            self.token_values = None
+        super().save(*args, **kwargs)
+
 
 auditlog.register(User)
 auditlog.register(Group)
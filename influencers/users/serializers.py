@@ -3,6 +3,10 @@ from djoser.serializers import UserCreateSerializer
 from django.contrib.auth.models import Group, Permission
 from django.contrib.contenttypes.models import ContentType
 from rest_framework.serializers import (
+    CharField,
+    DateTimeField,
+    IntegerField,
+    Serializer,
     ModelSerializer,
     PrimaryKeyRelatedField,
     SlugRelatedField,
@@ -79,3 +83,14 @@ class LogEntrySerializer(ModelSerializer):
     class Meta:
         model = LogEntry
         fields = ["timestamp", "actor", "action_type", "object_id", "model", "changes"]
+
+
+class LogEntryFilterSerializer(Serializer):
+    """ Query parameters filtering the audit log, all optional """
+
+    # A model name, or app_label.model to tell apart models named alike
+    model = CharField(required=False)
+    object_id = IntegerField(required=False)
+    actor = IntegerField(required=False)
+    start = DateTimeField(required=False)
+    end = DateTimeField(required=False)
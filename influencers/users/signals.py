@@ -0,0 +1,34 @@
+from django.contrib.auth.models import Group, Permission
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from influencers.core.cache import bump_version
+from influencers.users.authentication import get_user_namespace
+from influencers.users.backends import PERMISSIONS_NAMESPACE
+from influencers.users.models import User
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+@receiver(m2m_changed, sender=Group.permissions.through)
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+@receiver(post_save, sender=Permission)
+@receiver(post_delete, sender=Permission)
+@receiver(post_delete, sender=User)
+def invalidate_permissions(sender, **kwargs):
+    if kwargs.get("action", "post_").startswith("post_"):
+        bump_version(PERMISSIONS_NAMESPACE)
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_permissions(sender, update_fields=None, **kwargs):
+    # Logging in only saves last_login
+    if update_fields is None or set(update_fields) != {"last_login"}:
+        bump_version(PERMISSIONS_NAMESPACE)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_state(sender, instance, **kwargs):
+    """ Soft delete and undelete are saves too, so they are covered here """
+    bump_version(get_user_namespace(instance.pk))
@@ -0,0 +1,99 @@
+from unittest import mock
+from django.db import connection
+from django.urls import reverse
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from influencers.core.views import CategoryViewSet
+from influencers.users.authentication import StatelessJWTAuthentication
+from influencers.users.models import User
+from influencers.users.serializers import TokenObtainSerializer
+from influencers.users.tests.factories import UserFactory
+
+
+class StatelessJWTAuthenticationTestCase(TestCase):
+    """ Test users built from their access token """
+
+    def setUp(self):
+        self.user = UserFactory(name="Test", is_active=True, is_staff=True)
+        self.user.set_password("password")
+        self.user.save()
+        self.client = APIClient()
+
+    def get_token(self):
+        response = self.client.post(
+            "/users/login/",
+            {"email": self.user.email, "password": "password"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data["access"]
+
+    def authenticate(self):
+        token = TokenObtainSerializer.get_token(self.user).access_token
+        request = APIRequestFactory().get(
+            "/", HTTP_AUTHORIZATION="JWT {}".format(token)
+        )
+        user, _ = StatelessJWTAuthentication().authenticate(request)
+        return user
+
+    @mock.patch.object(
+        CategoryViewSet, "authentication_classes", [StatelessJWTAuthentication]
+    )
+    def test_no_user_query(self):
+        self.client.credentials(HTTP_AUTHORIZATION="JWT {}".format(self.get_token()))
+        url = reverse("core:category-list")
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse([query for query in queries if "users_user" in query["sql"]])
+
+    def test_user_from_claims(self):
+        self.authenticate()
+        with self.assertNumQueries(0):
+            user = self.authenticate()
+            self.assertEqual((user.pk, user.name), (self.user.pk, "Test"))
+            self.assertTrue(user.is_staff)
+            self.assertFalse(user.is_superuser)
+        # Anything else is read from the database when needed, all at once
+        with self.assertNumQueries(1):
+            self.assertEqual(user.email, self.user.email)
+            self.assertEqual(user.date_joined, self.user.date_joined)
+
+    def test_save_keeps_newer_values(self):
+        user = self.authenticate()
+        User.objects.filter(pk=self.user.pk).update(name="Renamed", is_staff=False)
+        user.is_superuser = True
+        user.save()
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.name, "Renamed")
+        self.assertFalse(self.user.is_staff)
+        self.assertTrue(self.user.is_superuser)
+
+        user = self.authenticate()
+        user.name = "Changed"
+        user.save()
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.name, "Changed")
+
+    def test_inactive(self):
+        self.authenticate()
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaisesMessage(AuthenticationFailed, "User is inactive"):
+            self.authenticate()
+
+    def test_role_changes(self):
+        self.authenticate()
+        self.user.is_superuser = True
+        self.user.save()
+        self.assertTrue(self.authenticate().is_superuser)
+
+    def test_deleted(self):
+        self.authenticate()
+        self.user.delete()
+        with self.assertRaisesMessage(AuthenticationFailed, "User not found"):
+            self.authenticate()
@@ -0,0 +1,71 @@
+import json
+from django.contrib.auth.models import Group, Permission
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+from influencers.users.models import User
+from influencers.users.tests.factories import UserFactory
+
+
+class CachedPermissionBackendTestCase(TestCase):
+    """ Test permissions kept in the shared cache """
+
+    def setUp(self):
+        self.user = UserFactory(is_active=True)
+        self.group = Group.objects.create(name="finance")
+        self.perm = Permission.objects.get(codename="view_influencerpayment")
+        self.group.permissions.add(self.perm)
+
+    def has_perm(self, perm="clients.view_influencerpayment"):
+        # A fresh instance, as authentication loads for every request
+        return User.objects.get(pk=self.user.pk).has_perm(perm)
+
+    def test_cached_across_instances(self):
+        self.assertFalse(self.has_perm())
+        user = User.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertFalse(user.has_perm("clients.view_influencerpayment"))
+            self.assertFalse(user.has_perm("clients.change_influencerpayment"))
+
+    def test_group_membership(self):
+        self.assertFalse(self.has_perm())
+        self.user.groups.add(self.group)
+        self.assertTrue(self.has_perm())
+        self.group.user_set.remove(self.user)
+        self.assertFalse(self.has_perm())
+
+    def test_group_permissions(self):
+        self.user.groups.add(self.group)
+        self.assertTrue(self.has_perm())
+        self.group.permissions.clear()
+        self.assertFalse(self.has_perm())
+
+    def test_user_permissions(self):
+        perm = Permission.objects.get(codename="change_influencerpayment")
+        self.assertFalse(self.has_perm("clients.change_influencerpayment"))
+        self.user.user_permissions.add(perm)
+        self.assertTrue(self.has_perm("clients.change_influencerpayment"))
+
+    def test_deactivated(self):
+        self.user.groups.add(self.group)
+        self.assertTrue(self.has_perm())
+        self.user.is_active = False
+        self.user.save()
+        self.assertFalse(self.has_perm())
+
+    def test_check_permissions(self):
+        self.user.groups.add(self.group)
+        client = APIClient()
+        client.force_authenticate(user=User.objects.get(pk=self.user.pk))
+        permissions = [
+            "clients.view_influencerpayment",
+            "clients.change_influencerpayment",
+        ]
+        response = client.post(
+            "/users/permissions/check/", {"permissions": permissions}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            json.loads(response.content),
+            {"permissions": ["clients.view_influencerpayment"]},
+        )
@@ -26,5 +26,5 @@ urlpatterns = [
     path("reset_confirm/", PasswordResetConfirmView.as_view()),
     path("permissions/check/", CheckPermissions.as_view()),
     path("permissions/", ListPermissions.as_view()),
-    path("actions/", ListActions.as_view()),
+    path("actions/", ListActions.as_view(), name="actions"),
 ] + router.urls
@@ -1,4 +1,5 @@
 from django.contrib.auth.models import Group, Permission
+from django.contrib.contenttypes.models import ContentType
 from rest_framework.generics import ListAPIView
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.viewsets import ModelViewSet
@@ -7,12 +8,14 @@ from rest_framework.serializers import ValidationError
 from rest_framework.response import Response
 from auditlog.models import LogEntry
 from rest_framework_simplejwt.views import TokenObtainPairView
+from influencers.core.pagination import KeysetPagination
 from .serializers import (
     UserSerializer,
     CreateUserSerializer,
     GroupSerializer,
     PermissionSerializer,
     LogEntrySerializer,
+    LogEntryFilterSerializer,
     TokenObtainSerializer,
 )
 from .models import User
@@ -63,9 +66,45 @@ class CheckPermissions(APIView):
 
 
 class ListActions(ListAPIView):
+    """
+    The audit log, latest first, filtered by ?model=, ?object_id=, ?actor=
+    and ?start= / ?end= (both included) over the timestamp. Paginated with
+    keyset cursors, as counting or offsetting this table takes too long.
+    """
+
     permission_classes = [IsAdminUser]
     serializer_class = LogEntrySerializer
-    queryset = LogEntry.objects.all()
+    queryset = LogEntry.objects.select_related("content_type")
+    pagination_class = KeysetPagination
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        params = LogEntryFilterSerializer(data=self.request.query_params)
+        params.is_valid(raise_exception=True)
+        filters = params.validated_data
+        if "model" in filters:
+            queryset = self.filter_model(queryset, filters["model"])
+        if "object_id" in filters:
+            queryset = queryset.filter(object_id=filters["object_id"])
+        if "actor" in filters:
+            queryset = queryset.filter(actor=filters["actor"])
+        if "start" in filters:
+            queryset = queryset.filter(timestamp__gte=filters["start"])
+        if "end" in filters:
+            queryset = queryset.filter(timestamp__lte=filters["end"])
+        return queryset
+
+    def filter_model(self, queryset, model):
+        if "." not in model:
+            return queryset.filter(content_type__model=model.lower())
+        try:
+            # Cached by ContentType's manager
+            content_type = ContentType.objects.get_by_natural_key(
+                *model.lower().split(".", 1)
+            )
+        except ContentType.DoesNotExist:
+            return queryset.none()
+        return queryset.filter(content_type=content_type)
 
 
 class GroupViewSet(ModelViewSet):